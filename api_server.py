@@ -0,0 +1,206 @@
+"""
+api_server.py — Headless JSON API for the dashboard's computed threat metrics.
+Runs the collector's threat_feeds and live_metrics groups in-process on a
+background refresh schedule (each group on its own TTL), and keeps
+every group's response precomputed: JSON body, gzip body and ETag. Requests
+only pick the right bytes, so consumers get conditional GETs (304) and
+compressed payloads without starting a Streamlit session.
+
+    python api_server.py --port 8600
+    curl -s --compressed http://127.0.0.1:8600/v1/kev
+
+GET /v1 lists the groups; GET /v1/<group> serves one; /feeds.json and
+/metrics expose this process's own fetch instrumentation.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import collector
+import feed_metrics
+import metrics_exporter
+
+log = logging.getLogger("secai.api")
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8600
+RETRY_AFTER = collector.RETRY_AFTER
+TICK = collector.TICK
+WORKERS = collector.WORKERS
+GZIP_MIN = 512          # bodies smaller than this are not worth compressing
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec="seconds") if epoch else None
+
+
+# ---------------------------------------------------------------------------
+# Precomputed responses
+# ---------------------------------------------------------------------------
+class Entry:
+    """One group's current response, immutable once built."""
+
+    def __init__(self, group, data, ttl, updated):
+        self.group = group
+        self.data = data
+        self.ttl = ttl
+        self.updated = updated      # when the data last changed
+        payload = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        self.etag = '"%s"' % hashlib.sha1(payload.encode()).hexdigest()[:20]
+        self.body = json.dumps({"group": group, "updated": _iso(updated), "ttl": ttl, "data": data},
+                               sort_keys=True, separators=(",", ":"), default=str).encode()
+        self.gzip = gzip.compress(self.body, 6, mtime=0) if len(self.body) >= GZIP_MIN else None
+
+
+class MetricStore(collector.Collector):
+    """Refreshes each group on its TTL and keeps the latest good Entry per group.
+
+    A failed refresh keeps serving the previous data (marked stale) and is
+    retried after RETRY_AFTER seconds.
+    """
+
+    def __init__(self, groups, retry_after=RETRY_AFTER, workers=WORKERS):
+        super().__init__(groups, retry_after=retry_after, workers=workers)
+        self.entries = {}
+        self.checked = {}           # group -> last refresh attempt (epoch)
+        self.stale = set()
+
+    def publish(self, group, doc):
+        metrics_exporter.publish(**{group: doc["data"] if doc["ok"] else None})
+        with self._lock:
+            self.checked[group] = doc["checked"]
+            if not doc["ok"]:
+                self.stale.add(group)
+                return
+            old = self.entries.get(group)
+            entry = Entry(group, doc["data"], doc["ttl"], doc["fetched"])
+            if old is not None and old.etag == entry.etag:
+                entry = old             # unchanged: keep the ETag and timestamp
+            self.entries[group] = entry
+            self.stale.discard(group)
+
+    def start(self, tick=TICK):
+        threading.Thread(target=self.run, args=(tick,), name="api-scheduler", daemon=True).start()
+
+    def get(self, group):
+        with self._lock:
+            return self.entries.get(group), group in self.stale
+
+    def index(self):
+        with self._lock:
+            return {g: {"path": f"/v1/{g}", "ttl": ttl, "etag": self.entries[g].etag if g in self.entries else None,
+                        "updated": _iso(self.entries[g].updated) if g in self.entries else None,
+                        "checked": _iso(self.checked.get(g)), "stale": g in self.stale,
+                        "available": g in self.entries}
+                    for g, (_, ttl) in self.groups.items()}
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+def _etag_match(header, etag):
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+class Handler(BaseHTTPRequestHandler):
+    store = None
+    protocol_version = "HTTP/1.1"      # keep-alive for polling consumers
+    disable_nagle_algorithm = True     # headers and body go out as separate writes
+
+    def _send(self, status, body=b"", ctype="application/json", headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _json(self, status, obj, headers=()):
+        self._send(status, json.dumps(obj, indent=1).encode(), headers=headers)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path.rstrip("/") or "/"
+        if path in ("/", "/v1"):
+            return self._json(200, {"groups": self.store.index()}, [("Cache-Control", "no-cache")])
+        if path == "/healthz":
+            return self._send(200, b"ok\n", "text/plain")
+        if path in ("/feeds", "/feeds.json"):
+            return self._json(200, feed_metrics.METRICS.snapshot(), [("Cache-Control", "no-store")])
+        if path == "/metrics":
+            ctype, body = metrics_exporter.route(self.headers)
+            return self._send(200, body, ctype, [("Cache-Control", "no-store")])
+        group = path[4:] if path.startswith("/v1/") else None
+        if group not in self.store.groups:
+            return self._json(404, {"error": "unknown group", "groups": sorted(self.store.groups)})
+        entry, stale = self.store.get(group)
+        if entry is None:
+            return self._json(503, {"error": "not fetched yet", "group": group},
+                              [("Retry-After", str(TICK * 2)), ("Cache-Control", "no-store")])
+        age = int(time.time() - entry.updated)
+        headers = [("ETag", entry.etag), ("Vary", "Accept-Encoding"),
+                   ("Cache-Control", f"public, max-age={max(0, entry.ttl - age)}"),
+                   ("Last-Modified", self.date_time_string(entry.updated))]
+        if stale:
+            headers.append(("X-SecAI-Stale", "1"))
+        if _etag_match(self.headers.get("If-None-Match"), entry.etag):
+            self.send_response(304)
+            for k, v in headers:
+                self.send_header(k, v)
+            self.end_headers()
+            return
+        if entry.gzip is not None and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            return self._send(200, entry.gzip, headers=headers + [("Content-Encoding", "gzip")])
+        self._send(200, entry.body, headers=headers)
+
+    do_HEAD = do_GET
+
+    def log_message(self, fmt, *args):
+        log.debug("%s " + fmt, self.address_string(), *args)
+
+
+def serve(store, port=DEFAULT_PORT, host=DEFAULT_HOST):
+    """Bind the API server for `store`; call serve_forever() on the result."""
+    handler = type("ApiHandler", (Handler,), {"store": store})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve SecAI-Nexus threat metrics as JSON.")
+    ap.add_argument("--host", default=DEFAULT_HOST)
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--no-live", action="store_true", help="skip the live_metrics groups")
+    ap.add_argument("-v", "--verbose", action="store_true")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    store = MetricStore(collector.default_groups(live=not args.no_live))
+    store.start()
+    server = serve(store, args.port, args.host)
+    log.info("serving %d groups on http://%s:%d/v1", len(store.groups), args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
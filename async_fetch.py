@@ -0,0 +1,122 @@
+"""
+async_fetch.py — asyncio fetch backend on top of the shared http_client
+session. Requests run concurrently in worker threads (reusing the pooled,
+retrying session), gated by a per-host semaphore so bursty pages never
+exceed an upstream's rate limit.
+"""
+
+import asyncio
+import contextvars
+import threading
+from urllib.parse import urlsplit
+
+import http_client
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:  # headless use (collector, benchmarks) without Streamlit
+    add_script_run_ctx = get_script_run_ctx = None
+
+# ---------------------------------------------------------------------------
+# Per-host concurrency limits
+# ---------------------------------------------------------------------------
+DEFAULT_HOST_LIMIT = 4
+HOST_LIMITS = {
+    "services.nvd.nist.gov": 2,   # unauthenticated NVD: 5 requests / 30 s
+    "mb-api.abuse.ch": 2,
+    "isc.sans.edu": 3,
+}
+
+_slots = {}
+_slots_lock = threading.Lock()
+
+
+def _slot(url):
+    # threading (not asyncio) semaphores: limits must hold across the event
+    # loops of concurrently running fetchers, not just within one loop.
+    host = urlsplit(url).hostname or ""
+    with _slots_lock:
+        if host not in _slots:
+            _slots[host] = threading.BoundedSemaphore(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+        return _slots[host]
+
+
+def _limited(fn, url, feed, kwargs):
+    with _slot(url):
+        return fn(url, feed=feed, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Coroutines
+# ---------------------------------------------------------------------------
+async def aget(url, feed=None, **kwargs):
+    """Concurrent http_client.get; returns the Response or None."""
+    return await asyncio.to_thread(_limited, http_client.get, url, feed, kwargs)
+
+
+async def apost(url, feed=None, **kwargs):
+    """Concurrent http_client.post; returns the Response or None."""
+    return await asyncio.to_thread(_limited, http_client.post, url, feed, kwargs)
+
+
+async def acall(fn, *args):
+    """Run a blocking callable (e.g. a cached fetcher) in a worker thread.
+
+    The caller's Streamlit script context is attached to the worker so
+    st.cache_data behaves exactly as it does on the script thread.
+    """
+    ctx = get_script_run_ctx() if get_script_run_ctx else None
+
+    def _call():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+    return await asyncio.to_thread(_call)
+
+
+def run(coro):
+    """Run a coroutine to completion from synchronous code.
+
+    Uses asyncio.run on the calling thread, or a helper thread when the
+    caller is already inside a running event loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    out = {}
+
+    def _runner():
+        try:
+            out["result"] = asyncio.run(coro)
+        except BaseException as e:
+            out["error"] = e
+    # Carry the caller's context variables (feed_metrics' metered call) into the helper thread.
+    t = threading.Thread(target=contextvars.copy_context().run, args=(_runner,))
+    t.start()
+    t.join()
+    if "error" in out:
+        raise out["error"]
+    return out["result"]
+
+
+def gather(*coros):
+    """Run coroutines concurrently and return their results in order."""
+    async def _all():
+        return await asyncio.gather(*coros)
+    return run(_all())
+
+
+def call_all(*fns):
+    """Call blocking zero-argument callables concurrently; results in order."""
+    return gather(*(acall(fn) for fn in fns))
+
+
+def first_available(candidates, fetch):
+    """Await fetch(candidate) for every candidate concurrently and return
+    (candidate, result) for the first candidate, in the given order, whose
+    result is not None; (None, None) when none has one. Wall time is the
+    slowest request rather than the sum, as with a sequential fallback."""
+    candidates = list(candidates)
+    results = gather(*(fetch(c) for c in candidates))
+    return next(((c, r) for c, r in zip(candidates, results) if r is not None), (None, None))
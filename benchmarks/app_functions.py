@@ -0,0 +1,54 @@
+"""
+app_functions.py — Load selected functions from streamlit_app.py for benchmarking.
+The dashboard is a single Streamlit script, so importing it would render the
+whole page. Instead the named top-level functions and the literal constants
+they use are compiled out of its AST (cache decorators dropped) into a fresh
+namespace, where `st` is a sink that collects the HTML they emit.
+"""
+
+import ast
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "streamlit_app.py")
+
+
+class MarkdownSink:
+    """Stands in for `st` in rendering helpers: collects markdown bodies."""
+
+    def __init__(self):
+        self.out = []
+
+    def markdown(self, body, **kwargs):
+        self.out.append(body)
+
+
+def _literal(node):
+    try:
+        ast.literal_eval(node)
+        return True
+    except ValueError:
+        return False
+
+
+def load(names, variables=(), **env):
+    """Namespace holding the functions `names` and literal `variables` from streamlit_app.py, plus `env`."""
+    with open(APP, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), APP)
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name in names:
+            node.decorator_list = []
+            body.append(node)
+        elif (isinstance(node, ast.Assign) and _literal(node.value)
+              and all(isinstance(t, ast.Name) and (t.id.isupper() or t.id in variables) for t in node.targets)):
+            body.append(node)
+    found = {n.name for n in body if isinstance(n, ast.FunctionDef)}
+    found |= {t.id for n in body if isinstance(n, ast.Assign) for t in n.targets}
+    missing = (set(names) | set(variables)) - found
+    if missing:
+        raise LookupError(f"not found in streamlit_app.py: {', '.join(sorted(missing))}")
+    ns = {"st": MarkdownSink()}
+    ns.update(env)
+    exec(compile(ast.Module(body=body, type_ignores=[]), APP, "exec"), ns)
+    return ns
@@ -0,0 +1,100 @@
+"""
+generators.py — Deterministic synthetic inputs for the benchmark suite.
+Every generator takes a target size in bytes (parse "64K", "8M", "1G" with
+parse_size) and a seed, so runs are reproducible from KB up to GB.
+"""
+
+import json
+import random
+from datetime import datetime, timezone, timedelta
+
+KEYWORDS = ["powershell", "invoke-webrequest", "frombase64string", "payload", "beacon", "schtasks",
+            "bypass", "shell", "exec", "ransomware", "injection", "malware"]
+WORDS = ["report", "quarterly", "access", "server", "update", "policy", "network", "backup", "user",
+         "session", "invoice", "config", "service", "monitor", "release", "vendor"]
+UNIT = 1 << 16   # generators build one 64 KiB unit and repeat it
+
+
+def parse_size(s):
+    s = str(s).strip().upper()
+    mult = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}.get(s[-1:], 1)
+    return int(float(s.rstrip("KMGB") or 0) * mult)
+
+
+def _repeat(unit, n):
+    reps, rest = divmod(n, len(unit))
+    return unit * reps + unit[:rest]
+
+
+def text_blob(n, seed=1):
+    """Log/script-like text with a sprinkling of suspicious keywords."""
+    rnd = random.Random(seed)
+    lines, size = [], 0
+    while size < UNIT:
+        words = [rnd.choice(WORDS) for _ in range(rnd.randint(6, 14))]
+        if rnd.random() < 0.05:
+            words.insert(rnd.randrange(len(words)), rnd.choice(KEYWORDS))
+        line = " ".join(words) + "\n"
+        lines.append(line)
+        size += len(line)
+    return _repeat("".join(lines).encode(), n)
+
+
+def binary_blob(n, seed=1):
+    """Mixed-entropy bytes: random (packed-like) runs, text and zero padding."""
+    rnd = random.Random(seed)
+    q = UNIT // 4
+    unit = bytes(rnd.getrandbits(8) for _ in range(2 * q)) + text_blob(q, seed) + bytes(q)
+    return _repeat(unit, n)
+
+
+def kev_payload(n, seed=1, now=None):
+    """CISA KEV catalog JSON of about `n` bytes (about 330 bytes per entry)."""
+    rnd = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    count = max(1, n // 330)
+    vulns = []
+    for i in range(count):
+        added = (now - timedelta(days=int((count - i) * 3000 / count))).strftime("%Y-%m-%d")
+        vulns.append({"cveID": f"CVE-{2015 + i % 11}-{i:06d}",
+                      "vendorProject": rnd.choice(["Microsoft", "Apple", "Google", "Cisco", "Oracle", "Ivanti"]),
+                      "product": rnd.choice(["Windows", "iOS", "Chrome", "IOS XE", "WebLogic", "Connect Secure"]),
+                      "vulnerabilityName": "Remote Code Execution " + "x" * rnd.randint(5, 60),
+                      "dateAdded": added, "dueDate": added,
+                      "knownRansomwareCampaignUse": rnd.choice(["Known", "Unknown"]),
+                      "shortDescription": "Synthetic entry for benchmarking."})
+    return json.dumps({"catalogVersion": f"bench-{seed}-{count}", "count": count,
+                       "vulnerabilities": vulns}).encode()
+
+
+def bazaar_csv(n, seed=1, now=None):
+    """MalwareBazaar recent-export CSV of about `n` bytes."""
+    rnd = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    out = ["################################################################\n",
+           "# MalwareBazaar recent malware samples (synthetic)\n",
+           '# "first_seen_utc","sha256_hash","md5_hash","sha1_hash","reporter","file_name",'
+           '"file_type_guess","mime_type","signature","clamav","vtpercent","imphash","ssdeep","tlsh"\n']
+    size = sum(len(x) for x in out)
+    while size < n:
+        ts = (now - timedelta(seconds=rnd.randint(0, 14 * 86400))).strftime("%Y-%m-%d %H:%M:%S")
+        row = '"' + '", "'.join([ts, "%064x" % rnd.getrandbits(256), "%032x" % rnd.getrandbits(128),
+                                 "%040x" % rnd.getrandbits(160), "abuse_ch", "sample.exe",
+                                 rnd.choice(["exe", "dll", "elf", "zip", "doc"]), "application/x-dosexec",
+                                 rnd.choice(["AgentTesla", "Formbook", "RedLine", "Mirai", "n/a"]),
+                                 rnd.choice(["Win.Trojan.Agent", "", "Unix.Trojan.Mirai"]), "42", "", "", ""]) + '"\n'
+        out.append(row.replace('", "', '","'))
+        size += len(row)
+    return "".join(out).encode()
+
+
+def table_rows(n, seed=1):
+    """`_tbl` rows of (value, style) cells, 5 columns each."""
+    rnd = random.Random(seed)
+    return [[(f"{rnd.choice(WORDS)} {i}", "color:#ddd;") for _ in range(5)] for i in range(n)]
+
+
+def coverage_matrix(frameworks, controls, seed=1):
+    """Gap Matrix-shaped {framework: [score per control]} table."""
+    rnd = random.Random(seed)
+    return {f"Framework {i}": [rnd.randint(20, 100) for _ in range(controls)] for i in range(frameworks)}
@@ -0,0 +1,235 @@
+"""
+run.py — SecAI-Nexus benchmark runner.
+
+    python benchmarks/run.py                          # default sizes, print results
+    python benchmarks/run.py --sizes 64K,1M,1G --only entropy,features
+    python benchmarks/run.py --out results.json       # machine-readable results
+    python benchmarks/run.py --save-baseline          # write benchmarks/baseline.json
+    python benchmarks/run.py --compare                # exit 1 on regressions vs the baseline
+    python benchmarks/run.py --compare --force        # ... even when the baseline came from another host
+
+Feed fetchers run unchanged against synthetic payloads served by the
+http_replay transport, so nothing touches the network.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path[:0] = [HERE, ROOT, os.path.join(ROOT, "src", "python")]
+
+import generators as gen                      # noqa: E402
+from app_functions import load                # noqa: E402
+
+BASELINE = os.path.join(HERE, "baseline.json")
+SCHEMA = 1
+DEFAULT_SIZES = "64K,1M,8M"
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.25   # median slower than baseline by more than this fraction = regression
+HOST_KEYS = ("platform", "machine", "cpus")   # meta that must match for timings to be comparable
+KEV_URL = "https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json"
+BAZAAR_URL = "https://bazaar.abuse.ch/export/csv/recent/"
+
+
+def timeit(fn, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return times
+
+
+# ---------------------------------------------------------------------------
+# Cases — each yields (name, nbytes, fn, setup)
+# ---------------------------------------------------------------------------
+def case_entropy(size):
+    from utils import calculate_entropy
+    data = gen.binary_blob(size)
+    yield f"entropy[{size}]", size, lambda: calculate_entropy(data), None
+
+
+def case_features(size):
+    from utils import extract_features
+    data = gen.binary_blob(size)
+    yield f"extract_features[{size}]", size, lambda: extract_features(data), None
+
+
+def case_analyze(size):
+    from ai_analyzer import analyze_file, get_model
+    get_model()  # train once outside the timed region
+    data = gen.binary_blob(size)
+    yield f"analyze_file[{size}]", size, lambda: analyze_file(data), None
+
+
+def case_fetchers(size, fixtures):
+    import http_client
+    import http_replay
+    import threat_feeds
+    from kev_index import KevIndex
+    kev = gen.kev_payload(size)
+    http_replay.save_fixture(fixtures, "GET", KEV_URL, kev)
+    http_replay.save_fixture(fixtures, "GET", BAZAAR_URL, gen.bazaar_csv(size))
+    http_replay.install(http_client.SESSION, "replay", fixtures)
+    index_path = os.path.join(tempfile.mkdtemp(prefix="secai-bench-"), "kev_index.json")
+    threat_feeds.KEV_INDEX = KevIndex(index_path)
+
+    def cold():
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        threat_feeds.KEV_INDEX = KevIndex(index_path)
+
+    yield f"fetch_kev_cold[{size}]", len(kev), threat_feeds.fetch_kev, cold
+    yield f"fetch_kev_warm[{size}]", len(kev), threat_feeds.fetch_kev, None
+    yield f"fetch_bazaar[{size}]", size, threat_feeds.fetch_bazaar, None
+
+
+def case_render(size):
+    ns = load(["_tbl", "_fb", "card"])
+    rows = gen.table_rows(max(1, size // 400))
+    facts = ["fact one", "fact two", "fact three", "fact four", "fact five"]
+
+    def tbl():
+        return ns["_tbl"]("BENCH", ["A", "B", "C", "D", "E"], rows, "#00e5ff")
+
+    def cards():
+        ns["st"].out.clear()
+        for i in range(1000):
+            ns["card"]("TITLE", "https://example.org", f"{i}", "sub", "extra", "+1", "d-u", "+2", "d-b", True, facts)
+
+    yield f"tbl[{size}]", size, tbl, None
+    yield "card[x1000]", 0, cards, None
+
+
+def case_gap_matrix(size):
+    from crosswalk import CrosswalkEngine
+    ns = load([], variables=("core_controls", "coverage_matrix"))   # size-independent cases run once
+    cc, cm = ns["core_controls"], ns["coverage_matrix"]
+    engine = CrosswalkEngine(cm, cc, precompute=True)
+    selections = [[fw for i, fw in enumerate(cm) if m >> i & 1] for m in range(1, 1 << len(cm))]
+    yield "gap_matrix_precompute[10x10]", 0, lambda: CrosswalkEngine(cm, cc, precompute=True), None
+    yield "gap_matrix_lookup[1023]", 0, lambda: [engine.analyze(s) for s in selections], None
+    fws = max(10, size // (64 << 10))   # 64K -> 10 frameworks, 8M -> 128
+    big = gen.coverage_matrix(fws, len(cc))
+    big_sel = list(big)[: len(big) // 2]
+    yield f"gap_matrix_cold[{fws}x{len(cc)}]", 0, lambda: CrosswalkEngine(big, cc).analyze(big_sel), None
+
+
+def case_snapshot(size):
+    import pickle
+    import snapshot_format
+    rows = json.loads(gen.kev_payload(size))["vulnerabilities"]
+    doc = {"schema": 1, "group": "kev", "ttl": 3600, "fetched": time.time(), "checked": time.time(), "ok": True,
+           "data": {"total": len(rows), "rw": 0, "recent": rows}}
+    blob, pickled = snapshot_format.encode(doc), pickle.dumps(doc, pickle.HIGHEST_PROTOCOL)
+    yield f"snapshot_encode[{size}]", len(blob), lambda: snapshot_format.encode(doc), None
+    yield f"snapshot_decode[{size}]", len(blob), lambda: snapshot_format.decode(blob), None
+    yield f"snapshot_header[{size}]", 0, lambda: snapshot_format.read_header(blob), None
+    yield f"pickle_loads[{size}]", len(pickled), lambda: pickle.loads(pickled), None
+
+
+CASES = {"entropy": case_entropy, "features": case_features, "analyze": case_analyze,
+         "fetchers": case_fetchers, "render": case_render, "gap_matrix": case_gap_matrix,
+         "snapshot": case_snapshot}
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+def run(sizes, repeat, only=None):
+    results = {}
+    fixtures = tempfile.mkdtemp(prefix="secai-fixtures-")
+    for key, case in CASES.items():
+        if only and key not in only:
+            continue
+        for label in sizes:
+            size = gen.parse_size(label)
+            args = (size, fixtures) if key == "fetchers" else (size,)
+            for name, nbytes, fn, setup in case(*args):
+                if name in results:
+                    continue
+                times = timeit(fn, repeat, setup)
+                med = statistics.median(times)
+                results[name] = {"median_s": round(med, 6), "min_s": round(min(times), 6), "bytes": nbytes,
+                                 "mb_s": round(nbytes / med / 1e6, 2) if nbytes and med else None}
+                print(f"{name:<36} median {med * 1000:10.2f} ms   min {min(times) * 1000:10.2f} ms"
+                      + (f"   {results[name]['mb_s']:8.1f} MB/s" if results[name]["mb_s"] else ""), flush=True)
+    return {"schema": SCHEMA,
+            "meta": {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                     "python": platform.python_version(), "platform": platform.platform(),
+                     "machine": platform.machine(), "cpus": os.cpu_count(), "sizes": sizes, "repeat": repeat},
+            "results": results}
+
+
+def host_mismatch(current, baseline):
+    """HOST_KEYS on which the two reports' hosts differ (keys a report lacks are not compared)."""
+    cur, base = current.get("meta", {}), baseline.get("meta", {})
+    return [k for k in HOST_KEYS if k in cur and k in base and cur[k] != base[k]]
+
+
+def compare(current, baseline, tolerance):
+    """Names of cases whose median regressed by more than `tolerance` against `baseline`."""
+    regressed = []
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["median_s"]:
+            continue
+        ratio = cur["median_s"] / base["median_s"]
+        flag = "REGRESSED" if ratio > 1 + tolerance else "ok"
+        print(f"{name:<36} {ratio:6.2f}x baseline   {flag}")
+        if ratio > 1 + tolerance:
+            regressed.append(name)
+    return regressed
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="Benchmark SecAI-Nexus hot paths on synthetic data.")
+    ap.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated input sizes, e.g. 64K,1M,1G")
+    ap.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per case")
+    ap.add_argument("--only", default="", help=f"comma-separated subset of: {', '.join(CASES)}")
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--save-baseline", action="store_true", help=f"write results to {os.path.relpath(BASELINE, ROOT)}")
+    ap.add_argument("--compare", nargs="?", const=BASELINE, help="baseline JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown fraction")
+    ap.add_argument("--force", action="store_true", help="compare even when the baseline was recorded on another host")
+    args = ap.parse_args(argv[1:])
+    os.chdir(ROOT)   # modules resolve config/ and data/ relative to the repo root
+    only = {s.strip() for s in args.only.split(",") if s.strip()}
+    unknown = only - set(CASES)
+    if unknown:
+        ap.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+    report = run([s.strip() for s in args.sizes.split(",") if s.strip()], args.repeat, only)
+    for path in filter(None, [args.out, BASELINE if args.save_baseline else None]):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=1)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        mismatch = host_mismatch(report, baseline)
+        if mismatch:
+            for k in mismatch:
+                print(f"host {k}: baseline {baseline['meta'][k]!r}, this run {report['meta'][k]!r}", file=sys.stderr)
+            if not args.force:
+                print("baseline was recorded on another host; record one here with --save-baseline "
+                      "(or pass --force to compare anyway)", file=sys.stderr)
+                return 2
+        regressed = compare(report, baseline, args.tolerance)
+        if regressed:
+            print(f"{len(regressed)} regression(s): {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,221 @@
+"""
+bounded_cache.py — Byte-bounded, process-wide cache for feed results.
+Replaces st.cache_data for the dashboard's feed fetchers: every entry is
+sized when stored, the total is kept under a configurable byte budget, and
+entries are evicted LRU or LFU, lowest tier first ("raw" response bodies
+before "derived" aggregates), so the small aggregates stay hot when memory
+is tight. Hits, misses, evictions and expirations are counted for the
+diagnostics panel and the /metrics page.
+
+Values are shared between sessions, not copied: treat them as read-only.
+
+    SECAI_CACHE_BYTES=32M SECAI_CACHE_POLICY=lfu streamlit run streamlit_app.py
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+MAX_BYTES = 64 << 20
+POLICIES = ("lru", "lfu")
+TIERS = ("raw", "derived")      # eviction order: every raw entry goes before any derived one
+_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+_MISSING = object()
+
+
+def parse_size(s):
+    """'512K', '64M', '1G' or a plain byte count."""
+    s = str(s).strip().upper().rstrip("B")
+    return int(float(s[:-1]) * _UNITS[s[-1]]) if s and s[-1] in _UNITS else int(s)
+
+
+def sizeof(obj):
+    """Approximate deep size in bytes of a feed result (containers, strings, numbers, DataFrames)."""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        if hasattr(o, "dtypes") and hasattr(o, "memory_usage"):    # pandas DataFrame / Series
+            u = o.memory_usage(deep=True)
+            total += int(u.sum()) if hasattr(u, "sum") else int(u)
+            continue
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+    return total
+
+
+class _Entry:
+    __slots__ = ("value", "size", "tier", "expires", "hits", "stored")
+
+    def __init__(self, value, size, tier, expires):
+        self.value = value
+        self.size = size
+        self.tier = tier
+        self.expires = expires
+        self.hits = 0
+        self.stored = time.time()
+
+
+class BoundedCache:
+    """Thread-safe TTL cache held under `max_bytes`, evicting per `policy` ("lru" or "lfu")."""
+
+    def __init__(self, max_bytes=MAX_BYTES, policy="lru"):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown cache policy {policy!r} (expected one of {', '.join(POLICIES)})")
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.bytes = 0
+        self.counts = Counter()     # hits, misses, evictions, expirations, rejected
+        self._entries = OrderedDict()   # key -> _Entry, least recently used first
+        self._lock = threading.Lock()
+        self._inflight = {}         # key -> Lock, so concurrent misses compute once
+
+    # ------------------------------------------------------------ storage
+    def _drop(self, key):
+        e = self._entries.pop(key)
+        self.bytes -= e.size
+        return e
+
+    def _victim(self):
+        for tier in TIERS:
+            keys = [k for k, e in self._entries.items() if e.tier == tier]
+            if keys:
+                # LRU: the first key in recency order; LFU: fewest hits, least recent on ties
+                return keys[0] if self.policy == "lru" else min(keys, key=lambda k: self._entries[k].hits)
+        return next(iter(self._entries))
+
+    def _lookup(self, key, now):
+        e = self._entries.get(key)
+        if e is None:
+            return _MISSING
+        if e.expires is not None and now >= e.expires:
+            self._drop(key)
+            self.counts["expirations"] += 1
+            return _MISSING
+        return e
+
+    def get(self, key, default=None):
+        with self._lock:
+            e = self._lookup(key, time.time())
+            if e is _MISSING:
+                self.counts["misses"] += 1
+                return default
+            e.hits += 1
+            self._entries.move_to_end(key)
+            self.counts["hits"] += 1
+            return e.value
+
+    def peek(self, key, default=None):
+        """The live value under `key`, without counting a hit or miss or touching recency."""
+        with self._lock:
+            e = self._entries.get(key)
+            if e is None or (e.expires is not None and time.time() >= e.expires):
+                return default
+            return e.value
+
+    def put(self, key, value, ttl=None, tier="derived", size=None):
+        """Store `value`; returns False when it alone exceeds the budget (it is then not cached)."""
+        if tier not in TIERS:
+            raise ValueError(f"unknown cache tier {tier!r}")
+        size = sizeof(value) if size is None else size
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                self.counts["rejected"] += 1
+                return False
+            now = time.time()
+            for k in [k for k, e in self._entries.items() if e.expires is not None and now >= e.expires]:
+                self._drop(k)
+                self.counts["expirations"] += 1
+            while self._entries and self.bytes + size > self.max_bytes:
+                self._drop(self._victim())
+                self.counts["evictions"] += 1
+            self._entries[key] = _Entry(value, size, tier, now + ttl if ttl else None)
+            self.bytes += size
+            return True
+
+    def pop(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def clear(self, name=None):
+        """Drop every entry, or only those memoized under `name`."""
+        with self._lock:
+            for k in [k for k in self._entries if name is None or (isinstance(k, tuple) and k[0] == name)]:
+                self._drop(k)
+
+    # ------------------------------------------------------------ memoization
+    def memoize(self, name, ttl=None, tier="derived"):
+        """Decorator caching a function's result per arguments (which must be hashable),
+        like st.cache_data(ttl=...) but within this cache's budget. None results are cached too."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def call(*args, **kwargs):
+                key = (name, args, tuple(sorted(kwargs.items())))
+                out = self.get(key, _MISSING)
+                if out is not _MISSING:
+                    return out
+                with self._lock:
+                    lock = self._inflight.setdefault(key, threading.Lock())
+                with lock:
+                    with self._lock:    # filled while we waited on another caller?
+                        e = self._lookup(key, time.time())
+                        if e is not _MISSING:
+                            return e.value
+                    try:
+                        out = fn(*args, **kwargs)
+                        self.put(key, out, ttl, tier)
+                    finally:
+                        with self._lock:
+                            self._inflight.pop(key, None)
+                return out
+            call.clear = lambda: self.clear(name)
+            call.peek = lambda *args, **kwargs: self.peek((name, args, tuple(sorted(kwargs.items()))), _MISSING)
+            call.missing = _MISSING
+            return call
+        return wrap
+
+    # ------------------------------------------------------------ reporting
+    def stats(self):
+        """Budget, usage, counters and per-tier entry counts and bytes."""
+        with self._lock:
+            tiers = {t: {"entries": 0, "bytes": 0} for t in TIERS}
+            for e in self._entries.values():
+                tiers[e.tier]["entries"] += 1
+                tiers[e.tier]["bytes"] += e.size
+            return {"policy": self.policy, "max_bytes": self.max_bytes, "bytes": self.bytes,
+                    "entries": len(self._entries), "tiers": tiers,
+                    **{k: self.counts.get(k, 0) for k in ("hits", "misses", "evictions", "expirations", "rejected")}}
+
+    def entries(self):
+        """Per-entry view, largest first: name, tier, bytes, hits and age in seconds."""
+        now = time.time()
+        with self._lock:
+            rows = [{"name": k[0] if isinstance(k, tuple) else str(k), "tier": e.tier, "bytes": e.size,
+                     "hits": e.hits, "age_s": int(now - e.stored)} for k, e in self._entries.items()]
+        return sorted(rows, key=lambda r: -r["bytes"])
+
+
+def from_env(environ=os.environ):
+    """Cache configured by SECAI_CACHE_BYTES (e.g. 64M) and SECAI_CACHE_POLICY (lru|lfu)."""
+    return BoundedCache(parse_size(environ.get("SECAI_CACHE_BYTES") or MAX_BYTES),
+                        (environ.get("SECAI_CACHE_POLICY") or "lru").lower())
+
+
+FEED_CACHE = from_env()
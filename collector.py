@@ -0,0 +1,290 @@
+"""
+collector.py — Standalone feed collector shared by every dashboard replica.
+Fetches and aggregates all feeds (threat_feeds plus the live_metrics
+fetchers) on their own TTLs and writes one compact snapshot per feed group
+(snapshot_format binary records, or JSON) to a shared directory. Dashboards
+started with SECAI_SNAPSHOT_DIR read these snapshots instead of fetching, so
+upstream load and cold-start latency stay flat however many replicas or
+sessions run.
+
+    python -m collector                      # loop forever
+    python -m collector --once               # refresh everything due, then exit
+    SECAI_SNAPSHOT_DIR=/shared/snapshots streamlit run streamlit_app.py
+"""
+
+import argparse
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import feed_metrics
+import snapshot_format
+import threat_feeds
+from kev_index import KEV_INDEX
+from state_store import load_json, save_json, state_path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no single-writer lock
+    fcntl = None
+
+log = logging.getLogger("secai.collector")
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+SCHEMA = 1
+SNAPSHOT_DIR = os.environ.get("SECAI_SNAPSHOT_DIR") or state_path("snapshots")
+RETRY_AFTER = 300       # seconds before a failed group is fetched again
+TICK = 5                # scheduler resolution (seconds)
+WORKERS = 4
+MAX_AGE_TTLS = 3        # readers drop snapshots older than this many TTLs
+FILE_MODE = 0o644       # replicas may run as other users
+FORMATS = {"binary": snapshot_format.EXT, "json": ".json"}
+FORMAT = os.environ.get("SECAI_SNAPSHOT_FORMAT", "binary")
+ARCHIVE_DIR = os.environ.get("SECAI_SNAPSHOT_ARCHIVE") or None
+
+
+def _kev():
+    # Replicas have no KEV index of their own, so the snapshot carries the recent additions.
+    k = threat_feeds.fetch_kev()
+    return dict(k, recent=KEV_INDEX.recent()) if k else None
+
+
+def _live_groups():
+    # live_metrics decorates its fetchers with st.cache_data, which falls back
+    # to an in-memory cache outside a Streamlit server.
+    import live_metrics
+    return {
+        "live_kev": (live_metrics.fetch_cisa_kev, 3600),
+        "live_nvd": (live_metrics.fetch_nvd_cve_counts, 3600),
+        "live_bazaar": (live_metrics.fetch_malwarebazaar_recent, 1800),
+        "live_urlhaus": (live_metrics.fetch_urlhaus_stats, 1800),
+        "live_feodo": (live_metrics.fetch_feodo_c2, 600),
+        "live_ics": (live_metrics.fetch_cisa_ics_alerts, 3600),
+    }
+
+
+def default_groups(live=True):
+    """{group: (fetcher, ttl seconds)} for every threat_feeds feed, plus live_metrics."""
+    metered = feed_metrics.METRICS.metered
+    fetchers = dict(threat_feeds.FETCHERS, kev=_kev)
+    groups = {name: (metered(name)(fn), threat_feeds.TTL[name]) for name, fn in fetchers.items()}
+    if live:
+        groups.update(_live_groups())
+    return groups
+
+
+def snapshot_path(directory, group, fmt=FORMAT):
+    return os.path.join(directory, group + FORMATS[fmt])
+
+
+def _load(path):
+    if path.endswith(snapshot_format.EXT):
+        doc = snapshot_format.load(path)
+        return doc if doc and doc["schema"] == SCHEMA else None
+    return load_json(path, SCHEMA)
+
+
+def load_snapshot(directory, group):
+    """The most recently written snapshot of `group` in either format, or None."""
+    newest = None
+    for fmt in FORMATS:
+        path = snapshot_path(directory, group, fmt)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        if newest is None or mtime > newest[0]:
+            newest = (mtime, path)
+    return _load(newest[1]) if newest else None
+
+
+# ---------------------------------------------------------------------------
+# Collector
+# ---------------------------------------------------------------------------
+class Collector:
+    """Refreshes each group on its TTL in a worker pool and publishes the results.
+
+    With a `directory`, results are written there as snapshots in `fmt`
+    ("binary" snapshot_format records or "json") and existing snapshots of
+    either format seed the schedule, so a restart only fetches what has
+    expired. With an `archive` directory every good result is also appended
+    to a daily per-group snapshot_format archive.
+    A failed refresh keeps the previous data and is retried after
+    `retry_after` seconds. Subclasses may override publish().
+    """
+
+    def __init__(self, groups, directory=None, retry_after=RETRY_AFTER, workers=WORKERS, fmt=FORMAT, archive=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown snapshot format {fmt!r} (expected one of {', '.join(FORMATS)})")
+        self.groups = groups
+        self.directory = directory
+        self.fmt = fmt
+        self.archive = archive
+        self.retry_after = retry_after
+        self.docs = {}              # group -> last snapshot document
+        self._due = {g: 0.0 for g in groups}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="collector")
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        if directory:
+            for g, (_, ttl) in groups.items():
+                doc = load_snapshot(directory, g)
+                if doc:
+                    self.docs[g] = doc
+                    self._due[g] = (doc.get("fetched") or 0) + ttl if doc.get("ok") else doc.get("checked", 0) + retry_after
+
+    def refresh(self, group):
+        fn, ttl = self.groups[group]
+        try:
+            data = fn()
+        except Exception:
+            log.exception("refresh of %s failed", group)
+            data = None
+        now = time.time()
+        with self._lock:
+            self._inflight.discard(group)
+            self._due[group] = now + (ttl if data is not None else min(ttl, self.retry_after))
+            old = self.docs.get(group, {})
+            doc = {"schema": SCHEMA, "group": group, "ttl": ttl, "checked": now, "ok": data is not None,
+                   "fetched": now if data is not None else old.get("fetched"),
+                   "data": data if data is not None else old.get("data")}
+            self.docs[group] = doc
+        self.publish(group, doc)
+        return data is not None
+
+    def publish(self, group, doc):
+        if self.directory:
+            path = snapshot_path(self.directory, group, self.fmt)
+            save = snapshot_format.dump if self.fmt == "binary" else save_json
+            if not save(path, doc, FILE_MODE):
+                log.warning("could not write snapshot for %s to %s", group, self.directory)
+        if self.archive and doc["ok"] and doc["fetched"] == doc["checked"]:
+            if not snapshot_format.append(snapshot_format.archive_path(self.archive, group, doc["fetched"]), doc):
+                log.warning("could not archive %s to %s", group, self.archive)
+
+    def refresh_due(self, wait=False):
+        """Submit every group whose TTL has expired; with wait=True block until they finish."""
+        now = time.time()
+        with self._lock:
+            due = [g for g, t in self._due.items() if t <= now and g not in self._inflight]
+            self._inflight.update(due)
+        futures = [self._pool.submit(self.refresh, g) for g in due]
+        if wait:
+            for f in futures:
+                f.result()
+        return due
+
+    def run(self, tick=TICK):
+        """Scheduler loop (blocks until stop())."""
+        while not self._stop.is_set():
+            self.refresh_due()
+            self._stop.wait(tick)
+
+    def start(self, tick=TICK):
+        threading.Thread(target=self.run, args=(tick,), name="collector", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self._pool.shutdown(wait=False)
+
+
+# ---------------------------------------------------------------------------
+# Reader (dashboard side)
+# ---------------------------------------------------------------------------
+class SnapshotReader:
+    """Reads collector snapshots in either format (the newer file wins);
+    a file is only re-parsed when its mtime changes."""
+
+    def __init__(self, directory=SNAPSHOT_DIR, max_age_ttls=MAX_AGE_TTLS):
+        self.directory = directory
+        self.max_age_ttls = max_age_ttls
+        self._memo = {}             # group -> ((path, mtime_ns, size), doc)
+        self._lock = threading.Lock()
+
+    def doc(self, group):
+        key = None
+        for fmt in FORMATS:
+            path = snapshot_path(self.directory, group, fmt)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if key is None or st.st_mtime_ns > key[1]:
+                key = (path, st.st_mtime_ns, st.st_size)
+        if key is None:
+            return None
+        with self._lock:
+            hit = self._memo.get(group)
+        if hit and hit[0] == key:
+            return hit[1]
+        doc = _load(key[0])
+        with self._lock:
+            self._memo[group] = (key, doc)
+        return doc
+
+    def get(self, group, now=None):
+        """The group's data, or None when missing or older than max_age_ttls TTLs."""
+        doc = self.doc(group)
+        if not doc or doc.get("data") is None or not doc.get("fetched"):
+            return None
+        if (now or time.time()) - doc["fetched"] > self.max_age_ttls * doc.get("ttl", 0):
+            return None
+        return doc["data"]
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+def _lock_dir(directory):
+    """Hold an exclusive lock on <directory>/collector.lock; None if another collector has it."""
+    os.makedirs(directory, exist_ok=True)
+    f = open(os.path.join(directory, "collector.lock"), "w")
+    if fcntl is not None:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return None
+    return f
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Collect SecAI-Nexus feeds into shared snapshots.")
+    ap.add_argument("--dir", default=SNAPSHOT_DIR, help="snapshot directory (default: $SECAI_SNAPSHOT_DIR)")
+    ap.add_argument("--format", choices=sorted(FORMATS), default=FORMAT,
+                    help="snapshot encoding (default: $SECAI_SNAPSHOT_FORMAT or binary)")
+    ap.add_argument("--archive", default=ARCHIVE_DIR,
+                    help="also append every good result to daily archives here (default: $SECAI_SNAPSHOT_ARCHIVE)")
+    ap.add_argument("--once", action="store_true", help="refresh every due group once, then exit")
+    ap.add_argument("--no-live", action="store_true", help="skip the live_metrics groups")
+    ap.add_argument("--tick", type=float, default=TICK, help="scheduler resolution in seconds")
+    ap.add_argument("-v", "--verbose", action="store_true")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    lock = _lock_dir(args.dir)
+    if lock is None:
+        raise SystemExit(f"another collector is already writing to {args.dir}")
+    collector = Collector(default_groups(live=not args.no_live), args.dir, fmt=args.format, archive=args.archive)
+    log.info("collecting %d groups into %s", len(collector.groups), args.dir)
+    try:
+        if args.once:
+            due = collector.refresh_due(wait=True)
+            ok = sum(collector.docs[g]["ok"] for g in due)
+            log.info("refreshed %d group(s), %d ok", len(due), ok)
+        else:
+            collector.run(args.tick)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.stop()
+        lock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+crosswalk.py — Framework × control coverage engine for the Gap Matrix.
+Coverage is held as one NumPy array with a framework→row index; each
+framework selection is a bitmask over the rows, and its consolidated
+results are computed with a single fancy-indexed reduction and memoized
+(optionally for all 2^F selections up front). recommend() searches for the
+framework combinations with the fewest gaps or the highest coverage.
+"""
+
+import numpy as np
+
+STRONG = 80          # framework score that counts as strong coverage of a control
+GAP = 65             # consolidated average below this is a gap
+DEFAULT_SCORE = 50   # coverage assumed for a framework missing from the matrix
+
+
+class CrosswalkEngine:
+    def __init__(self, coverage, controls, strong=STRONG, gap=GAP, precompute=False):
+        self.frameworks = list(coverage)
+        self.controls = list(controls)
+        self.strong = strong
+        self.gap = gap
+        rows = [coverage[fw] for fw in self.frameworks] + [[DEFAULT_SCORE] * len(self.controls)]
+        self.matrix = np.array(rows, dtype=float)          # (F + 1) × C, last row = unknown framework
+        self.row = {fw: i for i, fw in enumerate(self.frameworks)}
+        self.short = np.array([fw.split()[0] for fw in self.frameworks] + ["—"], dtype=object)
+        self._memo = {}
+        self._rec_memo = {}
+        if precompute:
+            for mask in range(1, 1 << len(self.frameworks)):
+                self.analyze_mask(mask)
+
+    def mask(self, selected):
+        """Bitmask of a selection; unknown names share the default-coverage row."""
+        m = 0
+        for fw in selected:
+            m |= 1 << self.row.get(fw, len(self.frameworks))
+        return m
+
+    def analyze(self, selected):
+        return self.analyze_mask(self.mask(selected))
+
+    def analyze_mask(self, mask):
+        """Consolidated coverage for a selection bitmask (memoized; treat the result as read-only).
+
+        Returns {avg, strong_by, overall, num_strong, num_gaps, gaps}, with per-control
+        lists in `controls` order and strong frameworks listed in matrix order.
+        """
+        hit = self._memo.get(mask)
+        if hit is not None:
+            return hit
+        idx = np.flatnonzero([(mask >> i) & 1 for i in range(len(self.matrix))])
+        sub = self.matrix[idx]                                   # k × C
+        avg = np.round(sub.mean(axis=0)).astype(int)             # half-to-even, as round()
+        strong = sub >= self.strong
+        names = self.short[idx]
+        strong_by = [", ".join(names[col]) or "—" for col in strong.T]
+        gaps = avg < self.gap
+        res = {"avg": avg.tolist(), "strong_by": strong_by,
+               "overall": round(int(avg.sum()) / len(avg)),
+               "num_strong": int((avg >= self.strong).sum()), "num_gaps": int(gaps.sum()),
+               "gaps": [self.controls[i] for i in np.flatnonzero(gaps)]}
+        self._memo[mask] = res
+        return res
+
+    # ---------------------------------------------------------------- recommender
+    def _score(self, sums, m, objective, cov_cap=None):
+        avg = np.round(sums / m)
+        gaps = int((avg < self.gap).sum())
+        cov = float(avg.mean())
+        if cov_cap is not None:
+            cov = min(cov, cov_cap)
+        return (gaps, -cov) if objective == "gaps" else (-cov, gaps)
+
+    def recommend(self, k, targets=None, objective="gaps", top=3, min_size=2, method="exact"):
+        """Best combinations of `min_size`..`k` frameworks for the `targets` controls (default all).
+
+        objective "gaps" ranks by fewest gaps, then highest average coverage;
+        "coverage" ranks by coverage first. method "exact" is a branch-and-bound
+        search: frameworks are tried strongest first, and a branch is pruned
+        once even the best remaining framework per control cannot beat the
+        current `top`-th result. "greedy" adds one framework at a time and is
+        for catalogs too large for an exact search. Results are memoized.
+        Returns [{frameworks, gaps, coverage}] best first.
+        """
+        cols = list(range(len(self.controls))) if targets is None else \
+            [self.controls.index(c) for c in targets]
+        key = (k, tuple(cols), objective, top, min_size, method)
+        hit = self._rec_memo.get(key)
+        if hit is not None:
+            return hit
+        mat = self.matrix[:-1][:, cols]
+        order = np.argsort(-mat.sum(axis=1), kind="stable")
+        mat = mat[order]
+        search = self._greedy if method == "greedy" else self._branch_and_bound
+        found = search(mat, min(k, len(mat)), objective, top, min_size)
+        res = [{"frameworks": [self.frameworks[order[i]] for i in sorted(combo, key=lambda i: order[i])],
+                "gaps": score[0] if objective == "gaps" else score[1],
+                "coverage": -score[1] if objective == "gaps" else -score[0]}
+               for score, combo in found]
+        self._rec_memo[key] = res
+        return res
+
+    def _branch_and_bound(self, mat, k, objective, top, min_size):
+        n, t = mat.shape
+        # best[i, r]: per-control sum of the r largest scores among frameworks i.. (optimistic completion)
+        # rows[i, r]: the r largest framework totals among i.. (coverage is separable by framework)
+        best = np.zeros((n + 1, k + 1, t))
+        rows = np.zeros((n + 1, k + 1))
+        totals = mat.sum(axis=1)   # already descending
+        for i in range(n - 1, -1, -1):
+            csum = np.cumsum(-np.sort(-mat[i:], axis=0), axis=0)
+            r = min(k, n - i)
+            best[i, 1:r + 1] = csum[:r]
+            rows[i, 1:r + 1] = np.cumsum(totals[i:i + r])
+        found = []   # sorted [(score, combo)], at most `top`
+
+        def visit(i, combo, sums, m):
+            r = m - len(combo)
+            if r == 0:
+                score = self._score(sums, m, objective)
+                if len(found) < top or score < found[-1][0]:
+                    found.append((score, tuple(combo)))
+                    found.sort()
+                    del found[top:]
+                return
+            if n - i < r:
+                return
+            if len(found) == top:
+                # rounding lifts a control's average by at most 0.5
+                cap = (sums.sum() + rows[i, r]) / (m * t) + 0.5
+                if self._score(sums + best[i, r], m, objective, cap) >= found[-1][0]:
+                    return
+            for j in range(i, n - r + 1):
+                combo.append(j)
+                visit(j + 1, combo, sums + mat[j], m)
+                combo.pop()
+
+        for m in range(max(1, min_size), k + 1):
+            visit(0, [], np.zeros(t), m)
+        return found
+
+    def _greedy(self, mat, k, objective, top, min_size):
+        chosen, sums, found = [], np.zeros(mat.shape[1]), []
+        for m in range(1, k + 1):
+            rest = [j for j in range(len(mat)) if j not in chosen]
+            if not rest:
+                break
+            j = min(rest, key=lambda j: self._score(sums + mat[j], m, objective))
+            chosen.append(j)
+            sums = sums + mat[j]
+            if m >= min_size:
+                found.append((self._score(sums, m, objective), tuple(chosen)))
+        return sorted(found)[:top]
@@ -0,0 +1,129 @@
+"""
+crosswalk_catalog.py — Sparse control-mapping catalogs for the crosswalk.
+Loads framework → control mappings (with a 0-100 mapping strength) from
+CSV or JSON into a scipy.sparse framework × control matrix, so coverage,
+gap and overlap queries over hundreds of frameworks and thousands of
+controls are sparse row slices and products rather than Python loops.
+"""
+
+import csv
+import json
+
+import numpy as np
+from scipy import sparse
+
+from crosswalk import GAP, STRONG
+
+FIELDS = ("framework", "control", "strength", "category")
+
+
+class CrosswalkCatalog:
+    def __init__(self, frameworks, controls, matrix, categories=None):
+        self.frameworks = list(frameworks)
+        self.controls = list(controls)
+        self.matrix = sparse.csr_matrix(matrix, dtype=np.float32)   # F × C mapping strength
+        self.categories = list(categories) if categories is not None else None  # per control
+        self.fw_row = {fw: i for i, fw in enumerate(self.frameworks)}
+        self.ctrl_col = {c: j for j, c in enumerate(self.controls)}
+
+    # ---------------------------------------------------------------- loading
+    @classmethod
+    def from_records(cls, records):
+        """Build from (framework, control, strength[, category]) rows; a repeated pair keeps its strongest mapping.
+
+        A blank strength lists the framework and control without mapping them; any
+        other non-numeric strength raises ValueError naming the (1-based) record.
+        """
+        fw_row, ctrl_col, cats, cells = {}, {}, {}, {}
+        for n, rec in enumerate(records, 1):
+            fw, ctrl, strength = rec[0], rec[1], rec[2]
+            if strength is None or str(strength).strip() == "":
+                strength = 0.0
+            else:
+                try:
+                    strength = float(strength)
+                except (TypeError, ValueError):
+                    raise ValueError(f"record {n} ({fw!r}, {ctrl!r}): strength {strength!r} is not a number") from None
+            i = fw_row.setdefault(fw, len(fw_row))
+            j = ctrl_col.setdefault(ctrl, len(ctrl_col))
+            if len(rec) > 3 and rec[3]:
+                cats.setdefault(ctrl, rec[3])
+            if strength > cells.get((i, j), 0.0):
+                cells[(i, j)] = strength
+        rows = np.fromiter((k[0] for k in cells), dtype=np.int32, count=len(cells))
+        cols = np.fromiter((k[1] for k in cells), dtype=np.int32, count=len(cells))
+        vals = np.fromiter(cells.values(), dtype=np.float32, count=len(cells))
+        m = sparse.csr_matrix((vals, (rows, cols)), shape=(len(fw_row), len(ctrl_col)))
+        categories = [cats.get(c, "") for c in ctrl_col] if cats else None
+        return cls(fw_row, ctrl_col, m, categories)
+
+    @classmethod
+    def from_csv(cls, path):
+        """CSV with a header row containing framework, control, strength and optionally category."""
+        with open(path, newline="", encoding="utf-8") as f:
+            return cls.from_records(tuple(r.get(k) or "" for k in FIELDS) for r in csv.DictReader(f))
+
+    @classmethod
+    def from_json(cls, path):
+        """JSON list of {framework, control, strength[, category]}, or {"mappings": [...]}, or
+        {framework: {control: strength}}."""
+        with open(path, encoding="utf-8") as f:
+            doc = json.load(f)
+        if isinstance(doc, dict) and "mappings" in doc:
+            doc = doc["mappings"]
+        if isinstance(doc, dict):
+            return cls.from_records((fw, c, s) for fw, m in doc.items() for c, s in m.items())
+        return cls.from_records(tuple(r.get(k) or "" for k in FIELDS) for r in doc)
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_json(path) if path.lower().endswith(".json") else cls.from_csv(path)
+
+    # ---------------------------------------------------------------- queries
+    # `selected` is an iterable of framework names (None: every framework); unknown names raise KeyError.
+    def _rows(self, selected):
+        if selected is None:
+            return np.arange(len(self.frameworks))
+        unknown = [fw for fw in selected if fw not in self.fw_row]
+        if unknown:     # silently dropping them would report their controls as gaps
+            raise KeyError(f"unknown framework(s): {', '.join(map(str, unknown))}")
+        return np.array([self.fw_row[fw] for fw in selected], dtype=np.int32)
+
+    def coverage(self, selected=None, how="max"):
+        """Per-control coverage (C,) by the selected frameworks: the best ("max") or average ("mean") mapping."""
+        rows = self._rows(selected)
+        if not len(rows):
+            return np.zeros(len(self.controls), dtype=np.float32)
+        sub = self.matrix[rows]
+        if how == "mean":
+            return np.asarray(sub.sum(axis=0)).ravel() / len(rows)
+        return sub.max(axis=0).toarray().ravel()
+
+    def gaps(self, selected=None, threshold=GAP, how="max"):
+        """Controls whose coverage by the selection is below `threshold`."""
+        cov = self.coverage(selected, how)
+        return [self.controls[j] for j in np.flatnonzero(cov < threshold)]
+
+    def overlap(self, selected=None, threshold=STRONG):
+        """(k, k) counts of controls that each pair of selected frameworks both cover at `threshold` or above."""
+        b = (self.matrix[self._rows(selected)] >= threshold).astype(np.int32)
+        return (b @ b.T).toarray()
+
+    def category_coverage(self, selected=None):
+        """Average mapping strength per control category, shaped like the Gap Matrix table.
+
+        Returns (categories, {framework: [avg per category]}); categories are in
+        first-seen order, so the table can seed a CrosswalkEngine.
+        """
+        if self.categories is None:
+            raise ValueError("catalog has no control categories")
+        names = list(dict.fromkeys(c for c in self.categories if c))
+        col = {c: k for k, c in enumerate(names)}
+        keep = [j for j, c in enumerate(self.categories) if c]
+        ind = sparse.csr_matrix((np.ones(len(keep), dtype=np.float32),
+                                 (keep, [col[self.categories[j]] for j in keep])),
+                                shape=(len(self.controls), len(names)))  # C × K indicator
+        sizes = np.asarray(ind.sum(axis=0)).ravel()
+        rows = self._rows(selected)
+        avg = (self.matrix[rows] @ ind).toarray() / sizes
+        return names, {self.frameworks[i]: [round(float(v)) for v in avg[n]] for n, i in enumerate(rows)}
@@ -0,0 +1,348 @@
+"""
+feed_metrics.py — Per-feed request instrumentation for the shared HTTP client.
+Every http_client request is recorded into an in-process ring buffer with its
+DNS / connect / TLS / server-wait / transfer split, payload size, HTTP status
+and error; fetchers wrapped with metered() add parse time, cache hit/miss
+counts and the last time the feed produced data. summary() aggregates the
+buffer per feed for the diagnostics panel, and serve() exposes it as JSON
+(plus any extra routes, such as the metrics_exporter /metrics page).
+"""
+
+import contextvars
+import functools
+import json
+import socket
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+RING_SIZE = 512
+PHASES = ("dns", "connect", "tls", "wait", "transfer")
+SLOW_MS = 3000   # p95 above this is flagged in the panel
+
+# Connection setup times for the request running on this thread.
+_phase = threading.local()
+# Requests issued by the metered() call in progress; a context variable, so
+# asyncio.to_thread workers (async_fetch) report to the call that spawned them.
+_fetch = contextvars.ContextVar("feed_metrics_fetch", default=None)
+
+
+def _add(phase, seconds):
+    t = getattr(_phase, "t", None)
+    if t is not None:
+        t[phase] = t.get(phase, 0.0) + seconds
+
+
+def begin():
+    """Start collecting connection phase timings on this thread."""
+    _phase.t = {}
+
+
+def end():
+    """Phase timings (seconds) collected since begin(); empty when the pool reused a socket."""
+    t, _phase.t = getattr(_phase, "t", None) or {}, None
+    return t
+
+
+# ---------------------------------------------------------------------------
+# Timed transport — splits connection setup into DNS, TCP connect and TLS
+# ---------------------------------------------------------------------------
+class _TimedConnection:
+    def _new_conn(self):
+        # The request's hostname (set by TimedHTTPAdapter.send); a connection to
+        # anything else, such as a proxy, is opened untimed.
+        host = getattr(_phase, "host", None)
+        if not host or host.lower() != self.host.lower():
+            return super()._new_conn()
+        t0 = time.perf_counter()
+        try:
+            addrs = list(dict.fromkeys(ai[4][0] for ai in socket.getaddrinfo(
+                host, self.port, 0, socket.SOCK_STREAM)))
+        except OSError:
+            return super()._new_conn()   # urllib3 raises its own NameResolutionError
+        t1 = time.perf_counter()
+        _add("dns", t1 - t0)
+        # Connect to the resolved addresses in turn, as create_connection does,
+        # so the lookup is not repeated; `host` is restored before TLS verifies against it.
+        try:
+            for i, addr in enumerate(addrs):
+                self.host = addr
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError):
+                    if i == len(addrs) - 1:
+                        raise
+        finally:
+            self.host = host
+            _add("connect", time.perf_counter() - t1)
+
+    def connect(self):
+        t0 = time.perf_counter()
+        before = dict(getattr(_phase, "t", None) or {})
+        super().connect()
+        t = getattr(_phase, "t", None) or {}
+        setup = sum(t.get(p, 0.0) - before.get(p, 0.0) for p in ("dns", "connect"))
+        _add("tls", max(0.0, time.perf_counter() - t0 - setup))
+
+
+class TimedHTTPConnection(_TimedConnection, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnection, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools time DNS, connect and TLS for each new socket."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                                   "https": TimedHTTPSConnectionPool}
+
+    def send(self, request, *args, **kwargs):
+        _phase.host = urlsplit(request.url).hostname
+        try:
+            return super().send(request, *args, **kwargs)
+        finally:
+            _phase.host = None
+
+
+# ---------------------------------------------------------------------------
+# Ring buffer
+# ---------------------------------------------------------------------------
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec="seconds") if epoch else None
+
+
+def _pct(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _wire_bytes(response):
+    """Body bytes read off the wire so far (urllib3's raw.tell()), else the Content-Length;
+    a streamed body is not read yet when the request is recorded."""
+    try:
+        n = response.raw.tell()
+    except (AttributeError, OSError, ValueError):
+        n = 0
+    if n:
+        return n
+    length = response.headers.get("Content-Length", "")
+    return int(length) if length.isdigit() else None
+
+
+class FeedMetrics:
+    """Thread-safe ring buffer of request and fetch events plus per-feed counters."""
+
+    def __init__(self, size=RING_SIZE):
+        self.events = deque(maxlen=size)
+        self.cache = {}            # feed -> Counter(hit=, miss=)
+        self.last_success = {}     # feed -> epoch seconds
+        self.totals = {}           # feed -> Counter(requests=, errors=), never trimmed
+        self._lock = threading.Lock()
+
+    def record_request(self, feed, url, start, elapsed, response=None, error=None, phases=None):
+        """Record one http_client request; `start` is a perf_counter value, `elapsed` seconds."""
+        phases = phases or {}
+        ev = {"kind": "request", "ts": time.time(), "feed": feed, "url": url, "start": start,
+              "end": start + elapsed, "total_ms": _ms(elapsed), "status": None, "bytes": None, "error": error}
+        for p in ("dns", "connect", "tls"):
+            ev[p + "_ms"] = _ms(phases.get(p, 0.0))
+        headers_s = elapsed
+        if response is not None:
+            ev["status"] = response.status_code
+            ev["bytes"] = _wire_bytes(response)
+            # elapsed covers send -> headers parsed, per hop
+            headers_s = min(elapsed, sum(r.elapsed.total_seconds() for r in response.history + [response]))
+        setup_s = sum(phases.get(p, 0.0) for p in ("dns", "connect", "tls"))
+        ev["wait_ms"] = _ms(max(0.0, headers_s - setup_s))
+        ev["transfer_ms"] = _ms(max(0.0, elapsed - headers_s))
+        with self._lock:
+            self.events.append(ev)
+            c = self.totals.setdefault(feed, Counter())
+            c["requests"] += 1
+            c["errors"] += error is not None
+        issued = _fetch.get()
+        if issued is not None:
+            issued.append(ev)
+        return ev
+
+    def record_fetch(self, feed, reqs, elapsed, ok):
+        """Record a fetcher cache miss given the request events it issued:
+        parse time is wall time outside those requests."""
+        net = max(e["end"] for e in reqs) - min(e["start"] for e in reqs) if reqs else 0.0
+        with self._lock:
+            self.cache.setdefault(feed, Counter())["miss"] += 1
+            if ok:
+                self.last_success[feed] = time.time()
+            ev = {"kind": "fetch", "ts": time.time(), "feed": feed, "requests": len(reqs),
+                  "total_ms": _ms(elapsed), "parse_ms": _ms(max(0.0, elapsed - net)), "ok": ok}
+            self.events.append(ev)
+        return ev
+
+    def counters(self):
+        """Monotonic per-feed counts since start: requests, errors, cache hits and misses."""
+        with self._lock:
+            feeds = set(self.totals) | set(self.cache)
+            return {f: {"requests": self.totals.get(f, {}).get("requests", 0),
+                        "errors": self.totals.get(f, {}).get("errors", 0),
+                        "cache_hits": self.cache.get(f, {}).get("hit", 0),
+                        "cache_misses": self.cache.get(f, {}).get("miss", 0)} for f in feeds}
+
+    def record_hit(self, feed):
+        with self._lock:
+            self.cache.setdefault(feed, Counter())["hit"] += 1
+
+    def metered(self, feed):
+        """Decorator for a (cached) fetcher: a call that itself issued requests
+        is a miss and is timed; one that did not was served from the cache.
+        Requests made by other sessions meanwhile do not count toward it."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def call(*args, **kwargs):
+                issued = []
+                token = _fetch.set(issued)
+                start = time.perf_counter()
+                try:
+                    out = fn(*args, **kwargs)
+                finally:
+                    _fetch.reset(token)
+                    outer = _fetch.get()
+                    if outer is not None:   # nested metered call: the enclosing one issued these too
+                        outer.extend(issued)
+                if issued:
+                    self.record_fetch(feed, issued, time.perf_counter() - start, out is not None)
+                else:
+                    self.record_hit(feed)
+                return out
+            return call
+        return wrap
+
+    # ------------------------------------------------------------ reporting
+    def summary(self):
+        """Per-feed aggregates over the buffered events, ordered by feed name."""
+        with self._lock:
+            events = list(self.events)
+            cache = {f: dict(c) for f, c in self.cache.items()}
+            success = dict(self.last_success)
+        feeds = {}
+        for e in events:
+            feeds.setdefault(e["feed"], {"request": [], "fetch": []})[e["kind"]].append(e)
+        now = time.time()
+        out = {}
+        for feed in sorted(set(feeds) | set(cache), key=str):
+            reqs = feeds.get(feed, {}).get("request", [])
+            fetches = feeds.get(feed, {}).get("fetch", [])
+            last = reqs[-1] if reqs else {}
+            ok_reqs = [e for e in reqs if e["error"] is None]
+            lat = [e["total_ms"] for e in reqs]
+            # Feeds only fetched through http_client (no metered fetcher) count a 2xx as success.
+            ok_at = success.get(feed) or (ok_reqs[-1]["ts"] if ok_reqs and feed not in cache else None)
+            c = cache.get(feed, {})
+            out[feed] = {
+                "requests": len(reqs), "errors": len(reqs) - len(ok_reqs),
+                "last_status": last.get("status"), "last_error": last.get("error"),
+                "last_url": last.get("url"), "last_request": _iso(last.get("ts")),
+                "p50_ms": _pct(lat, 0.5), "p95_ms": _pct(lat, 0.95),
+                "last_phases_ms": {p: last.get(p + "_ms") for p in PHASES} if last else {},
+                "bytes": last.get("bytes"),
+                "parse_ms": fetches[-1]["parse_ms"] if fetches else None,
+                "cache_hits": c.get("hit", 0), "cache_misses": c.get("miss", 0),
+                "last_success": _iso(ok_at), "age_s": int(now - ok_at) if ok_at else None,
+            }
+        return out
+
+    def snapshot(self, recent=50):
+        """JSON-ready view: per-feed summary plus the most recent raw events."""
+        with self._lock:
+            tail = list(self.events)[-recent:] if recent else []
+        tail = [{k: v for k, v in e.items() if k not in ("start", "end")} for e in tail]
+        for e in tail:
+            e["ts"] = _iso(e["ts"])
+        return {"generated": _iso(time.time()), "ring_size": self.events.maxlen,
+                "feeds": self.summary(), "recent": tail}
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+            self.cache.clear()
+            self.last_success.clear()
+            self.totals.clear()
+
+
+METRICS = FeedMetrics()
+
+
+def feed_name(feed, url):
+    """The feed label for a request: the `feed=` argument, else the URL host."""
+    return feed or urlsplit(url).hostname or url
+
+
+# ---------------------------------------------------------------------------
+# Diagnostics endpoint
+# ---------------------------------------------------------------------------
+class _Handler(BaseHTTPRequestHandler):
+    routes = {}
+
+    def do_GET(self):
+        route = self.routes.get(urlsplit(self.path).path.rstrip("/"))
+        if route is None:
+            self.send_error(404)
+            return
+        ctype, body = route(self.headers)
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def json_route(metrics=METRICS):
+    def route(headers):
+        return "application/json", json.dumps(metrics.snapshot(), indent=1).encode()
+    return route
+
+
+def serve(port, host="127.0.0.1", metrics=METRICS, routes=None):
+    """Serve `metrics` as JSON at http://host:port/feeds.json from a daemon thread.
+
+    `routes` adds paths: {path: callable(request_headers) -> (content_type, body bytes)}.
+    """
+    table = {"/feeds": json_route(metrics), "/feeds.json": json_route(metrics)}
+    table.update(routes or {})
+    handler = type("FeedMetricsHandler", (_Handler,), {"routes": table})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="feed-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,101 @@
+"""
+feed_parser.py — Streaming RSS 2.0 / Atom parser for advisory feeds.
+Items are consumed with ElementTree.iterparse and cleared as they go, the
+date format is detected once per feed, and parsing stops as soon as a
+newest-first feed passes the age horizon.
+"""
+
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone, timedelta
+from email.utils import parsedate_to_datetime
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+ITEM_TAGS = ("item", ATOM + "entry")
+DATE_TAGS = ("pubDate", ATOM + "updated")
+# Newest-first items that must be seen before the feed is trusted to be ordered.
+MIN_ORDERED_RUN = 20
+
+
+def _rfc822(s):
+    return parsedate_to_datetime(s)
+
+
+def _iso(s):
+    return datetime.fromisoformat(s)
+
+
+def _detect(s):
+    """Pick the parser for a feed from its first date string."""
+    return _iso if s[:4].isdigit() else _rfc822
+
+
+def _parse(parser, s):
+    try:
+        dt = parser(s)
+    except (TypeError, ValueError, IndexError):
+        other = _rfc822 if parser is _iso else _iso
+        try:
+            dt = other(s)
+        except (TypeError, ValueError, IndexError):
+            return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def iter_item_dates(source, horizon_days=None, now=None):
+    """Yield the publication datetime (or None if unparseable) of each feed item.
+
+    `source` is a filename or binary file object. With `horizon_days`, parsing
+    stops at the first item older than the horizon, provided the feed has been
+    newest-first for at least MIN_ORDERED_RUN items (an unordered feed is read
+    to the end).
+    """
+    now = now or datetime.now(timezone.utc)
+    oldest = now - timedelta(days=horizon_days) if horizon_days is not None else None
+    parser = None
+    prev = None
+    ordered = True
+    run = 0
+    for _, elem in ET.iterparse(source, events=("end",)):
+        if elem.tag not in ITEM_TAGS:
+            continue
+        raw = ""
+        for tag in DATE_TAGS:
+            raw = (elem.findtext(tag) or "").strip()
+            if raw:
+                break
+        elem.clear()
+        dt = None
+        if raw:
+            parser = parser or _detect(raw)
+            dt = _parse(parser, raw)
+        yield dt
+        if dt is None:
+            continue
+        if prev is not None and dt > prev:
+            ordered = False
+        prev = dt
+        run += 1
+        if oldest is not None and ordered and run >= MIN_ORDERED_RUN and dt < oldest:
+            return
+
+
+def count_item_windows(source, windows=(1, 7, 30, 365), now=None):
+    """Count feed items per age window (days), scanning only up to the widest window.
+
+    Returns {"d<N>": count, ..., "total_in_feed": items scanned}.
+    """
+    now = now or datetime.now(timezone.utc)
+    counts = dict.fromkeys(windows, 0)
+    total = 0
+    # +1: ages are whole days, so an item up to a day past the horizon still counts
+    for dt in iter_item_dates(source, horizon_days=max(windows) + 1, now=now):
+        total += 1
+        if dt is None:
+            continue
+        age = (now - dt).days
+        for d in windows:
+            if age <= d:
+                counts[d] += 1
+    out = {f"d{d}": c for d, c in counts.items()}
+    out["total_in_feed"] = total
+    return out
@@ -0,0 +1,105 @@
+"""
+http_client.py — Shared HTTP client for every SecAI-Nexus feed fetcher.
+One pooled, keep-alive requests.Session with bounded, jittered retries,
+gzip/deflate negotiation and per-feed timeouts. Used by both
+streamlit_app.py and live_metrics.py. Set SECAI_HTTP_MODE=record|replay to
+route it through recorded fixtures instead (see http_replay.py). Every
+request is timed into feed_metrics.METRICS.
+"""
+
+import time
+
+import requests
+from urllib3.util.retry import Retry
+
+import feed_metrics
+import http_replay
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+USER_AGENT = "SecAI-Nexus-GRC/5.0 (educational; admin@secai-nexus.dev)"
+
+# Host pools kept alive (one per feed host) and sockets per host pool.
+POOL_HOSTS = 16
+POOL_PER_HOST = 8
+
+CONNECT_TIMEOUT = 4
+DEFAULT_READ_TIMEOUT = 14
+
+# Read timeouts (seconds) per feed name; keys match the `feed=` argument.
+FEED_TIMEOUTS = {
+    # streamlit_app.py
+    "kev": 14, "bazaar": 22, "urlhaus": 15, "feodo": 15, "sans": 12, "tor": 15,
+    "topports": 15, "topips": 15, "honeypot": 12,
+    # live_metrics.py
+    "cisa_kev": 10, "nvd_cve": 15, "malwarebazaar": 15, "live_urlhaus": 15, "feodo_tracker": 15,
+    "cisa_ics_rss": 15,
+}
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+def _retry():
+    # A read timeout is not retried, so a request's worst case stays close to one read
+    # timeout (plus short connect retries); POST is never replayed.
+    kw = dict(total=2, connect=2, read=0, status=2, backoff_factor=0.5,
+              status_forcelist=RETRY_STATUS,
+              allowed_methods=frozenset({"GET", "HEAD"}),
+              respect_retry_after_header=True, raise_on_status=False)
+    try:
+        return Retry(backoff_jitter=0.3, backoff_max=8, **kw)
+    except TypeError:  # urllib3 < 2.0 has no jitter/max knobs
+        return Retry(**kw)
+
+
+def build_session():
+    """Create a session with a sized, retrying, timed HTTPAdapter on http and https."""
+    s = requests.Session()
+    s.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate",
+                      "Connection": "keep-alive"})
+    adapter = feed_metrics.TimedHTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST,
+                                            max_retries=_retry())
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    http_replay.from_env(s, upstream=adapter)
+    return s
+
+
+# The session is configured once here and never mutated afterwards; urllib3
+# connection pools are thread-safe, so concurrent fetchers can share it.
+SESSION = build_session()
+
+
+def timeout_for(feed=None, timeout=None):
+    """(connect, read) timeout tuple for a feed, or for an explicit read timeout."""
+    if timeout is None:
+        timeout = FEED_TIMEOUTS.get(feed, DEFAULT_READ_TIMEOUT)
+    return (min(CONNECT_TIMEOUT, timeout), timeout)
+
+
+# ---------------------------------------------------------------------------
+# Request helpers — return the Response, or None once retries are exhausted
+# ---------------------------------------------------------------------------
+def _send(method, url, feed, timeout, kwargs):
+    r = error = None
+    feed_metrics.begin()
+    start = time.perf_counter()
+    try:
+        r = SESSION.request(method, url, timeout=timeout_for(feed, timeout), **kwargs)
+        r.raise_for_status()
+        return r
+    except requests.RequestException as e:
+        error = f"{type(e).__name__}: {e}"[:200]
+        return None
+    finally:
+        feed_metrics.METRICS.record_request(feed_metrics.feed_name(feed, url), url, start,
+                                            time.perf_counter() - start, r, error, feed_metrics.end())
+
+
+def get(url, feed=None, timeout=None, **kwargs):
+    return _send("GET", url, feed, timeout, kwargs)
+
+
+def post(url, feed=None, timeout=None, **kwargs):
+    return _send("POST", url, feed, timeout, kwargs)
@@ -0,0 +1,209 @@
+"""
+http_replay.py — Record/replay transport for the shared HTTP session.
+A requests transport adapter that captures real feed responses to a
+fixture directory and serves them back later, with optional latency and
+failure injection, so fetch/parse/render paths can be profiled
+deterministically and offline. Enabled for the whole app through
+environment variables (see from_env) or mounted explicitly with install().
+
+Dates in a URL (NVD pubStartDate/lastModEndDate values, the honeypot
+summary's day) are keyed by their distance in days from the request day,
+so fixtures recorded on one day keep matching on later days.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+MODES = ("record", "replay")
+DEFAULT_FIXTURES = os.path.join("data", "fixtures")
+# Hop-by-hop and encoding headers are dropped: bodies are stored decoded.
+DROP_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection", "keep-alive"}
+DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})(?:T[\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)?")
+
+log = logging.getLogger("secai.http_replay")
+
+
+def _relative(value, today):
+    m = DATE_RE.fullmatch(value)
+    if not m:
+        return value
+    try:
+        return "{d-%d}" % (today - date.fromisoformat(m.group(1))).days
+    except ValueError:
+        return value
+
+
+def normalize_url(url, today=None):
+    """`url` with every date-valued path segment or query value replaced by
+    {d-N}, N days before `today` (default: the current UTC day)."""
+    today = today or datetime.now(timezone.utc).date()
+    parts = urlsplit(url)
+    segs = parts.path.split("/")
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    new_segs = [_relative(seg, today) for seg in segs]
+    new_query = [(k, _relative(v, today)) for k, v in query]
+    if new_segs == segs and new_query == query:
+        return url      # nothing time-varying: keep the exact URL (and existing fixture keys)
+    return urlunsplit(parts._replace(path="/".join(new_segs), query=urlencode(new_query, safe="{}:")))
+
+
+def fixture_key(request, today=None):
+    """Stable name for a request: method, normalized URL (see normalize_url) and body."""
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    h = hashlib.sha1(f"{request.method} {normalize_url(request.url, today)}\n".encode() + body).hexdigest()
+    return h[:20]
+
+
+class RecordReplayAdapter(HTTPAdapter):
+    """Transport adapter that records responses to `fixtures` or replays them from it.
+
+    record: requests go through `upstream` (the normal retrying adapter) and
+    each response is saved as <key>.json (status, reason, headers, url) plus
+    <key>.bin (decoded body), then served from the saved copy.
+    replay: responses come only from fixtures; a missing fixture raises
+    requests.ConnectionError, exactly like an unreachable host.
+    `latency` (seconds, or a (low, high) range) is slept before each replayed
+    response; with probability `failure_rate` a request instead fails with
+    `fail_status`, or with a ConnectionError when `fail_status` is None.
+    """
+
+    def __init__(self, fixtures=DEFAULT_FIXTURES, mode="replay", latency=0.0, failure_rate=0.0,
+                 fail_status=503, seed=None, upstream=None):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, not {mode!r}")
+        super().__init__()
+        self.fixtures = fixtures
+        self.mode = mode
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.fail_status = fail_status
+        self.upstream = upstream if upstream is not None else HTTPAdapter()
+        self.stats = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------------- storage
+    def _paths(self, key):
+        base = os.path.join(self.fixtures, key)
+        return base + ".json", base + ".bin"
+
+    def _save(self, key, request, resp):
+        meta_path, body_path = self._paths(key)
+        meta = {"method": request.method, "url": request.url, "status": resp.status_code,
+                "reason": resp.reason,
+                "headers": {k: v for k, v in resp.headers.items() if k.lower() not in DROP_HEADERS}}
+        os.makedirs(self.fixtures, exist_ok=True)
+        for path, data in ((body_path, resp.content), (meta_path, json.dumps(meta, indent=1).encode())):
+            fd, tmp = tempfile.mkstemp(dir=self.fixtures, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return meta, resp.content
+
+    def _load(self, key):
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def _build(self, request, status, reason, headers, body):
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, reason=reason,
+                           preload_content=False, decode_content=False)
+        return self.build_response(request, raw)
+
+    # ---------------------------------------------------------------- transport
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _delay(self):
+        lat = self.latency
+        if isinstance(lat, (tuple, list)):
+            with self._lock:
+                lat = self._rng.uniform(*lat)
+        if lat > 0:
+            time.sleep(lat)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = fixture_key(request)
+        if self.mode == "record":
+            resp = self.upstream.send(request, stream=False, timeout=timeout, verify=verify,
+                                      cert=cert, proxies=proxies)
+            meta, body = self._save(key, request, resp)
+            self._count("recorded")
+            return self._build(request, meta["status"], meta["reason"], meta["headers"], body)
+        self._delay()
+        with self._lock:
+            fail = self.failure_rate and self._rng.random() < self.failure_rate
+        if fail:
+            self._count("injected_failures")
+            if self.fail_status is None:
+                raise requests.ConnectionError(f"injected failure for {request.url}", request=request)
+            return self._build(request, self.fail_status, "Injected Failure", {}, b"")
+        meta, body = self._load(key)
+        if meta is None:
+            self._count("misses")
+            raise requests.ConnectionError(f"no fixture for {request.method} {request.url}", request=request)
+        self._count("hits")
+        return self._build(request, meta["status"], meta["reason"], meta["headers"], body)
+
+    def close(self):
+        self.upstream.close()
+        super().close()
+
+
+def save_fixture(fixtures, method, url, body, status=200, headers=None, data=None):
+    """Write a fixture by hand (e.g. a synthetic payload) for `method url` with form/body `data`."""
+    request = requests.Request(method, url, data=data).prepare()
+    resp = requests.Response()
+    resp.status_code, resp.reason, resp._content = status, "OK" if status < 400 else "Error", body
+    resp.headers.update(headers or {})
+    return RecordReplayAdapter(fixtures, "replay")._save(fixture_key(request), request, resp)
+
+
+def install(session, mode, fixtures=DEFAULT_FIXTURES, upstream=None, **kwargs):
+    """Mount a RecordReplayAdapter on `session` for http and https; returns the adapter."""
+    adapter = RecordReplayAdapter(fixtures, mode, upstream=upstream, **kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
+
+
+def from_env(session, upstream=None, environ=os.environ):
+    """Install from SECAI_HTTP_MODE (record|replay), SECAI_FIXTURES (directory),
+    SECAI_REPLAY_LATENCY ("0.2" or "0.1-0.5" seconds), SECAI_REPLAY_FAILURE_RATE
+    (0-1) and SECAI_REPLAY_SEED. Returns the adapter, or None when the mode is unset
+    or not one of MODES (logged; requests then go to the live upstreams)."""
+    mode = environ.get("SECAI_HTTP_MODE", "").strip().lower()
+    if not mode:
+        return None
+    if mode not in MODES:
+        log.warning("ignoring SECAI_HTTP_MODE=%r (expected one of %s); using live HTTP", mode, ", ".join(MODES))
+        return None
+    lat = environ.get("SECAI_REPLAY_LATENCY", "0")
+    latency = tuple(float(x) for x in lat.split("-", 1)) if "-" in lat else float(lat)
+    seed = environ.get("SECAI_REPLAY_SEED")
+    return install(session, mode, environ.get("SECAI_FIXTURES", DEFAULT_FIXTURES), upstream=upstream,
+                   latency=latency, failure_rate=float(environ.get("SECAI_REPLAY_FAILURE_RATE", "0")),
+                   seed=int(seed) if seed else None)
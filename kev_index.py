@@ -0,0 +1,131 @@
+"""
+kev_index.py — Incremental index over the CISA Known Exploited Vulnerabilities
+catalog. Persists the processed cveID set and aggregate counters between
+refreshes so only newly appended entries are folded in, instead of
+recounting the whole catalog every time.
+"""
+
+import threading
+from datetime import datetime, timezone, timedelta
+
+from state_store import load_json, save_json, state_path
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+SCHEMA = 1
+WINDOWS = (1, 7, 30, 365)
+RECENT_N = 10
+RECENT_FIELDS = ("cveID", "vendorProject", "product", "vulnerabilityName",
+                 "dateAdded", "dueDate", "knownRansomwareCampaignUse")
+
+
+def _empty_state():
+    return {"schema": SCHEMA, "version": None, "seen": [], "rw": 0,
+            "vendors": {}, "products": {}, "dates": {}, "recent": []}
+
+
+def _valid_date(s):
+    try:
+        datetime.strptime(s, "%Y-%m-%d")
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+class KevIndex:
+    """Running KEV aggregates keyed on the set of cveIDs already applied.
+
+    Age windows are kept as a dateAdded -> count histogram; dates that fall
+    out of the widest window are expired on each refresh, so window counts
+    never require a pass over the catalog.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or state_path("kev_index.json")
+        self._lock = threading.Lock()
+        self._state = self._load()
+        self._seen = set(self._state["seen"])
+
+    # -- persistence --------------------------------------------------------
+    def _load(self):
+        return load_json(self.path, SCHEMA) or _empty_state()
+
+    def _save(self):
+        self._state["seen"] = sorted(self._seen)
+        save_json(self.path, self._state)  # read-only filesystem: in-memory only
+
+    def _reset(self):
+        self._state = _empty_state()
+        self._seen = set()
+
+    # -- incremental updates ------------------------------------------------
+    def _apply(self, v, cutoff):
+        s = self._state
+        self._seen.add(v.get("cveID"))
+        if v.get("knownRansomwareCampaignUse", "").lower() == "known":
+            s["rw"] += 1
+        vn = v.get("vendorProject", "?")
+        s["vendors"][vn] = s["vendors"].get(vn, 0) + 1
+        pn = v.get("product", "?")
+        s["products"][pn] = s["products"].get(pn, 0) + 1
+        added = v.get("dateAdded", "")
+        if _valid_date(added) and added >= cutoff:
+            s["dates"][added] = s["dates"].get(added, 0) + 1
+
+    def _expire(self, cutoff):
+        dates = self._state["dates"]
+        for d in [d for d in dates if d < cutoff]:
+            del dates[d]
+
+    def update(self, vulns, version=None, now=None):
+        """Fold a freshly downloaded catalog into the index and return the summary.
+
+        Only entries whose cveID has not been seen are applied. If a previously
+        seen cveID disappears from the catalog the index is rebuilt from scratch.
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=max(WINDOWS))).strftime("%Y-%m-%d")
+        with self._lock:
+            if version is None or version != self._state["version"]:
+                ids = {v.get("cveID") for v in vulns}
+                if not self._seen.issubset(ids):
+                    self._reset()
+                new = [v for v in vulns if v.get("cveID") not in self._seen]
+                for v in new:
+                    self._apply(v, cutoff)
+                if new:
+                    recent = self._state["recent"] + [{k: v.get(k, "") for k in RECENT_FIELDS} for v in new]
+                    self._state["recent"] = sorted(recent, key=lambda x: x.get("dateAdded", ""), reverse=True)[:RECENT_N]
+                self._state["version"] = version
+                self._expire(cutoff)
+                self._save()
+            else:
+                self._expire(cutoff)
+            return self._summary(len(vulns), now)
+
+    # -- queries --------------------------------------------------------------
+    def _summary(self, total, now):
+        s = self._state
+        vd, prods = s["vendors"], s["products"]
+        cnt = {}
+        for d in WINDOWS:
+            lo = (now - timedelta(days=d)).strftime("%Y-%m-%d")
+            cnt[d] = sum(c for day, c in s["dates"].items() if day >= lo)
+        tv = max(vd, key=vd.get) if vd else "N/A"
+        tp = max(prods, key=prods.get) if prods else "N/A"
+        top3v = sorted(vd, key=vd.get, reverse=True)[:3]
+        return {"total": total, "d1": cnt[1], "d7": cnt[7], "d30": cnt[30], "d365": cnt[365],
+                "rw": s["rw"], "tv": tv, "tvc": vd.get(tv, 0), "vendors": len(vd),
+                "tp": tp, "tpc": prods.get(tp, 0), "top3v": top3v, "prods": len(prods)}
+
+    def recent(self):
+        """Most recently added catalog entries, newest first."""
+        with self._lock:
+            return [dict(r) for r in self._state["recent"]]
+
+
+KEV_INDEX = KevIndex()
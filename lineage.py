@@ -0,0 +1,113 @@
+"""
+lineage.py — Data-driven Sankey lineage graphs.
+Node and link arrays are built from a (source, target, value) mapping
+table through a label index, validated, optionally pruned to the heaviest
+links, and rendered to Plotly figure JSON that is cached per mapping
+version (a content hash of the table and render options).
+"""
+
+import hashlib
+import json
+import math
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+
+FIGURE_CACHE_SIZE = 16
+_FIGURE_CACHE = OrderedDict()
+
+
+def build_lineage(edges, min_value=0, max_links=None):
+    """Node/link arrays for a lineage table.
+
+    `edges` is an iterable of (source_label, target_label, value). Nodes are
+    ordered by tier (0 = no incoming links, else one past the deepest parent)
+    and then first appearance, so frameworks precede categories and controls.
+    Links below `min_value` are dropped, then only the `max_links` heaviest are
+    kept; nodes left without links are removed.
+    Returns {labels, tier, source, target, value}.
+    """
+    links = [(s, t, float(v)) for s, t, v in edges]
+    for s, t, v in links:
+        if s == t:
+            raise ValueError(f"self-loop on {s!r}")
+        if not math.isfinite(v) or v <= 0:
+            raise ValueError(f"link {s!r} -> {t!r} has invalid value {v!r}")
+    links = [e for e in links if e[2] >= min_value]
+    if max_links is not None and len(links) > max_links:
+        keep = set(sorted(range(len(links)), key=lambda i: -links[i][2])[:max_links])
+        links = [e for i, e in enumerate(links) if i in keep]
+
+    order = list(dict.fromkeys(n for s, t, _ in links for n in (s, t)))
+    parents = {n: [] for n in order}
+    for s, t, _ in links:
+        parents[t].append(s)
+    tier, visiting = {}, set()
+
+    def depth(n):
+        if n in tier:
+            return tier[n]
+        if n in visiting:
+            raise ValueError(f"cycle through {n!r}")
+        visiting.add(n)
+        tier[n] = max((depth(p) + 1 for p in parents[n]), default=0)
+        visiting.discard(n)
+        return tier[n]
+
+    for n in order:
+        depth(n)
+    labels = sorted(order, key=lambda n: tier[n])   # stable: first appearance within a tier
+    index = {n: i for i, n in enumerate(labels)}
+    graph = {"labels": labels, "tier": [tier[n] for n in labels],
+             "source": [index[s] for s, _, _ in links], "target": [index[t] for _, t, _ in links],
+             "value": [v for _, _, v in links]}
+    validate(graph)
+    return graph
+
+
+def validate(graph):
+    """Raise ValueError unless the link arrays agree in length and reference existing nodes."""
+    n = len(graph["labels"])
+    if len(set(graph["labels"])) != n:
+        raise ValueError("duplicate node labels")
+    if not len(graph["source"]) == len(graph["target"]) == len(graph["value"]):
+        raise ValueError(f"link arrays differ in length: source={len(graph['source'])}, "
+                         f"target={len(graph['target'])}, value={len(graph['value'])}")
+    for i in graph["source"] + graph["target"]:
+        if not 0 <= i < n:
+            raise ValueError(f"link references node {i}, but there are {n} nodes")
+
+
+def mapping_version(edges, **opts):
+    """Content hash of a mapping table plus render options."""
+    doc = json.dumps([list(e) for e in edges] + [sorted(opts.items())], sort_keys=True, default=str)
+    return hashlib.sha1(doc.encode()).hexdigest()
+
+
+def figure_json(edges, tier_colors, node_colors=None, link_color="rgba(0, 229, 255, 0.32)",
+                min_value=0, max_links=None, pad=22, thickness=24, **layout):
+    """Plotly Sankey figure JSON for `edges`, cached per mapping version.
+
+    Node colors come from `tier_colors` (last one repeats for deeper tiers)
+    unless overridden per label in `node_colors`. Extra keyword arguments go
+    to the figure layout.
+    """
+    edges = list(edges)
+    key = mapping_version(edges, tier_colors=tier_colors, node_colors=node_colors, link_color=link_color,
+                          min_value=min_value, max_links=max_links, pad=pad, thickness=thickness, **layout)
+    hit = _FIGURE_CACHE.get(key)
+    if hit is not None:
+        _FIGURE_CACHE.move_to_end(key)
+        return hit
+    g = build_lineage(edges, min_value, max_links)
+    node_colors = node_colors or {}
+    colors = [node_colors.get(n, tier_colors[min(t, len(tier_colors) - 1)]) for n, t in zip(g["labels"], g["tier"])]
+    fig = go.Figure(data=[go.Sankey(
+        node=dict(pad=pad, thickness=thickness, line=dict(color="#111", width=0.5), label=g["labels"], color=colors),
+        link=dict(source=g["source"], target=g["target"], value=g["value"], color=link_color))])
+    fig.update_layout(**layout)
+    out = fig.to_json()
+    _FIGURE_CACHE[key] = out
+    if len(_FIGURE_CACHE) > FIGURE_CACHE_SIZE:
+        _FIGURE_CACHE.popitem(last=False)
+    return out
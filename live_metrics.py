@@ -4,12 +4,18 @@ of SecAI-Nexus GRC. Pulls real data from free, no-API-key sources.
 """
 
 import streamlit as st
-import requests
+import http_client
 import json
 import html
 from datetime import datetime, timezone, timedelta
 import math
 
+import async_fetch
+import feed_metrics
+import feed_parser
+from kev_index import KEV_INDEX
+from nvd_index import NVD_INDEX, MAX_PAGES_PER_REFRESH as NVD_MAX_PAGES, RATE_LIMIT as NVD_RATE_LIMIT
+
 # ---------------------------------------------------------------------------
 # API Configuration (Decoupled Hardcoded URLs)
 # ---------------------------------------------------------------------------
@@ -23,26 +29,15 @@ API_URLS = {
 }
 
 # ---------------------------------------------------------------------------
-# Shared request helper
+# Shared request helpers (pooled session, retries and timeouts in http_client)
 # ---------------------------------------------------------------------------
-SESSION = requests.Session()
-SESSION.headers.update({"User-Agent": "SecAI-Nexus-GRC/1.0 (educational dashboard)"})
+def _get(url, feed=None, timeout=None, **kwargs):
+    return http_client.get(url, feed=feed, timeout=timeout, **kwargs)
 
-def _get(url, timeout=10, **kwargs):
-    try:
-        r = SESSION.get(url, timeout=timeout, **kwargs)
-        r.raise_for_status()
-        return r
-    except Exception:
-        return None
+def _post(url, feed=None, timeout=None, **kwargs):
+    return http_client.post(url, feed=feed, timeout=timeout, **kwargs)
 
-def _post(url, timeout=10, **kwargs):
-    try:
-        r = SESSION.post(url, timeout=timeout, **kwargs)
-        r.raise_for_status()
-        return r
-    except Exception:
-        return None
+_metered = feed_metrics.METRICS.metered
 
 # ---------------------------------------------------------------------------
 # Formatters (with built-in HTML Escaping to prevent XSS)
@@ -65,58 +60,55 @@ def _delta_fmt(n, positive_is_bad=True):
 # --- DATA FETCHERS ---
 # ---------------------------------------------------------------------------
 
+@_metered("cisa_kev")
 @st.cache_data(ttl=3600, show_spinner=False)
 def fetch_cisa_kev():
-    r = _get(API_URLS["cisa_kev"])
+    r = _get(API_URLS["cisa_kev"], "cisa_kev")
     if not r: return None
     try:
         data = r.json()
-        vulns = data.get("vulnerabilities", [])
-        now = datetime.now(timezone.utc)
-        total = len(vulns)
-        d1 = d7 = d30 = d365 = 0
-        for v in vulns:
-            added_str = v.get("dateAdded", "")
-            try:
-                added = datetime.strptime(added_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-                age = (now - added).days
-                if age <= 1:   d1   += 1
-                if age <= 7:   d7   += 1
-                if age <= 30:  d30  += 1
-                if age <= 365: d365 += 1
-            except Exception:
-                pass
-        return {"total": total, "d1": d1, "d7": d7, "d30": d30, "d365": d365}
+        k = KEV_INDEX.update(data.get("vulnerabilities", []), data.get("catalogVersion"))
+        return {"total": k["total"], "d1": k["d1"], "d7": k["d7"], "d30": k["d30"], "d365": k["d365"]}
     except Exception:
         return None
 
+@_metered("nvd_cve")
 @st.cache_data(ttl=3600, show_spinner=False)
 def fetch_nvd_cve_counts():
+    # One NVD rate-limit window per refresh: while the publication index is still bootstrapping,
+    # the four fallback totalResults queries below take their share of it.
+    windows = (1, 7, 30, 365)
+    ready = NVD_INDEX.ready()
+    if NVD_INDEX.refresh(budget=NVD_MAX_PAGES if ready else NVD_RATE_LIMIT - len(windows)):
+        return NVD_INDEX.counts()
+    if ready: return None   # restarted its bootstrap mid-run; those pages used this window
+
+    # Publication index still bootstrapping: fall back to four totalResults queries.
     now = datetime.now(timezone.utc)
-    def _count(start_dt):
+    async def _count(start_dt):
         params = {
             "pubStartDate": start_dt.strftime("%Y-%m-%dT%H:%M:%S.000"),
             "pubEndDate":   now.strftime("%Y-%m-%dT%H:%M:%S.000"),
             "resultsPerPage": 1,
         }
-        r = _get(API_URLS["nvd_cve"], params=params, timeout=15)
+        r = await async_fetch.aget(API_URLS["nvd_cve"], "nvd_cve", params=params)
         if r:
             try: return r.json().get("totalResults", None)
             except Exception: return None
         return None
 
-    today = _count(now - timedelta(days=1))
-    d7    = _count(now - timedelta(days=7))
-    d30   = _count(now - timedelta(days=30))
-    d365  = _count(now - timedelta(days=365))
+    today, d7, d30, d365 = async_fetch.gather(
+        *(_count(now - timedelta(days=d)) for d in windows))
 
     if any(x is None for x in [today, d7, d30, d365]): return None
     return {"today": today, "d7": d7, "d30": d30, "d365": d365}
 
+@_metered("malwarebazaar")
 @st.cache_data(ttl=1800, show_spinner=False)
 def fetch_malwarebazaar_recent():
-    r_day  = _post(API_URLS["malwarebazaar"], data={"query": "get_recent", "selector": "time_frame", "time_frame": "1d"}, timeout=15)
-    r_week = _post(API_URLS["malwarebazaar"], data={"query": "get_recent", "selector": "time_frame", "time_frame": "7d"}, timeout=15)
+    r_day, r_week = async_fetch.gather(
+        async_fetch.apost(API_URLS["malwarebazaar"], "malwarebazaar", data={"query": "get_recent", "selector": "time_frame", "time_frame": "1d"}),
+        async_fetch.apost(API_URLS["malwarebazaar"], "malwarebazaar", data={"query": "get_recent", "selector": "time_frame", "time_frame": "7d"}))
 
     def _parse(r):
         if not r: return None
@@ -129,9 +121,10 @@ def fetch_malwarebazaar_recent():
 
     return {"d1": _parse(r_day), "d7": _parse(r_week)}
 
+@_metered("live_urlhaus")
 @st.cache_data(ttl=1800, show_spinner=False)
 def fetch_urlhaus_stats():
-    r = _get(API_URLS["urlhaus"], timeout=15)
+    r = _get(API_URLS["urlhaus"], "live_urlhaus")
     if not r: return None
     try:
         j = r.json()
@@ -142,9 +135,10 @@ def fetch_urlhaus_stats():
     except Exception: pass
     return None
 
+@_metered("feodo_tracker")
 @st.cache_data(ttl=600, show_spinner=False)
 def fetch_feodo_c2():
-    r = _get(API_URLS["feodo_tracker"], timeout=15)
+    r = _get(API_URLS["feodo_tracker"], "feodo_tracker")
     if not r: return None
     try:
         data = r.json()
@@ -152,35 +146,26 @@ def fetch_feodo_c2():
         return {"active": len(active), "total": len(data)}
     except Exception: return None
 
+@_metered("cisa_ics_rss")
 @st.cache_data(ttl=3600, show_spinner=False)
 def fetch_cisa_ics_alerts():
-    import xml.etree.ElementTree as ET
-    r = _get(API_URLS["cisa_ics_rss"], timeout=15)
+    r = _get(API_URLS["cisa_ics_rss"], "cisa_ics_rss", stream=True)
     if not r: return None
     try:
-        root = ET.fromstring(r.content)
-        ns = {"atom": "http://www.w3.org/2005/Atom"}
-        now = datetime.now(timezone.utc)
-        d1 = d7 = d30 = d365 = total = 0
-        items = root.findall(".//item") or root.findall(".//atom:entry", ns)
-        for item in items:
-            total += 1
-            pub = (item.findtext("pubDate") or item.findtext("atom:updated", namespaces=ns) or "")
-            try:
-                for fmt in ("%a, %d %b %Y %H:%M:%S %z", "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%SZ"):
-                    try:
-                        dt = datetime.strptime(pub.strip(), fmt)
-                        if dt.tzinfo is None: dt = dt.replace(tzinfo=timezone.utc)
-                        break
-                    except ValueError: continue
-                age = (now - dt).days
-                if age <= 1:   d1   += 1
-                if age <= 7:   d7   += 1
-                if age <= 30:  d30  += 1
-                if age <= 365: d365 += 1
-            except Exception: pass
-        return {"d1": d1, "d7": d7, "d30": d30, "d365": d365, "total_in_feed": total}
+        r.raw.decode_content = True
+        return feed_parser.count_item_windows(r.raw)
     except Exception: return None
+    finally:
+        r.close()
+
+def fetch_all_live():
+    """Run all six live fetchers concurrently.
+
+    Each fetcher keeps its own st.cache_data TTL; only cache misses hit the
+    network, and the section waits for the slowest feed rather than the sum.
+    """
+    return async_fetch.call_all(fetch_cisa_kev, fetch_nvd_cve_counts, fetch_malwarebazaar_recent,
+                                fetch_urlhaus_stats, fetch_feodo_c2, fetch_cisa_ics_alerts)
 
 def _est_counter(annual_total, reference_year=2023):
     now = datetime.now(timezone.utc)
@@ -269,12 +254,7 @@ def render_live_metrics_section():
     </div>
     ''', unsafe_allow_html=True)
 
-    kev   = fetch_cisa_kev()
-    nvd   = fetch_nvd_cve_counts()
-    mbaz  = fetch_malwarebazaar_recent()
-    uhaus = fetch_urlhaus_stats()
-    feodo = fetch_feodo_c2()
-    ics   = fetch_cisa_ics_alerts()
+    kev, nvd, mbaz, uhaus, feodo, ics = fetch_all_live()
 
     m1, m2, m3, m4 = st.columns(4)
 
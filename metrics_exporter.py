@@ -0,0 +1,219 @@
+"""
+metrics_exporter.py — Prometheus / OpenMetrics text exposition of the live
+feed numbers and the app's own fetch and render timings.
+The dashboard registers its cached feed fetchers here. A scrape reads
+their current FEED_CACHE entries without fetching or counting cache hits;
+an expired feed keeps its last value while a background thread refreshes
+it, so scrapes stay fast and values follow the cache TTLs whether or not
+anyone renders the page (live values only, no fallbacks). api_server
+publishes its own results instead. render() turns them, plus feed_metrics,
+bounded_cache and render_profiler state, into a scrape page without
+running the Streamlit script. Mounted at /metrics on the feed_metrics
+diagnostics server.
+"""
+
+import math
+import threading
+import time
+
+import bounded_cache
+import feed_metrics
+import render_profiler
+
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "secai_"
+INFOCON_LEVELS = {"green": 0, "yellow": 1, "orange": 2, "red": 3}
+
+# (metric, help, feed, key or callable on the feed result)
+FEED_GAUGES = [
+    ("kev_vulnerabilities", "CISA KEV catalog entries", "kev", "total"),
+    ("kev_ransomware", "KEV entries with known ransomware use", "kev", "rw"),
+    ("kev_added_30d", "KEV entries added in the last 30 days", "kev", "d30"),
+    ("kev_added_365d", "KEV entries added in the last 365 days", "kev", "d365"),
+    ("bazaar_samples_1d", "MalwareBazaar samples first seen in the last day", "bazaar", "d1"),
+    ("bazaar_samples_7d", "MalwareBazaar samples first seen in the last 7 days", "bazaar", "d7"),
+    ("bazaar_families", "Distinct malware signatures in the MalwareBazaar export", "bazaar", "families"),
+    ("urlhaus_urls_online", "URLhaus malware URLs currently online", "urlhaus", "online"),
+    ("feodo_c2_online", "Feodo Tracker botnet C2 servers online", "feodo", "on"),
+    ("feodo_c2_offline", "Feodo Tracker botnet C2 servers offline", "feodo", "off"),
+    ("tor_exit_nodes", "Tor bulk exit list size", "tor", "c"),
+    ("sans_infocon_level", "SANS ISC Infocon (0 green, 1 yellow, 2 orange, 3 red)", "sans",
+     lambda d: INFOCON_LEVELS.get(str(d.get("infocon", "")).lower())),
+    ("dshield_top_ports_records", "DShield records across the top 10 attacked ports", "topports", "total"),
+    ("dshield_top_ips_reports", "DShield reports from the top 5 attacking IPs", "topips", "total"),
+    ("honeypot_reports", "SANS web honeypot reports for the latest day", "honeypot", "reports"),
+    ("honeypot_sources", "SANS web honeypot distinct sources", "honeypot", "sources"),
+    ("honeypot_targets", "SANS web honeypot distinct targets", "honeypot", "targets"),
+]
+
+_published = {}     # feed -> (result or None, epoch seconds)
+_sources = {}       # feed -> zero-argument fetcher read on every scrape
+_refreshing = set()  # feeds with a background refresh in flight
+_lock = threading.Lock()
+
+
+def publish(**results):
+    """Record the latest result per feed (None when the feed failed)."""
+    now = time.time()
+    with _lock:
+        for feed, result in results.items():
+            _published[feed] = (result, now)
+
+
+def register(**fetchers):
+    """Feeds render() publishes on each scrape. A FEED_CACHE-memoized fetcher is only
+    peeked at (and refreshed in the background once expired); any other is called
+    directly, so it must be cheap (e.g. a snapshot read)."""
+    with _lock:
+        _sources.update(fetchers)
+
+
+def _refresh(feed, fn):
+    try:
+        result = fn()
+    except Exception:
+        result = None
+    publish(**{feed: result})
+    with _lock:
+        _refreshing.discard(feed)
+
+
+def _pull():
+    with _lock:
+        sources = list(_sources.items())
+    fresh = {}
+    for feed, fn in sources:
+        peek = getattr(fn, "peek", None)
+        if peek is None:
+            try:
+                fresh[feed] = fn()
+            except Exception:
+                fresh[feed] = None
+            continue
+        result = peek()
+        if result is not fn.missing:
+            fresh[feed] = result
+            continue
+        with _lock:
+            if feed in _refreshing:
+                continue
+            _refreshing.add(feed)
+        threading.Thread(target=_refresh, args=(feed, fn), name="metrics-refresh", daemon=True).start()
+    publish(**fresh)
+
+
+# ---------------------------------------------------------------------------
+# Exposition
+# ---------------------------------------------------------------------------
+def _esc(v):
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(v):
+    if isinstance(v, bool):
+        return "1" if v else "0"
+    if isinstance(v, int):
+        return str(v)
+    v = float(v)
+    return "NaN" if math.isnan(v) else repr(round(v, 6)) if math.isfinite(v) else ("+Inf" if v > 0 else "-Inf")
+
+
+class _Writer:
+    def __init__(self, openmetrics):
+        self.openmetrics = openmetrics
+        self.lines = []
+
+    def family(self, name, kind, help_, samples):
+        """samples: [(labels dict, value)]; None values are skipped, empty families omitted."""
+        samples = [(lb, v) for lb, v in samples if v is not None]
+        if not samples:
+            return
+        name = PREFIX + name
+        # OpenMetrics names the counter family without _total; the 0.0.4 format uses the sample name
+        fam = name[:-6] if kind == "counter" and self.openmetrics else name
+        self.lines.append(f"# HELP {fam} {help_}")
+        self.lines.append(f"# TYPE {fam} {kind}")
+        for labels, v in samples:
+            lb = ",".join(f'{k}="{_esc(x)}"' for k, x in labels.items())
+            self.lines.append(f"{name}{{{lb}}} {_num(v)}" if lb else f"{name} {_num(v)}")
+
+    def text(self):
+        return "\n".join(self.lines + (["# EOF"] if self.openmetrics else [])) + "\n"
+
+
+def render(openmetrics=True, metrics=feed_metrics.METRICS, profiler=render_profiler.PROFILER,
+           cache=bounded_cache.FEED_CACHE):
+    """The exposition page as text."""
+    w = _Writer(openmetrics)
+    _pull()
+    with _lock:
+        published = dict(_published)
+
+    # Feed values, from the registered fetchers (or api_server's last refresh)
+    for name, help_, feed, key in FEED_GAUGES:
+        result = published.get(feed, (None, 0))[0]
+        if result is None:
+            continue
+        try:
+            v = key(result) if callable(key) else result.get(key)
+        except (AttributeError, TypeError):
+            v = None
+        w.family(name, "gauge", help_, [({}, v if isinstance(v, (int, float)) else None)])
+    w.family("feed_up", "gauge", "1 when the feed's last fetch returned live data",
+             [({"feed": f}, int(r is not None)) for f, (r, _) in sorted(published.items())])
+    w.family("feed_published_timestamp_seconds", "gauge", "When the feed result was last read",
+             [({"feed": f}, round(ts, 3)) for f, (_, ts) in sorted(published.items())])
+
+    # Fetch instrumentation
+    counts = metrics.counters()
+    summary = metrics.summary()
+    feeds = sorted(set(counts) | set(summary), key=str)
+    for key, help_ in (("requests", "HTTP requests issued"), ("errors", "HTTP requests that failed"),
+                       ("cache_hits", "Fetcher calls served from the feed cache"),
+                       ("cache_misses", "Fetcher calls that went to the network")):
+        w.family(f"feed_{key}_total", "counter", help_,
+                 [({"feed": f}, counts.get(f, {}).get(key, 0)) for f in feeds])
+    for q in ("p50", "p95"):
+        w.family(f"feed_latency_{q}_seconds", "gauge", f"{q} request latency over the instrumentation ring buffer",
+                 [({"feed": f}, s[q + "_ms"] / 1000 if s[q + "_ms"] is not None else None) for f, s in summary.items()])
+    w.family("feed_phase_seconds", "gauge", "Last request split into DNS, connect, TLS, wait and transfer",
+             [({"feed": f, "phase": p}, s["last_phases_ms"][p] / 1000)
+              for f, s in summary.items() if s["last_phases_ms"] for p in feed_metrics.PHASES])
+    w.family("feed_response_bytes", "gauge", "Body size of the last response",
+             [({"feed": f}, s["bytes"]) for f, s in summary.items()])
+    w.family("feed_parse_seconds", "gauge", "Parse time of the last cache miss",
+             [({"feed": f}, s["parse_ms"] / 1000 if s["parse_ms"] is not None else None) for f, s in summary.items()])
+    w.family("feed_last_status", "gauge", "HTTP status of the last response",
+             [({"feed": f}, s["last_status"]) for f, s in summary.items()])
+    w.family("feed_last_success_timestamp_seconds", "gauge", "When the feed last returned data",
+             [({"feed": f}, metrics.last_success.get(f)) for f in feeds])
+
+    # Feed cache
+    cs = cache.stats()
+    w.family("cache_max_bytes", "gauge", "Feed cache byte budget", [({}, cs["max_bytes"])])
+    w.family("cache_bytes", "gauge", "Bytes held in the feed cache per tier",
+             [({"tier": t}, d["bytes"]) for t, d in cs["tiers"].items()])
+    w.family("cache_entries", "gauge", "Entries held in the feed cache per tier",
+             [({"tier": t}, d["entries"]) for t, d in cs["tiers"].items()])
+    for key, help_ in (("hits", "Feed cache lookups served from memory"), ("misses", "Feed cache lookups that missed"),
+                       ("evictions", "Entries evicted to stay under the byte budget"),
+                       ("expirations", "Entries dropped after their TTL")):
+        w.family(f"cache_{key}_total", "counter", help_, [({}, cs[key])])
+
+    # Render timings
+    if profiler.enabled:
+        w.family("render_runs_total", "counter", "Profiled dashboard reruns", [({}, profiler.runs)])
+        sections = profiler.summary()
+        for q in ("p50", "p95"):
+            w.family(f"render_section_{q}_seconds", "gauge", f"{q} section render wall time over recent reruns",
+                     [({"section": n}, d[q + "_ms"] / 1000) for n, d in sections.items()])
+        w.family("render_section_bytes", "gauge", "Bytes a section sent to the browser on the last rerun",
+                 [({"section": n}, d["last_bytes"]) for n, d in sections.items()])
+    return w.text()
+
+
+def route(headers):
+    """feed_metrics.serve route: OpenMetrics when the scraper accepts it, else Prometheus text 0.0.4."""
+    om = "application/openmetrics-text" in (headers.get("Accept") or "")
+    return (OPENMETRICS_TYPE if om else PROMETHEUS_TYPE), render(om).encode()
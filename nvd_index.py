@@ -0,0 +1,170 @@
+"""
+nvd_index.py — Local index of NVD CVE publication dates for rolling-window
+counts. CVE ids are pulled once (paged by pubStartDate on bootstrap, then
+incrementally by lastModStartDate) and published timestamps are kept in a
+sorted array, so any 1/7/30/365-day count is a binary search rather than a
+separate throttled NVD query.
+"""
+
+import threading
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from datetime import datetime, timezone, timedelta
+
+import http_client
+from state_store import load_json, save_json, state_path
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+NVD_URL = "https://services.nvd.nist.gov/rest/json/cves/2.0"
+SCHEMA = 1
+HORIZON_DAYS = 365
+CHUNK_DAYS = 120           # NVD caps pub/lastMod date ranges at 120 days
+PAGE_SIZE = 2000           # NVD maximum resultsPerPage
+RATE_LIMIT = 5             # unauthenticated NVD: 5 requests / 30 s, shared with any other NVD query
+MAX_PAGES_PER_REFRESH = 4  # bootstrap is spread over refreshes to stay under rate limits
+NVD_TS = "%Y-%m-%dT%H:%M:%S.000"
+
+
+def _epoch(published):
+    """NVD 'published' (UTC, no offset) -> epoch seconds, or None."""
+    try:
+        dt = datetime.fromisoformat(published)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _empty_state():
+    # bootstrap: [chunk_start_iso, start_index] while backfilling, None when complete
+    # lastmod: [window_start_iso, window_end_iso, start_index] while an incremental pull is partial
+    return {"schema": SCHEMA, "bootstrap": None, "synced": None, "lastmod": None, "pub": {}}
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+class NvdIndex:
+    def __init__(self, path=None):
+        self.path = path or state_path("nvd_index.json")
+        self._lock = threading.Lock()
+        state = load_json(self.path, SCHEMA) or _empty_state()
+        self._bootstrap = state["bootstrap"]
+        self._synced = state["synced"]
+        self._lastmod = state.get("lastmod")
+        self._pub = state["pub"]                           # cve id -> epoch seconds
+        self._dates = array("q", sorted(self._pub.values()))
+        self._reset_if_stale(datetime.now(timezone.utc))
+
+    def _save(self):
+        save_json(self.path, {"schema": SCHEMA, "bootstrap": self._bootstrap,
+                              "synced": self._synced, "lastmod": self._lastmod, "pub": self._pub})
+
+    def ready(self):
+        return self._synced is not None and self._bootstrap is None
+
+    def _reset_if_stale(self, now):
+        if self._synced and now - datetime.fromisoformat(self._synced) > timedelta(days=CHUNK_DAYS):
+            # too stale for one lastMod window: restart the bootstrap from scratch
+            self._synced = self._bootstrap = self._lastmod = None
+
+    # -- ingestion ------------------------------------------------------------
+    def _add(self, vulns, cutoff):
+        new = []
+        for item in vulns:
+            cve = item.get("cve", {})
+            cid, ts = cve.get("id"), _epoch(cve.get("published"))
+            if cid is None or ts is None or ts < cutoff or cid in self._pub:
+                continue
+            self._pub[cid] = ts
+            new.append(ts)
+        if new:
+            self._dates = array("q", merge(self._dates, sorted(new)))
+
+    def _expire(self, cutoff):
+        k = bisect_left(self._dates, cutoff)
+        if k:
+            del self._dates[:k]
+            self._pub = {c: t for c, t in self._pub.items() if t >= cutoff}
+
+    def _page(self, params, start_index):
+        r = http_client.get(NVD_URL, "nvd_cve",
+                            params=dict(params, startIndex=start_index, resultsPerPage=PAGE_SIZE))
+        if not r:
+            return None
+        try:
+            j = r.json()
+            return j.get("vulnerabilities", []), int(j.get("totalResults", 0))
+        except ValueError:
+            return None
+
+    def _pull(self, params, start_index, budget, cutoff):
+        """Page through one query. Returns (next_start_index or None when done, pages used)."""
+        used = 0
+        while used < budget:
+            page = self._page(params, start_index)
+            used += 1
+            if page is None:
+                return start_index, used
+            vulns, total = page
+            self._add(vulns, cutoff)
+            start_index += len(vulns)
+            if not vulns or start_index >= total:
+                return None, used
+        return start_index, used
+
+    def refresh(self, now=None, budget=MAX_PAGES_PER_REFRESH):
+        """Pull what changed since the last refresh, in at most `budget` page requests.
+        Returns True once counts are complete."""
+        now = now or datetime.now(timezone.utc)
+        cutoff = int((now - timedelta(days=HORIZON_DAYS)).timestamp())
+        with self._lock:
+            self._reset_if_stale(now)
+            if self._synced is None and self._bootstrap is None:
+                self._bootstrap = [(now - timedelta(days=HORIZON_DAYS)).isoformat(), 0]
+                self._synced = now.isoformat()
+            while self._bootstrap and budget > 0:
+                start = datetime.fromisoformat(self._bootstrap[0])
+                end = min(start + timedelta(days=CHUNK_DAYS), now)
+                params = {"pubStartDate": start.strftime(NVD_TS), "pubEndDate": end.strftime(NVD_TS)}
+                nxt, used = self._pull(params, self._bootstrap[1], budget, cutoff)
+                budget -= used
+                if nxt is not None:
+                    self._bootstrap[1] = nxt
+                    break
+                self._bootstrap = None if end >= now else [end.isoformat(), 0]
+            if self._bootstrap is None and budget > 0:
+                # The window end is fixed until the window is drained, so startIndex stays valid
+                # across refreshes; _synced only advances once every page has been read.
+                if self._lastmod is None:
+                    self._lastmod = [self._synced, now.isoformat(), 0]
+                start, end, index = self._lastmod
+                params = {"lastModStartDate": datetime.fromisoformat(start).strftime(NVD_TS),
+                          "lastModEndDate": datetime.fromisoformat(end).strftime(NVD_TS)}
+                nxt, _ = self._pull(params, index, budget, cutoff)
+                if nxt is None:
+                    self._synced, self._lastmod = end, None
+                else:
+                    self._lastmod[2] = nxt
+            self._expire(cutoff)
+            self._save()
+            return self.ready()
+
+    # -- queries --------------------------------------------------------------
+    def count_since(self, days, now=None):
+        """CVEs published within the last `days` days."""
+        now = now or datetime.now(timezone.utc)
+        lo = int((now - timedelta(days=days)).timestamp())
+        with self._lock:
+            return len(self._dates) - bisect_left(self._dates, lo)
+
+    def counts(self, now=None):
+        return {"today": self.count_since(1, now), "d7": self.count_since(7, now),
+                "d30": self.count_since(30, now), "d365": self.count_since(365, now)}
+
+
+NVD_INDEX = NvdIndex()
@@ -0,0 +1,189 @@
+"""
+render_profiler.py — Section-level render profiling for streamlit_app.py.
+The dashboard is one long script, so sections are delimited with mark(name)
+boundaries (or wrapped in `with section(name):`). Each rerun records wall
+time and the bytes of ForwardMsg output every section sends to the browser;
+summary() aggregates the last WINDOW reruns per section. With a dump
+directory set, every section of a run is also run under cProfile and the
+slowest ones are written as pstats files (snakeviz, gprof2dot, flameprof).
+"""
+
+import cProfile
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:  # headless use (benchmarks) without Streamlit
+    get_script_run_ctx = None
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+WINDOW = 50          # reruns kept per section
+DUMP_TOP = 3         # slowest sections per run written as .prof files
+
+
+class _Run:
+    """Per-session state for the rerun in progress."""
+
+    def __init__(self):
+        self.bytes = 0          # ForwardMsg bytes enqueued so far this run
+        self.times = {}         # section -> (wall seconds, bytes) this run
+        self.profiles = {}      # section -> cProfile.Profile this run
+        self.open = None        # (name, t0, bytes0, profile) of the marked section
+
+
+def _byte_counter(ctx):
+    """Count the serialized size of every message the session sends."""
+    enqueue = ctx._enqueue
+
+    def counted(msg):
+        run = getattr(ctx, "_section_run", None)
+        if run is not None:
+            run.bytes += msg.ByteSize()
+        enqueue(msg)
+    ctx._enqueue = counted
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class SectionProfiler:
+    """Wall time and output bytes per named dashboard section, across reruns."""
+
+    def __init__(self, enabled=False, dump_dir=None, dump_top=DUMP_TOP, window=WINDOW):
+        self.enabled = enabled
+        self.dump_dir = dump_dir
+        self.dump_top = dump_top
+        self.history = {}       # section -> deque[(wall seconds, bytes)], in page order
+        self.runs = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._window = window
+
+    # ------------------------------------------------------------ run state
+    def _run(self):
+        ctx = get_script_run_ctx() if get_script_run_ctx else None
+        return getattr(ctx, "_section_run", None) if ctx is not None else getattr(self._local, "run", None)
+
+    def start_run(self):
+        """Begin a rerun; any unfinished previous run (st.rerun, st.stop) is dropped."""
+        if not self.enabled:
+            return
+        run = _Run()
+        ctx = get_script_run_ctx() if get_script_run_ctx else None
+        if ctx is None:
+            self._local.run = run
+            return
+        if not getattr(ctx, "_section_counted", False):
+            _byte_counter(ctx)
+            ctx._section_counted = True
+        ctx._section_run = run
+
+    def _open(self, run, name):
+        prof = None
+        if self.dump_dir:
+            prof = cProfile.Profile()
+            try:
+                prof.enable()
+            except ValueError:  # another profiler is active (e.g. a concurrent session)
+                prof = None
+        return (name, time.perf_counter(), run.bytes, prof)
+
+    def _close(self, run, opened):
+        name, t0, b0, prof = opened
+        if prof is not None:
+            prof.disable()
+            run.profiles[name] = prof
+        wall, out = time.perf_counter() - t0, run.bytes - b0
+        w, b = run.times.get(name, (0.0, 0))
+        run.times[name] = (w + wall, b + out)   # a section may be entered more than once per run
+
+    # ------------------------------------------------------------ boundaries
+    def mark(self, name):
+        """End the current section (if any) and start `name`."""
+        run = self.enabled and self._run()
+        if not run:
+            return
+        if run.open is not None:
+            self._close(run, run.open)
+            run.open = None
+        run.open = self._open(run, name)
+
+    @contextmanager
+    def section(self, name):
+        """Time a block as section `name`; nested inside a marked section it is counted in both."""
+        run = self.enabled and self._run()
+        if not run:
+            yield
+            return
+        opened = (name, time.perf_counter(), run.bytes, None)
+        try:
+            yield
+        finally:
+            self._close(run, opened)
+
+    def end_run(self):
+        """Close the last section and fold this run into the history."""
+        run = self.enabled and self._run()
+        if not run:
+            return
+        if run.open is not None:
+            self._close(run, run.open)
+            run.open = None
+        with self._lock:
+            self.runs += 1
+            for name, sample in run.times.items():
+                self.history.setdefault(name, deque(maxlen=self._window)).append(sample)
+        if run.profiles:
+            self._dump(run)
+        ctx = get_script_run_ctx() if get_script_run_ctx else None
+        if ctx is not None:
+            ctx._section_run = None
+        else:
+            self._local.run = None
+
+    def _dump(self, run):
+        os.makedirs(self.dump_dir, exist_ok=True)
+        slowest = sorted(run.profiles, key=lambda n: -run.times[n][0])[:self.dump_top]
+        for name in slowest:
+            run.profiles[name].dump_stats(os.path.join(self.dump_dir, f"{name}.prof"))
+
+    # ------------------------------------------------------------ reporting
+    def summary(self):
+        """Per-section aggregates over the retained reruns, in page order."""
+        with self._lock:
+            hist = {n: list(h) for n, h in self.history.items()}
+        total = sum(_pct([w for w, _ in h], 0.5) for h in hist.values()) or 1.0
+        out = {}
+        for name, h in hist.items():
+            walls = [w for w, _ in h]
+            sizes = [b for _, b in h]
+            p50 = _pct(walls, 0.5)
+            out[name] = {"runs": len(h), "last_ms": round(walls[-1] * 1000, 1),
+                         "p50_ms": round(p50 * 1000, 1), "p95_ms": round(_pct(walls, 0.95) * 1000, 1),
+                         "max_ms": round(max(walls) * 1000, 1), "share": round(p50 / total, 3),
+                         "last_bytes": sizes[-1], "avg_bytes": int(sum(sizes) / len(sizes))}
+        return out
+
+    def reset(self):
+        with self._lock:
+            self.history.clear()
+            self.runs = 0
+
+
+def from_env(environ=os.environ):
+    """Profiler configured by SECAI_PROFILE=1, SECAI_PROFILE_DIR (enables cProfile
+    dumps there) and SECAI_PROFILE_TOP (slowest sections dumped per run)."""
+    dump_dir = environ.get("SECAI_PROFILE_DIR") or None
+    return SectionProfiler(enabled=environ.get("SECAI_PROFILE") == "1" or bool(dump_dir), dump_dir=dump_dir,
+                           dump_top=int(environ.get("SECAI_PROFILE_TOP", DUMP_TOP)))
+
+
+PROFILER = from_env()
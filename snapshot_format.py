@@ -0,0 +1,225 @@
+"""
+snapshot_format.py — Versioned binary container for aggregated feed results.
+A snapshot is one collector document (group, ttl, fetch times, ok flag and
+the fetcher's result) packed as a fixed little-endian header, the group name
+and a zlib-compressed compact-JSON body:
+
+    magic "SXNS" | version u8 | codec u8 | flags u8 | pad | schema u16 | name_len u16
+    ttl u32 | fetched f64 | checked f64 | raw_len u32 | body_len u32 | crc32 u32
+    group (utf-8, name_len bytes) | body (body_len bytes)
+
+The CRC covers the group name and the body (version 1 records: the body only).
+Records are self-delimiting, so an archive is just records appended to one
+file (append() / iter_records()). Readers take bytes, memoryview or mmap:
+the header and group are read in place, the body is decompressed straight
+from the buffer, and read_header() answers freshness checks without touching
+the body. decode() dispatches on the version byte, so files written by older
+versions keep loading after the layout changes.
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+
+from state_store import save_bytes
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+MAGIC = b"SXNS"
+VERSION = 2
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+COMPRESS_MIN = 256      # bodies smaller than this are stored uncompressed
+LEVEL = 6
+FLAG_OK = 0x01
+EXT = ".snap"
+
+_HEADER_V1 = struct.Struct("<4sBBBxHHIddIII")
+
+
+class SnapshotError(ValueError):
+    """Raised for truncated, corrupt or unsupported snapshot bytes."""
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+def encode(doc, level=LEVEL):
+    """Pack a collector document into one snapshot record."""
+    raw = json.dumps(doc.get("data"), separators=(",", ":"), default=str).encode("utf-8")
+    codec, body = CODEC_NONE, raw
+    if len(raw) >= COMPRESS_MIN:
+        codec, body = CODEC_ZLIB, zlib.compress(raw, level)
+    name = doc["group"].encode("utf-8")
+    header = _HEADER_V1.pack(MAGIC, VERSION, codec, FLAG_OK if doc.get("ok") else 0,
+                             doc.get("schema", 1), len(name), int(doc.get("ttl") or 0),
+                             float(doc.get("fetched") or 0.0), float(doc.get("checked") or 0.0),
+                             len(raw), len(body), zlib.crc32(body, zlib.crc32(name)))
+    return header + name + body
+
+
+# ---------------------------------------------------------------------------
+# Decoding
+# ---------------------------------------------------------------------------
+def _header_v1(buf, offset, version=1):
+    if len(buf) - offset < _HEADER_V1.size:
+        raise SnapshotError("truncated header")
+    (_, _, codec, flags, schema, name_len, ttl, fetched, checked,
+     raw_len, body_len, crc) = _HEADER_V1.unpack_from(buf, offset)
+    start = offset + _HEADER_V1.size
+    body_at = start + name_len
+    if len(buf) < body_at:
+        raise SnapshotError("truncated header")
+    try:
+        group = bytes(buf[start:body_at]).decode("utf-8")
+    except UnicodeDecodeError:
+        raise SnapshotError("corrupt group name") from None
+    head = {"schema": schema, "group": group, "ttl": ttl,
+            "fetched": fetched or None, "checked": checked or None, "ok": bool(flags & FLAG_OK),
+            "version": version, "codec": codec, "raw_len": raw_len, "body_len": body_len}
+    # (head, body offset, offset the CRC starts at, CRC)
+    return head, body_at, start if version >= 2 else body_at, crc
+
+
+def _header_v2(buf, offset):
+    # v1 layout; the CRC also covers the group name
+    return _header_v1(buf, offset, 2)
+
+
+_VERSIONS = {1: _header_v1, 2: _header_v2}
+
+
+def _parse_header(buf, offset=0):
+    if bytes(buf[offset:offset + 4]) != MAGIC:
+        raise SnapshotError("not a snapshot")
+    if len(buf) - offset < 5:
+        raise SnapshotError("truncated header")
+    parse = _VERSIONS.get(buf[offset + 4])
+    if parse is None:
+        raise SnapshotError(f"unsupported snapshot version {buf[offset + 4]}")
+    return parse(buf, offset)
+
+
+def read_header(buf, offset=0):
+    """The record's metadata (everything but `data`) without reading the body."""
+    return _parse_header(buf, offset)[0]
+
+
+def _record_end(buf, offset):
+    """End offset of the record at `offset` from its framing alone; None when that is unreadable."""
+    if len(buf) - offset < _HEADER_V1.size or bytes(buf[offset:offset + 4]) != MAGIC \
+            or buf[offset + 4] not in _VERSIONS:
+        return None
+    fields = _HEADER_V1.unpack_from(buf, offset)
+    end = offset + _HEADER_V1.size + fields[5] + fields[10]     # + name_len + body_len
+    return end if end <= len(buf) else None
+
+
+def _decode_at(buf, offset):
+    head, body_at, crc_at, crc = _parse_header(buf, offset)
+    end = body_at + head["body_len"]
+    if len(buf) < end:
+        raise SnapshotError("truncated record")
+    mv = memoryview(buf)
+    body = mv[body_at:end]
+    covered = mv[crc_at:end]
+    try:
+        if zlib.crc32(covered) != crc:
+            raise SnapshotError("checksum mismatch")
+        if head["codec"] == CODEC_ZLIB:
+            raw = zlib.decompress(body, bufsize=head["raw_len"] or zlib.DEF_BUF_SIZE)
+        elif head["codec"] == CODEC_NONE:
+            raw = bytes(body)
+        else:
+            raise SnapshotError(f"unsupported codec {head['codec']}")
+    except zlib.error as e:
+        raise SnapshotError(str(e)) from None
+    finally:
+        covered.release()
+        body.release()
+        mv.release()
+    try:
+        head["data"] = json.loads(raw)
+    except ValueError as e:     # JSONDecodeError, UnicodeDecodeError
+        raise SnapshotError(f"corrupt body: {e}") from None
+    return head, end
+
+
+def decode(buf):
+    """Unpack one snapshot record into a collector document (plus version/codec/size keys)."""
+    return _decode_at(buf, 0)[0]
+
+
+def iter_records(buf):
+    """Every record in an archive buffer, oldest first. A corrupt record whose
+    framing is intact is skipped; iteration stops at a truncated or unframed tail."""
+    offset = 0
+    while offset < len(buf):
+        try:
+            doc, offset = _decode_at(buf, offset)
+        except SnapshotError:
+            offset = _record_end(buf, offset)
+            if offset is None:
+                return
+            continue
+        yield doc
+
+
+# ---------------------------------------------------------------------------
+# Files
+# ---------------------------------------------------------------------------
+def _mapped(path):
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load(path):
+    """The document in snapshot file `path`, or None if missing or unreadable."""
+    try:
+        mm = _mapped(path)
+    except OSError:
+        return None
+    try:
+        return decode(mm)
+    except ValueError:          # SnapshotError, or a body that is not valid JSON
+        return None
+    finally:
+        if isinstance(mm, mmap.mmap):
+            mm.close()
+
+
+def load_header(path):
+    """read_header() for a file, reading only the header and group name."""
+    try:
+        with open(path, "rb") as f:
+            return read_header(f.read(_HEADER_V1.size + 1024))
+    except (OSError, ValueError):
+        return None
+
+
+def dump(path, doc, mode=None):
+    """Atomically write `doc` as snapshot file `path`. Returns False if the write failed."""
+    return save_bytes(path, encode(doc), mode)
+
+
+def append(path, doc):
+    """Append `doc` to archive file `path` (one write, so concurrent appenders do not interleave)."""
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(encode(doc))
+        return True
+    except OSError:
+        return False
+
+
+def archive_path(directory, group, when=None):
+    """Daily archive file for `group`: <directory>/<group>-YYYYMMDD.snap."""
+    return os.path.join(directory, f"{group}-{time.strftime('%Y%m%d', time.gmtime(when))}{EXT}")
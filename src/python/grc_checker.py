@@ -1,4 +1,137 @@
+import json
+import os
+from bisect import bisect_right
+from functools import lru_cache
+
+import numpy as np
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                           "config", "config.json")
+SCORE_SCALE = 20
+LEVELS = np.array(["Low", "Medium", "High", "Critical"])
+LEVEL_EDGES = np.array([40, 70, 90])  # score < 40 Low, < 70 Medium, < 90 High, else Critical
+DEFAULT_RECOMMENDATIONS = ["Review policies", "Implement controls", "Monitor continuously"]
+# Used when the config file or its `grc_rules` section is missing
+DEFAULT_RULES = [
+    {"factor": "access_control", "threshold": 1, "control": "Identity & Access Management (IAM)", "recommendation": "Enforce MFA and review privileged accounts"},
+    {"factor": "access_control", "threshold": 2, "control": "Identity & Access Management (IAM)", "recommendation": "Remove standing admin access; adopt just-in-time privileges"},
+    {"factor": "incident_response", "threshold": 1, "control": "Incident Response", "recommendation": "Test the incident response plan with a tabletop exercise"},
+    {"factor": "incident_response", "threshold": 2, "control": "Incident Response", "recommendation": "Assign an on-call IR owner and a 24h/72h reporting runbook"},
+    {"factor": "vulnerabilities", "threshold": 1, "control": "Vulnerability Management", "recommendation": "Patch CISA KEV entries within their due dates"},
+    {"factor": "vulnerabilities", "threshold": 2, "control": "Vulnerability Management", "recommendation": "Run authenticated scans weekly and track SLA breaches"},
+    {"factor": "governance", "threshold": 1, "control": "Risk Assessment & Governance", "recommendation": "Refresh the risk register and name risk owners"},
+    {"factor": "data_protection", "threshold": 1, "control": "Data Protection & Encryption", "recommendation": "Encrypt sensitive data at rest and in transit"},
+    {"factor": "data_protection", "threshold": 2, "control": "Data Protection & Encryption", "recommendation": "Classify data and deploy DLP on egress paths"},
+    {"factor": "monitoring", "threshold": 1, "control": "Monitoring & Logging", "recommendation": "Centralize security logs and alert on authentication failures"},
+    {"factor": "third_party", "threshold": 1, "control": "Vendor / Third-Party Risk", "recommendation": "Collect SOC 2 reports from critical vendors"},
+    {"factor": "third_party", "threshold": 2, "control": "Vendor / Third-Party Risk", "recommendation": "Tier vendors by data access and reassess high tiers annually"},
+    {"factor": "configuration", "threshold": 1, "control": "Configuration & Secure Baselines", "recommendation": "Apply CIS benchmarks and detect configuration drift"},
+    {"factor": "continuity", "threshold": 1, "control": "Business Continuity", "recommendation": "Keep immutable offline backups and test restores"},
+    {"factor": "ai_usage", "threshold": 1, "control": "AI / LLM Specific Controls", "recommendation": "Inventory AI systems and block unsanctioned AI tools"},
+    {"factor": "ai_usage", "threshold": 2, "control": "AI / LLM Specific Controls", "recommendation": "Map AI use cases to NIST AI RMF and EU AI Act risk tiers"}
+]
+
+
+class RecommendationEngine:
+    """Recommendation rules indexed by risk factor, thresholds sorted ascending.
+
+    Each rule is {factor, threshold, control, recommendation}; `control` names
+    a core_controls category of the Gap Matrix. A factor triggers the rule
+    with the highest threshold its value reaches, so a lookup costs one
+    bisect per factor present.
+    """
+
+    def __init__(self, rules: list):
+        self.rules = list(rules)
+        by_factor = {}
+        for i, r in enumerate(self.rules):
+            by_factor.setdefault(r["factor"], []).append((r["threshold"], i))
+        self._index = {}
+        for factor, entries in by_factor.items():
+            entries.sort()
+            self._index[factor] = ([t for t, _ in entries], [i for _, i in entries])
+
+    def recommend(self, risk_factors: dict) -> list:
+        """Triggered rules for one assessment, in the order its factors are given."""
+        out = []
+        for factor, value in risk_factors.items():
+            entry = self._index.get(factor)
+            if entry is None:
+                continue
+            pos = bisect_right(entry[0], value)
+            if pos:
+                out.append(self.rules[entry[1][pos - 1]])
+        return out
+
+    def recommend_batch(self, factors: np.ndarray, names: list) -> np.ndarray:
+        """(n, k) indices into `rules` of the rule each factor triggers, -1 where none.
+        Missing values (NaN) trigger no rule, as an absent factor does in recommend()."""
+        x = np.atleast_2d(np.asarray(factors, dtype=float))
+        out = np.full(x.shape, -1, dtype=np.int32)
+        for j, name in enumerate(names):
+            entry = self._index.get(name)
+            if entry is None:
+                continue
+            pos = np.searchsorted(entry[0], x[:, j], side="right") - 1
+            # searchsorted sorts NaN past every threshold, which would pick the top tier
+            pos = np.where(np.isnan(x[:, j]), -1, pos)
+            out[:, j] = np.where(pos >= 0, np.asarray(entry[1])[np.maximum(pos, 0)], -1)
+        return out
+
+
+def _load_config(config_path: str) -> dict:
+    try:
+        with open(config_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+@lru_cache(maxsize=None)
+def load_engine(config_path: str = CONFIG_PATH) -> RecommendationEngine:
+    """Engine for config `grc_rules` (DEFAULT_RULES when absent), built once per config file."""
+    rules = _load_config(config_path).get("grc_rules")
+    return RecommendationEngine(DEFAULT_RULES if rules is None else rules)
+
+
 def perform_grc_check(risk_factors: dict) -> dict:
     score = sum(risk_factors.values()) * 20
     level = "Low" if score < 40 else "Medium" if score < 70 else "High" if score < 90 else "Critical"
-    return {"risk_score": score, "risk_level": level, "recommendations": ["Review policies", "Implement controls", "Monitor continuously"]}
+    triggered = load_engine().recommend(risk_factors)
+    return {"risk_score": score, "risk_level": level,
+            "recommendations": [r["recommendation"] for r in triggered] or list(DEFAULT_RECOMMENDATIONS),
+            "controls": list(dict.fromkeys(r["control"] for r in triggered))}
+
+
+@lru_cache(maxsize=None)
+def load_weights(config_path: str = CONFIG_PATH) -> dict:
+    """Per-factor weights from config `grc_weights`, {factor: weight} ({} when unset:
+    every factor weighs 1). Read once per config file; treat the result as read-only."""
+    return dict(_load_config(config_path).get("grc_weights") or {})
+
+
+def score_batch(factors, weights=None, names: list = None) -> dict:
+    """Score many assessments at once.
+
+    `factors` is a DataFrame (one column per factor) or an (n, k) array with
+    factor `names`. `weights` maps factor name to weight, or is a length-k
+    sequence; None uses config `grc_weights` (see load_weights). Factors
+    without a weight count 1, so unit weights reproduce perform_grc_check
+    row by row. Missing values count 0.
+    Returns {"factors", "risk_score" (n,), "risk_level" (n,), "contributions" (n, k)}.
+    """
+    if hasattr(factors, "columns"):
+        names = [str(c) for c in factors.columns]
+        factors = factors.to_numpy(dtype=float)
+    x = np.nan_to_num(np.atleast_2d(np.asarray(factors, dtype=float)))
+    names = list(names) if names is not None else [f"f{i}" for i in range(x.shape[1])]
+    if weights is None:
+        weights = load_weights()
+    if isinstance(weights, dict):
+        w = np.array([weights.get(n, 1.0) for n in names], dtype=float)
+    else:
+        w = np.asarray(weights, dtype=float)
+    w = w * SCORE_SCALE
+    score = x @ w
+    return {"factors": names, "risk_score": score, "risk_level": LEVELS[np.digitize(score, LEVEL_EDGES)],
+            "contributions": x * w}
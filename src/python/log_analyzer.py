@@ -0,0 +1,177 @@
+import gzip
+import heapq
+import json
+import sys
+
+from log_parser import BRUTE_FORCE_THRESHOLD, BRUTE_FORCE_WINDOW, BruteForceDetector, detect_brute_force
+
+CONFIG_PATH = "config/config.json"
+BLOCK_SIZE = 1 << 22          # 4 MiB read blocks, cut back to the last newline
+MAX_REPORT_ALERTS = 1000      # alerts kept in a summary; the count is unbounded
+GZIP_MAGIC = b"\x1f\x8b"
+SEVERITY_RANK = {"CRITICAL": 3, "HIGH": 2, "MEDIUM": 1, "LOW": 0}
+
+
+def load_rules(config_path: str = CONFIG_PATH) -> list:
+    """Rules from config: `log_rules`, else one rule built from `suspicious_keywords`."""
+    with open(config_path) as f:
+        config = json.load(f)
+    rules = config.get("log_rules")
+    if not rules:
+        rules = [{"name": "suspicious-keyword", "severity": "MEDIUM",
+                  "patterns": config["suspicious_keywords"]}]
+    return rules
+
+
+def compile_rules(rules: list) -> list:
+    """Compile all rules into one lower-cased literal table, longest literal first.
+
+    Each literal is scanned with bytes.find (a C memmem over the whole block),
+    which keeps Python work proportional to hits rather than to log size.
+    Returns [(literal_bytes, rule), ...].
+    """
+    table = {}
+    for rule in rules:
+        for p in rule["patterns"]:
+            table.setdefault(p.lower().encode(), rule)
+    return sorted(table.items(), key=lambda kv: len(kv[0]), reverse=True)
+
+
+def open_log(path: str):
+    """Open a log for binary reading, transparently decompressing gzip."""
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    return gzip.open(path, "rb") if magic == GZIP_MAGIC else open(path, "rb")
+
+
+def iter_blocks(f, block_size: int = BLOCK_SIZE, offset: int = 0, limit: int = None):
+    """Yield (offset, block) pairs where every block ends on a line boundary.
+
+    With `limit`, reading stops once `limit` bytes have been consumed, after
+    completing the line in progress (used for byte-range shards).
+    """
+    carry, remaining = b"", limit
+    while remaining is None or remaining > 0:
+        chunk = f.read(block_size if remaining is None else min(block_size, remaining))
+        if not chunk:
+            break
+        if remaining is not None:
+            remaining -= len(chunk)
+            if remaining <= 0 and not chunk.endswith(b"\n"):
+                chunk += f.readline()
+        buf = carry + chunk if carry else chunk
+        cut = buf.rfind(b"\n") + 1
+        if cut == 0:
+            carry = buf
+            continue
+        yield offset, buf[:cut]
+        offset += cut
+        carry = buf[cut:]
+    if carry:
+        yield offset, carry
+
+
+def scan_block(block: bytes, matcher: list, offset: int = 0, line_no: int = 1):
+    """Yield one alert per matching line of `block`, in line order.
+
+    A line that matches several rules is attributed to the most severe one
+    (CRITICAL > HIGH > MEDIUM); among equally severe matches the leftmost
+    wins, then the longest literal. `line_no` is the number of the block's
+    first line.
+    """
+    low = block.lower()
+    hits = {}
+    for lit, rule in matcher:
+        i = low.find(lit)
+        while i >= 0:
+            start = low.rfind(b"\n", 0, i) + 1
+            prev = hits.get(start)
+            rank = SEVERITY_RANK.get(rule["severity"], 0)
+            if prev is None or (-rank, i) < (-prev[2], prev[0]):
+                hits[start] = (i, rule, rank)
+            nl = low.find(b"\n", i)
+            if nl < 0:
+                break
+            i = low.find(lit, nl + 1)
+    counted = 0
+    for start in sorted(hits):
+        rule = hits[start][1]
+        end = block.find(b"\n", start)
+        if end < 0:
+            end = len(block)
+        line_no += block.count(b"\n", counted, start)
+        counted = start
+        yield {"line_no": line_no, "offset": offset + start, "rule": rule["name"],
+               "severity": rule["severity"],
+               "line": block[start:end].decode("utf-8", errors="replace").rstrip("\r")}
+
+
+def load_detector(config_path: str = CONFIG_PATH) -> BruteForceDetector:
+    """Brute-force detector configured from `brute_force` {window_seconds, threshold}."""
+    with open(config_path) as f:
+        cfg = json.load(f).get("brute_force", {})
+    return BruteForceDetector(window=cfg.get("window_seconds", BRUTE_FORCE_WINDOW),
+                              threshold=cfg.get("threshold", BRUTE_FORCE_THRESHOLD))
+
+
+def brute_force_alerts(block: bytes, detector: BruteForceDetector, offset: int, line_no: int):
+    for start, end, f in detect_brute_force(block, detector):
+        yield {"line_no": line_no + block.count(b"\n", 0, start), "offset": offset + start,
+               "rule": "brute-force", "severity": "CRITICAL",
+               "line": f"{f['failures']} failed logins from {f['ip']} between "
+                       f"{f['first']:%Y-%m-%d %H:%M:%S} and {f['last']:%Y-%m-%d %H:%M:%S}"}
+
+
+def analyze_log(path: str, rules: list = None, block_size: int = BLOCK_SIZE,
+                detector: BruteForceDetector = None):
+    """Stream a (optionally gzipped) log and yield alerts with bounded memory.
+
+    With a `detector`, brute-force bursts are reported inline at the line
+    that completes them.
+    """
+    matcher = compile_rules(rules if rules is not None else load_rules())
+    line_no = 1
+    with open_log(path) as f:
+        for offset, block in iter_blocks(f, block_size):
+            alerts = scan_block(block, matcher, offset, line_no)
+            if detector is not None:
+                alerts = heapq.merge(alerts, brute_force_alerts(block, detector, offset, line_no),
+                                     key=lambda a: a["offset"])
+            yield from alerts
+            line_no += block.count(b"\n")
+
+
+def summarize(alerts, threshold: int = 3, max_alerts: int = MAX_REPORT_ALERTS) -> dict:
+    """Consume an alert stream into a report, keeping at most `max_alerts` alerts."""
+    total, by_rule, kept = 0, {}, []
+    for a in alerts:
+        total += 1
+        by_rule[a["rule"]] = by_rule.get(a["rule"], 0) + 1
+        if len(kept) < max_alerts:
+            kept.append(a)
+    return {"suspicious": total, "high_risk": total > threshold, "by_rule": by_rule,
+            "alerts": kept, "truncated": total > len(kept)}
+
+
+def main(argv: list) -> int:
+    if len(argv) < 2:
+        print("Usage: python src/python/log_analyzer.py <logfile> [<logfile> ...]")
+        return 1
+    with open(CONFIG_PATH) as f:
+        threshold = json.load(f).get("log_alert_threshold", 3)
+    for path in argv[1:]:
+        report = summarize(analyze_log(path, detector=load_detector()), threshold)
+        print(f"=== Log Forensics Report: {path} ===")
+        print(f"Total suspicious entries: {report['suspicious']}")
+        print("HIGH RISK: Potential incident detected" if report["high_risk"] else "Log appears normal.")
+        if report["alerts"]:
+            print("\nAlerts:")
+            for a in report["alerts"]:
+                print(f" - [{a['severity']}] {a['rule']} line {a['line_no']}: {a['line']}")
+            if report["truncated"]:
+                print(f" ... {report['suspicious'] - len(report['alerts'])} more")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
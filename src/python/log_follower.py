@@ -0,0 +1,147 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+from log_analyzer import (BLOCK_SIZE, GZIP_MAGIC, brute_force_alerts, compile_rules, iter_blocks,
+                          load_detector, load_rules, scan_block)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STATE_NAME = "log_follow.json"   # under the state_store directory, for the CLI and the dashboard
+STATE_SCHEMA = 1
+POLL_INTERVAL = 5             # seconds between polls in follow mode
+RECENT_ALERTS = 200           # alerts kept in state for the dashboard
+ROTATED_SUFFIXES = (".1", ".0")
+
+
+def _load_state(load, path: str) -> dict:
+    doc = load(path) if load is not None and path else None
+    if isinstance(doc, dict) and doc.get("schema") == STATE_SCHEMA:
+        return doc
+    return {"schema": STATE_SCHEMA, "files": {}, "recent": []}
+
+
+class LogFollower:
+    """Incremental scanner for growing logs, resumable across runs.
+
+    Per file it persists the inode, the byte offset of the first unread line
+    and that line's number, so each poll reads only appended bytes. A changed
+    inode means the file was rotated: the rest of the old file is drained from
+    its rotated name (`<path>.1`) when it can be found, then the new file is
+    read from the start. A file shorter than the saved offset was truncated in
+    place (copytruncate) and is also re-read from the start. A trailing line
+    without a newline is left for the next poll. poll() is serialized, so one
+    follower can be shared between threads (dashboard sessions).
+
+    Cursors persist to `state_path` through `load(path) -> doc or None` and
+    `save(path, doc)` (e.g. state_store.load_json / save_json); without them
+    they are kept in memory only.
+    """
+
+    def __init__(self, paths: list, rules: list = None, detector=None, state_path: str = None,
+                 load=None, save=None):
+        self.paths = list(paths)
+        self.matcher = compile_rules(rules if rules is not None else load_rules())
+        self.detector = detector if detector is not None else load_detector()
+        self.state_path = state_path
+        self._save = save
+        self.state = _load_state(load, state_path)
+        self.recent = deque(self.state["recent"], maxlen=RECENT_ALERTS)
+        self._lock = threading.Lock()
+
+    def _scan(self, path: str, f, offset: int, line_no: int, alerts: list):
+        """Scan complete lines from `offset`; returns the new (offset, line_no)."""
+        f.seek(offset)
+        for off, block in iter_blocks(f, BLOCK_SIZE, offset):
+            if not block.endswith(b"\n"):
+                break  # partial last line: wait until it is terminated
+            for a in scan_block(block, self.matcher, off, line_no):
+                alerts.append(dict(a, path=path))
+            for a in brute_force_alerts(block, self.detector, off, line_no):
+                alerts.append(dict(a, path=path))
+            line_no += block.count(b"\n")
+            offset = off + len(block)
+        return offset, line_no
+
+    def _rotated(self, path: str, inode: int) -> str:
+        for suffix in ROTATED_SUFFIXES:
+            try:
+                if os.stat(path + suffix).st_ino == inode:
+                    return path + suffix
+            except OSError:
+                continue
+        return None
+
+    def poll_file(self, path: str) -> list:
+        alerts = []
+        try:
+            st = os.stat(path)
+        except OSError:
+            return alerts
+        prev = self.state["files"].get(path)
+        offset, line_no = 0, 1
+        if prev is not None:
+            if prev["inode"] == st.st_ino and st.st_size >= prev["offset"]:
+                offset, line_no = prev["offset"], prev["line_no"]
+            elif prev["inode"] != st.st_ino:
+                old = self._rotated(path, prev["inode"])
+                if old is not None:
+                    with open(old, "rb") as f:
+                        if f.read(2) != GZIP_MAGIC:
+                            self._scan(old, f, prev["offset"], prev["line_no"], alerts)
+        if st.st_size > offset:
+            with open(path, "rb") as f:
+                if offset == 0 and f.read(2) == GZIP_MAGIC:
+                    return alerts  # compressed archives are not followed
+                offset, line_no = self._scan(path, f, offset, line_no, alerts)
+        self.state["files"][path] = {"inode": st.st_ino, "offset": offset, "line_no": line_no}
+        return alerts
+
+    def poll(self) -> list:
+        """Scan what was appended to every followed file since the last poll and persist the cursors."""
+        with self._lock:
+            alerts = []
+            for path in self.paths:
+                alerts += self.poll_file(path)
+            self.recent.extend(alerts)
+            self.state["recent"] = list(self.recent)
+            self.state["polled"] = time.time()
+            if self._save is not None and self.state_path:
+                self._save(self.state_path, self.state)  # read-only filesystem: cursors kept in memory
+            return alerts
+
+    def recent_alerts(self) -> list:
+        """The retained alerts, oldest first (a copy, safe while another thread polls)."""
+        with self._lock:
+            return list(self.recent)
+
+    def follow(self, interval: float = POLL_INTERVAL):
+        """Poll forever, yielding alerts as they appear."""
+        while True:
+            yield from self.poll()
+            time.sleep(interval)
+
+
+def main(argv: list) -> int:
+    ap = argparse.ArgumentParser(description="Follow growing logs and report new alerts.")
+    ap.add_argument("paths", nargs="+", help="log files to follow")
+    ap.add_argument("-i", "--interval", type=float, default=POLL_INTERVAL, help="seconds between polls")
+    ap.add_argument("--once", action="store_true", help="scan new data once and exit")
+    ap.add_argument("--state", help=f"cursor state file (default: {STATE_NAME} in the state_store directory)")
+    args = ap.parse_args(argv[1:])
+    sys.path.append(REPO_ROOT)  # state_store, when run as a script from src/python
+    from state_store import load_json, save_json, state_path
+    follower = LogFollower(args.paths, state_path=args.state or state_path(STATE_NAME), load=load_json, save=save_json)
+    alerts = follower.poll() if args.once else follower.follow(args.interval)
+    try:
+        for a in alerts:
+            print(f"[{a['severity']}] {a['rule']} {a['path']}:{a['line_no']}: {a['line']}", flush=True)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
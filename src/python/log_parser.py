@@ -0,0 +1,106 @@
+import re
+from collections import OrderedDict, deque
+from datetime import datetime
+
+# "[2026-02-10 08:17:03] ERROR Failed login attempt from 185.220.101.XX - IP blocked"
+# One precompiled pattern pulls timestamp, level and the first IPv4 in the
+# message (redacted octets such as "XX" are accepted, as in data/sample_log.txt).
+LINE_RE = re.compile(
+    rb"\[(?P<ts>[^\]\r\n]+)\][ \t]+(?P<level>[A-Za-z]+)[ \t]+"
+    rb"(?:[^\r\n]*?\b(?P<ip>\d{1,3}(?:\.(?:\d{1,3}|[xX]{1,3})){3})\b)?")
+FAILURE_MARKERS = (b"failed login", b"failed password", b"authentication failure", b"invalid user")
+
+BRUTE_FORCE_WINDOW = 300      # seconds
+BRUTE_FORCE_THRESHOLD = 5     # failures from one IP inside the window
+MAX_TRACKED_IPS = 100_000
+
+
+def parse_line(line: bytes) -> dict:
+    """Structured fields of one log line, or None if it is not `[ts] LEVEL msg`."""
+    m = LINE_RE.match(line)
+    if not m:
+        return None
+    try:
+        ts = datetime.fromisoformat(m.group("ts").decode())
+    except ValueError:
+        ts = None
+    ip = m.group("ip")
+    return {"ts": ts, "level": m.group("level").decode().upper(),
+            "ip": ip.decode() if ip else None}
+
+
+def iter_failure_lines(block: bytes, low: bytes = None):
+    """Yield (start, end) of every line in `block` containing a failure marker, in order."""
+    low = block.lower() if low is None else low
+    starts = {}
+    for marker in FAILURE_MARKERS:
+        i = low.find(marker)
+        while i >= 0:
+            start = low.rfind(b"\n", 0, i) + 1
+            end = low.find(b"\n", i)
+            starts[start] = end if end >= 0 else len(block)
+            if end < 0:
+                break
+            i = low.find(marker, end + 1)
+    for start in sorted(starts):
+        yield start, starts[start]
+
+
+class BruteForceDetector:
+    """Sliding-window failed-login counter per source IP.
+
+    Each IP keeps a ring buffer of its last `threshold` failure timestamps,
+    so a check is O(1): the burst fires when the oldest buffered failure is
+    within `window` seconds of the newest. IPs idle for longer than the window
+    (measured against the newest timestamp seen, so slightly out-of-order
+    lines are tolerated) are evicted in least-recently-seen order, bounding
+    memory on unbounded streams.
+    """
+
+    def __init__(self, window: int = BRUTE_FORCE_WINDOW, threshold: int = BRUTE_FORCE_THRESHOLD,
+                 max_ips: int = MAX_TRACKED_IPS):
+        self.window = window
+        self.threshold = threshold
+        self.max_ips = max_ips
+        self._ips = OrderedDict()   # ip -> deque of epoch seconds, least recently seen first
+        self._clock = float("-inf")
+
+    def observe(self, ip: str, ts: datetime) -> dict:
+        """Record one failure; returns a finding when `ip` crosses the threshold, else None."""
+        t = ts.timestamp()
+        ring = self._ips.get(ip)
+        if ring is None:
+            ring = self._ips[ip] = deque(maxlen=self.threshold)
+        else:
+            self._ips.move_to_end(ip)
+        ring.append(t)
+        self._clock = max(self._clock, t)
+        self._evict()
+        if len(ring) == self.threshold and t - ring[0] <= self.window:
+            first = ring[0]
+            ring.clear()  # report each burst once
+            return {"ip": ip, "failures": self.threshold,
+                    "first": datetime.fromtimestamp(first, ts.tzinfo), "last": ts}
+        return None
+
+    def _evict(self):
+        while self._ips:
+            ip, ring = next(iter(self._ips.items()))
+            idle = not ring or self._clock - ring[-1] > self.window
+            if not idle and len(self._ips) <= self.max_ips:
+                break
+            del self._ips[ip]
+
+    def __len__(self):
+        return len(self._ips)
+
+
+def detect_brute_force(block: bytes, detector: BruteForceDetector, low: bytes = None):
+    """Feed every failure line of `block` to `detector`; yield (start, end, finding) per burst."""
+    for start, end in iter_failure_lines(block, low):
+        rec = parse_line(block[start:end])
+        if rec is None or rec["ip"] is None or rec["ts"] is None:
+            continue
+        finding = detector.observe(rec["ip"], rec["ts"])
+        if finding:
+            yield start, end, finding
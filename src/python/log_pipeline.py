@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from log_analyzer import (BLOCK_SIZE, GZIP_MAGIC, MAX_REPORT_ALERTS, compile_rules,
+                          iter_blocks, load_rules, open_log, scan_block)
+from log_parser import iter_failure_lines, parse_line
+
+SHARD_SIZE = 64 << 20         # byte-range shard size for uncompressed logs
+MAX_SHARD_ALERTS = MAX_REPORT_ALERTS
+
+# "[timestamp] LEVEL message" — searched per block with a literal "\n[" prefix
+LEVEL_RE = re.compile(rb"\n\[[^\]\n]*\] +([A-Za-z]+)")
+
+
+def expand_paths(paths: list) -> list:
+    """Files named directly plus every non-hidden file under named directories."""
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            for root, dirs, names in os.walk(p):
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                files += [os.path.join(root, n) for n in sorted(names) if not n.startswith(".")]
+        else:
+            files.append(p)
+    return files
+
+
+def _is_gzip(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(2) == GZIP_MAGIC
+
+
+def plan_shards(paths: list, shard_size: int = SHARD_SIZE) -> list:
+    """Split inputs into (path, start, length) shards.
+
+    Uncompressed files are cut into byte ranges; a shard owns every line that
+    starts inside its range. Gzip files are not seekable and form one shard
+    each (length None).
+    """
+    shards = []
+    for path in expand_paths(paths):
+        size = os.path.getsize(path)
+        if _is_gzip(path) or size <= shard_size:
+            shards.append((path, 0, None))
+            continue
+        for start in range(0, size, shard_size):
+            shards.append((path, start, min(shard_size, size - start)))
+    return shards
+
+
+def _failure_ips(low: bytes, block: bytes, ips: Counter):
+    for start, end in iter_failure_lines(block, low):
+        rec = parse_line(block[start:end])
+        if rec and rec["ip"]:
+            ips[rec["ip"]] += 1
+
+
+def process_shard(shard: tuple, rules: list, max_alerts: int = MAX_SHARD_ALERTS) -> dict:
+    """Scan one shard and return its partial aggregates.
+
+    Alert line numbers are relative to the shard; merge() rebases them using
+    each shard's newline count.
+    """
+    path, start, length = shard
+    matcher = compile_rules(rules)
+    severity, ips, by_rule = Counter(), Counter(), Counter()
+    alerts, alert_count, nbytes, newlines, line_no = [], 0, 0, 0, 1
+    if length is None:
+        f = open_log(path)
+    else:
+        f = open(path, "rb")
+        if start:
+            f.seek(start - 1)
+            f.readline()  # skip the line owned by the previous shard
+            length -= f.tell() - start
+    with f:
+        for offset, block in iter_blocks(f, BLOCK_SIZE, f.tell() if length is not None else 0, length):
+            for a in scan_block(block, matcher, offset, line_no):
+                alert_count += 1
+                by_rule[a["rule"]] += 1
+                if len(alerts) < max_alerts:
+                    a["path"] = path
+                    alerts.append(a)
+            severity.update(m.decode().upper() for m in LEVEL_RE.findall(b"\n" + block))
+            _failure_ips(block.lower(), block, ips)
+            n = block.count(b"\n")
+            line_no += n
+            newlines += n
+            nbytes += len(block)
+    return {"path": path, "start": start, "bytes": nbytes, "newlines": newlines,
+            "severity": dict(severity), "ip_failures": dict(ips), "by_rule": dict(by_rule),
+            "alert_count": alert_count, "alerts": alerts}
+
+
+def merge(partials: list, max_alerts: int = MAX_REPORT_ALERTS) -> dict:
+    """Combine shard aggregates; alert line numbers become file-absolute."""
+    severity, ips, by_rule = Counter(), Counter(), Counter()
+    alerts, files, total_bytes, alert_count = [], set(), 0, 0
+    lines_before = {}
+    for p in sorted(partials, key=lambda p: (p["path"], p["start"])):
+        base = lines_before.get(p["path"], 0)
+        for a in p["alerts"]:
+            a["line_no"] += base
+        lines_before[p["path"]] = base + p["newlines"]
+        severity.update(p["severity"])
+        ips.update(p["ip_failures"])
+        by_rule.update(p["by_rule"])
+        alert_count += p["alert_count"]
+        total_bytes += p["bytes"]
+        files.add(p["path"])
+        if len(alerts) < max_alerts:
+            alerts += p["alerts"][:max_alerts - len(alerts)]
+    return {"files": len(files), "bytes": total_bytes, "severity": dict(severity),
+            "ip_failures": dict(ips.most_common()), "by_rule": dict(by_rule),
+            "suspicious": alert_count, "alerts": alerts, "truncated": alert_count > len(alerts)}
+
+
+def ingest(paths: list, rules: list = None, workers: int = None, shard_size: int = SHARD_SIZE) -> dict:
+    """Shard `paths` (files or directories) across a process pool and merge the results."""
+    rules = rules if rules is not None else load_rules()
+    shards = plan_shards(paths, shard_size)
+    if not shards:
+        return merge([])
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+    if workers == 1:
+        return merge([process_shard(s, rules) for s in shards])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge(list(pool.map(process_shard, shards, [rules] * len(shards))))
+
+
+def main(argv: list) -> int:
+    ap = argparse.ArgumentParser(description="Parallel log ingestion across files and cores.")
+    ap.add_argument("paths", nargs="+", help="log files or directories of rotated logs")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    ap.add_argument("--shard-mb", type=int, default=SHARD_SIZE >> 20, help="byte-range shard size in MiB")
+    args = ap.parse_args(argv[1:])
+    report = ingest(args.paths, workers=args.workers, shard_size=args.shard_mb << 20)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
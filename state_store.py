@@ -0,0 +1,49 @@
+"""
+state_store.py — Small on-disk state shared by the incremental indexes
+(KEV, NVD, log follow offsets, feed snapshots). Documents are written atomically under
+one state directory; a read-only filesystem degrades to in-memory state.
+"""
+
+import json
+import os
+import tempfile
+
+STATE_DIR = os.environ.get("SECAI_STATE_DIR", os.path.join(tempfile.gettempdir(), "secai-nexus"))
+
+
+def state_path(name):
+    return os.path.join(STATE_DIR, name)
+
+
+def load_json(path, schema=None):
+    """Return the JSON document at `path`, or None if missing, corrupt or of another schema."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if schema is not None and (not isinstance(doc, dict) or doc.get("schema") != schema):
+        return None
+    return doc
+
+
+def save_bytes(path, data, mode=None):
+    """Atomically replace `path` with `data` (file permissions `mode`, default
+    owner-only). Returns False if the write failed."""
+    try:
+        d = os.path.dirname(path)
+        os.makedirs(d, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=d, suffix=".tmp")
+        if mode is not None:
+            os.chmod(tmp, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        return False
+
+
+def save_json(path, doc, mode=None):
+    """Atomically replace `path` with `doc`. Returns False if the write failed."""
+    return save_bytes(path, json.dumps(doc, separators=(",", ":")).encode("utf-8"), mode)
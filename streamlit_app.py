@@ -1,11 +1,27 @@
 import streamlit as st
-import requests
+import feed_metrics
+import html
+import json
+import os
+import sys
 import xml.etree.ElementTree as ET
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 from io import StringIO
+from kev_index import KEV_INDEX
+from crosswalk import CrosswalkEngine
+from crosswalk_catalog import CrosswalkCatalog
+import lineage
+import threat_feeds
+import collector
+import bounded_cache
+import metrics_exporter
+import render_profiler
+import state_store
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "python"))  # log_follower, log_analyzer
+from log_follower import LogFollower, STATE_NAME as LOG_FOLLOW_STATE
 # ==========================================================
 # SEC AI NEXUS — CYBER THREAT INTELLIGENCE DASHBOARD
 # Author: Adam Kistler
@@ -34,6 +50,9 @@ st.markdown(csp_meta, unsafe_allow_html=True)
 # ===================================================================
 st.set_page_config(page_title="SecAI-Nexus GRC", layout="wide", page_icon="🤖",
                    initial_sidebar_state="collapsed")
+# Section render profiling — SECAI_PROFILE=1 (add SECAI_PROFILE_DIR for cProfile dumps)
+PROFILER = render_profiler.PROFILER; _sec = PROFILER.mark
+PROFILER.start_run(); _sec("header")
 
 # ====================== AUTHOR HEADER (neat top bar - v73) ======================
 st.markdown("""
@@ -214,133 +233,43 @@ st.markdown(f"""
   }}
 </style>
 """, unsafe_allow_html=True)
-S = requests.Session()
-S.headers.update({"User-Agent":"SecAI-Nexus-GRC/5.0 (educational; admin@secai-nexus.dev)"})
-def _g(url, t=14, **k):
-    try: r = S.get(url, timeout=t, **k); r.raise_for_status(); return r
-    except: return None
-@st.cache_data(ttl=3600, show_spinner=False)
-def fetch_kev():
-    r = _g("https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json")
-    if not r: return None
-    try:
-        vulns = r.json().get("vulnerabilities",[]); now = datetime.now(timezone.utc)
-        cnt={1:0,7:0,30:0,365:0}; rw=0; vd={}; prods={}
-        for v in vulns:
-            try:
-                age=(now-datetime.strptime(v["dateAdded"],"%Y-%m-%d").replace(tzinfo=timezone.utc)).days
-                for d in cnt:
-                    if age<=d: cnt[d]+=1
-            except: pass
-            if v.get("knownRansomwareCampaignUse","").lower()=="known": rw+=1
-            vn=v.get("vendorProject","?"); vd[vn]=vd.get(vn,0)+1
-            pn=v.get("product","?"); prods[pn]=prods.get(pn,0)+1
-        tv=max(vd,key=vd.get) if vd else "N/A"
-        tp=max(prods,key=prods.get) if prods else "N/A"
-        top3v=sorted(vd,key=vd.get,reverse=True)[:3]
-        return {"total":len(vulns),"d1":cnt[1],"d7":cnt[7],"d30":cnt[30],"d365":cnt[365],
-                "rw":rw,"tv":tv,"tvc":vd.get(tv,0),"vendors":len(vd),
-                "tp":tp,"tpc":prods.get(tp,0),"top3v":top3v,"prods":len(prods)}
-    except: return None
-@st.cache_data(ttl=43200, show_spinner=False)
-def fetch_bazaar():
-    r = _g("https://bazaar.abuse.ch/export/csv/recent/", t=22)
-    if not r: return None
-    try:
-        lines=[l for l in r.text.splitlines() if l and not l.startswith("#")]
-        now=datetime.now(timezone.utc); d1=d7=0; sm={}; ftypes={}
-        for line in lines:
-            p=line.split('","'); ts=p[0].strip('"')
-            try:
-                dt=datetime.strptime(ts,"%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
-                age=(now-dt).days
-                if age<=1: d1+=1
-                if age<=7: d7+=1
-            except: pass
-            if len(p)>9:
-                s=p[9].strip('"').strip()
-                if s: sm[s]=sm.get(s,0)+1
-            if len(p)>8:
-                ft=p[8].strip('"').strip()
-                if ft: ftypes[ft]=ftypes.get(ft,0)+1
-        tf=max(sm,key=sm.get) if sm else "N/A"
-        top_ft=max(ftypes,key=ftypes.get) if ftypes else "N/A"
-        top3=sorted(sm,key=sm.get,reverse=True)[:3]
-        return {"d1":d1,"d7":d7,"total":len(lines),"tf":tf,"families":len(sm),
-                "top3":top3,"top_ft":top_ft}
-    except: return None
-@st.cache_data(ttl=43200, show_spinner=False)
-def fetch_urlhaus():
-    r = _g("https://urlhaus.abuse.ch/downloads/text_online/", t=15)
-    if not r: return None
-    return {"online":len([l for l in r.text.splitlines() if l.strip() and not l.startswith("#")])}
-@st.cache_data(ttl=43200, show_spinner=False)
-def fetch_feodo():
-    r = _g("https://feodotracker.abuse.ch/downloads/ipblocklist.csv", t=15)
-    if not r: return None
+_metered = feed_metrics.METRICS.metered
+# Feed diagnostics — panel shown with SECAI_DIAGNOSTICS=1 or ?diag=1; when SECAI_DIAG_PORT is set,
+# http://127.0.0.1:$SECAI_DIAG_PORT serves /feeds.json and Prometheus/OpenMetrics /metrics
+DIAG_PORT = int(os.environ.get("SECAI_DIAG_PORT", "0") or 0)
+@st.cache_resource(show_spinner=False)
+def _diag_server(port):
+    try: return feed_metrics.serve(port, routes={"/metrics": metrics_exporter.route})
+    except OSError: return None   # port already bound (e.g. by another worker)
+if DIAG_PORT: _diag_server(DIAG_PORT)
+# Feed fetch + aggregation lives in threat_feeds (shared with collector.py and api_server.py); cached here per feed TTL
+# in the byte-bounded FEED_CACHE (SECAI_CACHE_BYTES, SECAI_CACHE_POLICY=lru|lfu)
+FEED_CACHE = bounded_cache.FEED_CACHE
+# Shared snapshots — with SECAI_SNAPSHOT_DIR set, feeds are read from the files `python -m collector`
+# writes there instead of being fetched by every replica
+SNAPSHOT_DIR = os.environ.get("SECAI_SNAPSHOT_DIR", "")
+SNAPSHOTS = collector.SnapshotReader(SNAPSHOT_DIR) if SNAPSHOT_DIR else None
+def _feed(name):
+    if SNAPSHOTS: return lambda: SNAPSHOTS.get(name)
+    return _metered(name)(FEED_CACHE.memoize(name, threat_feeds.TTL[name])(threat_feeds.FETCHERS[name]))
+fetch_kev, fetch_bazaar, fetch_urlhaus, fetch_feodo, fetch_sans, fetch_tor, fetch_topports, fetch_topips, fetch_honeypot = (
+    _feed(n) for n in ("kev", "bazaar", "urlhaus", "feodo", "sans", "tor", "topports", "topips", "honeypot"))
+# /metrics calls these on every scrape, so exported values follow the cache TTLs, not page reruns
+metrics_exporter.register(kev=fetch_kev, bazaar=fetch_bazaar, urlhaus=fetch_urlhaus, feodo=fetch_feodo, sans=fetch_sans,
+                          tor=fetch_tor, topports=fetch_topports, topips=fetch_topips, honeypot=fetch_honeypot)
+# Local log monitoring (follow mode) — enabled by SECAI_LOG_PATHS, os.pathsep-separated
+LOG_PATHS = tuple(p for p in os.environ.get("SECAI_LOG_PATHS", "").split(os.pathsep) if p)
+@st.cache_resource(show_spinner=False)
+def _log_follower(paths):
+    return LogFollower(paths, state_path=state_store.state_path(LOG_FOLLOW_STATE),
+                       load=state_store.load_json, save=state_store.save_json)
+@FEED_CACHE.memoize("log_alerts", 30, tier="raw")
+def fetch_log_alerts(paths):
+    # each poll reads only bytes appended since the previous one
     try:
-        lines=[l for l in r.text.splitlines() if l and not l.startswith("#")]
-        on=sum(1 for l in lines if '"online"' in l.lower())
-        off=sum(1 for l in lines if '"offline"' in l.lower())
-        mw={}
-        for l in lines:
-            parts=l.split(",")
-            if len(parts)>=5:
-                fam=parts[4].strip().strip('"')
-                if fam and fam not in ("malware",""): mw[fam]=mw.get(fam,0)+1
-        top_mw=max(mw,key=mw.get) if mw else "N/A"
-        return {"on":on,"off":off,"total":len(lines),"top_mw":top_mw,"mw_count":mw.get(top_mw,0),"mw_fams":len(mw)}
+        f = _log_follower(paths); f.poll()
+        return f.recent_alerts()[::-1]
     except: return None
-@st.cache_data(ttl=43200, show_spinner=False)
-def fetch_sans():
-    r = _g("https://isc.sans.edu/api/infocon?json", t=12)
-    if not r: return None
-    try: return {"infocon":r.json().get("status","?")}
-    except: return None
-@st.cache_data(ttl=43200, show_spinner=False)
-def fetch_tor():
-    r = _g("https://check.torproject.org/torbulkexitlist", t=15)
-    if not r: return None
-    try: return {"c":len([l for l in r.text.splitlines() if l.strip() and not l.startswith("#")])}
-    except: return None
-@st.cache_data(ttl=43200, show_spinner=False)
-def fetch_topports():
-    r = _g("https://isc.sans.edu/api/topports/records/10?json", t=15)
-    if not r: return None
-    try:
-        data = r.json()
-        if isinstance(data, list) and len(data)>0:
-            ports = [{"port":p.get("targetport","?"),"records":int(p.get("records",0)),
-                      "sources":int(p.get("sources",0)),"targets":int(p.get("targets",0))} for p in data[:10]]
-            return {"ports":ports, "total":sum(p["records"] for p in ports)}
-    except: pass
-    return None
-@st.cache_data(ttl=43200, show_spinner=False)
-def fetch_topips():
-    r = _g("https://isc.sans.edu/api/topips/records/5?json", t=15)
-    if not r: return None
-    try:
-        data = r.json()
-        if isinstance(data, list) and len(data)>0:
-            return {"top_ip":data[0].get("ip","?"),"top_count":int(data[0].get("count",0)),
-                    "total":sum(int(i.get("count",0)) for i in data[:5]),"n":len(data)}
-    except: pass
-    return None
-@st.cache_data(ttl=43200, show_spinner=False)
-def fetch_honeypot():
-    for dd in [0,1,2]:
-        dt = (datetime.now(timezone.utc)-timedelta(days=dd)).strftime("%Y-%m-%d")
-        r = _g(f"https://isc.sans.edu/api/webhoneypotsummary/{dt}?json", t=12)
-        if r:
-            try:
-                data = r.json()
-                d = data[0] if isinstance(data,list) and len(data)>0 else data
-                reps = int(d.get("reports",0))
-                if reps > 0:
-                    return {"reports":reps,"targets":int(d.get("targets",0)),
-                            "sources":int(d.get("sources",0)),"date":dt}
-            except: pass
-    return None
 # ══════════════════════════════════════════════════════════════════════════════
 def _f(n):
     if not isinstance(n,(int,float)): return str(n)
@@ -466,13 +395,14 @@ f"""
 col_r1, col_r2, col_r3 = st.columns([3, 2, 3])
 with col_r2:
     if st.button("🔄 SYNC & REFRESH", type="secondary", use_container_width=True, help="Clears all cached threat intel and reloads fresh data from APIs."):
-        st.cache_data.clear()
+        st.cache_data.clear(); FEED_CACHE.clear()
         st.toast("Cache cleared. Reloading latest threat intel...", icon="🔄")
         st.rerun()
 
 # Tighten vertical spacing to the section title below
 st.markdown('<div style="margin-top:-10px; margin-bottom:2px;"></div>', unsafe_allow_html=True)
 
+_sec("feeds")
 with st.spinner("Syncing threat intelligence feeds…"):
     kev=fetch_kev(); baz=fetch_bazaar(); uhaus=fetch_urlhaus()
     feodo=fetch_feodo(); sans=fetch_sans(); tor=fetch_tor()
@@ -498,6 +428,7 @@ if not sans:
     sans={"infocon":"green"}
 if not tor:
     tor={"c":7800}
+_sec("exec_brief")
 # ══════════════════════════════════════════════════════════════════════════════
 # WHY AI SECURITY MATTERS — EXECUTIVE BRIEF (Most Impactful First)
 # Moved here for CISO/Board visibility, enhanced visuals & specific data
@@ -872,6 +803,7 @@ with c5[3]:
     """, unsafe_allow_html=True)
 st.markdown("---")
 
+_sec("regulations")
 # ══════════════════════════════════════════════════════════════════════════════
 # KEY REGULATIONS — Sleek educational card grid (enhanced v72)
 # Focused on business/organizational impact and practical implications
@@ -996,6 +928,7 @@ st.markdown(f'<div style="text-align:right; margin-top:-6px; margin-bottom:12px;
 st.caption("Sources: [EU AI Act](https://artificialintelligenceact.eu/) · [NIS2 Directive](https://eur-lex.europa.eu/eli/dir/2022/2555/oj) · [DORA Regulation](https://eur-lex.europa.eu/eli/reg/2022/2554/oj) · [GDPR](https://eur-lex.europa.eu/eli/reg/2016/679/oj) · [SEC Cybersecurity Disclosure Rule](https://www.sec.gov/rules/final/2023/33-11216.pdf) · [CMMC 2.0](https://dodcio.defense.gov/CMMC/) · [CPRA / CCPA](https://cppa.ca.gov/). Enforcement trends based on 2025–2026 public actions and regulatory guidance.")
 
 
+_sec("intel_tables")
 # AI Reference section starts here
 # ══════════════════════════════════════════════════════════════════════════════
 # AI SECURITY & THREAT INTELLIGENCE REFERENCE (UPDATED July 2026)
@@ -1014,13 +947,12 @@ st.markdown(f"""
   </div>
 </div>
 """, unsafe_allow_html=True)
-@st.cache_data(ttl=43200, show_spinner=False)
+# Row-level data, rebuilt from KEV_INDEX without a request: evicted before the feed aggregates
+@FEED_CACHE.memoize("kev_recent", 43200, tier="raw")
 def fetch_kev_recent():
-    r = _g("https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json")
-    if not r: return None
-    try: return sorted(r.json().get("vulnerabilities",[]), key=lambda x:x.get("dateAdded",""), reverse=True)[:10]
-    except: return None
-kev_recent = fetch_kev_recent()
+    if not fetch_kev(): return None
+    return KEV_INDEX.recent()
+kev_recent = (fetch_kev() or {}).get("recent") if SNAPSHOTS else fetch_kev_recent()
 # ── KEV TABLE ROWS (rich format) ─────────────────────────────────────────────
 kev_rows = []
 if kev_recent:
@@ -1291,6 +1223,7 @@ with g10: st.markdown(_tbl("💰 BREACH COST BY INDUSTRY (2026)", ["Industry", "
 st.markdown(f'<div style="font-size:.48rem;color:#505060;margin:2px 0 0 4px;">Sources: <a href="https://www.ibm.com/reports/data-breach" target="_blank" class="sl">IBM Cost of Breach 2026</a> · <a href="https://www.crowdstrike.com/global-threat-report/" target="_blank" class="sl">CrowdStrike GTR 2026</a> · <a href="https://owasp.org/www-project-top-10-for-large-language-model-applications/" target="_blank" class="sl">OWASP LLM Top 10</a> · <a href="https://attack.mitre.org/" target="_blank" class="sl">MITRE ATT&CK/ATLAS</a> · <a href="https://www.cisa.gov/known-exploited-vulnerabilities-catalog" target="_blank" class="sl">CISA KEV</a> · <a href="https://www.vulncheck.com/" target="_blank" class="sl">VulnCheck</a> · <a href="https://redcanary.com/" target="_blank" class="sl">Red Canary</a> · <a href="https://www.chainalysis.com/" target="_blank" class="sl">Chainalysis</a> · <a href="https://www.sophos.com/en-us/content/state-of-ransomware" target="_blank" class="sl">Sophos</a> · Public disclosures</div>', unsafe_allow_html=True)
 st.markdown("---")
 
+_sec("threat_metrics")
 # Continue to Global Threat Metrics
 st.markdown(f"""
 <div id="global-threat-metrics" style="text-align: left; margin: 40px 0 20px 5px;">
@@ -1629,6 +1562,15 @@ with c[5]:
             "▸ Based on DShield historical patterns",
             "–","d-n", "~2.3M events/day", "d-b", False,
             facts=["SSH & Telnet dominate consistently","HTTP/HTTPS growing share","SMB persists despite patches","Port 5555 (ADB) emerging target","Seasonal variation in attack patterns"])
+if LOG_PATHS:
+    log_alerts = fetch_log_alerts(LOG_PATHS)
+    sev_col = {"CRITICAL": RED, "HIGH": AMBER, "MEDIUM": CYAN}
+    log_rows = [[(html.escape(a["severity"]), f"color:{sev_col.get(a['severity'], '#888')};font-weight:bold;"),
+                 (html.escape(a["rule"]), "color:#ddd;"),
+                 (html.escape(f"{os.path.basename(a['path'])}:{a['line_no']}"), "color:#888;"),
+                 (html.escape(a["line"][:160]), "color:#ccc;")] for a in (log_alerts or [])[:15]]
+    if not log_rows: log_rows = [[("–", "color:#555;"), ("No alerts in followed logs", "color:#888;"), ("", ""), ("", "")]]
+    st.markdown(_tbl(f"🪵 LOCAL LOG MONITOR — FOLLOWING {len(LOG_PATHS)} FILE(S)", ["Severity", "Rule", "Source", "Line"], log_rows, AMBER), unsafe_allow_html=True)
 # ─── ROW 7 ────────────────────────────────────────────────────────────────────
 rl("▸ AI GOVERNANCE, PRIVACY & DATA PROTECTION [EST]")
 c = st.columns(9)
@@ -2062,6 +2004,30 @@ st.markdown(f"""<div class="sb">
   <a href="https://www.isc2.org/Insights/2024/09/Workforce-Study" target="_blank" class="sl">ISC2</a> ·
   <a href="https://www.qualys.com/research/threat-landscape-report/" target="_blank" class="sl">Qualys</a>
   <span style="float:right;color:#1a1a2a;">↻ {ts} · 12hr cache</span></div>""", unsafe_allow_html=True)
+if os.environ.get("SECAI_DIAGNOSTICS") == "1" or st.query_params.get("diag") == "1":
+    def _ms(v): return "–" if v is None else f"{v:,.0f}"
+    diag_rows = []
+    for feed, d in feed_metrics.METRICS.summary().items():
+        ph = d["last_phases_ms"]
+        ok = d["last_error"] is None
+        diag_rows.append([(html.escape(str(feed)), "color:#ddd;font-weight:bold;"),
+                          (d["last_status"] or ("–" if ok else "ERR"), f"color:{GREEN if ok else RED};font-weight:bold;"),
+                          (f'{_ms(d["p50_ms"])} / {_ms(d["p95_ms"])}', f"color:{AMBER if (d['p95_ms'] or 0) > feed_metrics.SLOW_MS else '#ccc'};"),
+                          (" · ".join(_ms(ph.get(k)) for k in feed_metrics.PHASES) if ph else "–", "color:#888;"),
+                          (_f(d["bytes"]) if d["bytes"] is not None else "–", "color:#ccc;"),
+                          (_ms(d["parse_ms"]), "color:#ccc;"),
+                          (f'{d["cache_hits"]} / {d["cache_misses"]}', "color:#888;"),
+                          (d["last_success"][11:19] + " UTC" if d["last_success"] else "never", f"color:{'#888' if d['last_success'] else RED};"),
+                          (html.escape(d["last_error"] or "")[:90], f"color:{RED};")])
+    if not diag_rows: diag_rows = [[("–", "color:#555;"), ("No requests recorded yet", "color:#888;")] + [("", "")] * 7]
+    st.markdown(_tbl("🩺 FEED DIAGNOSTICS — THIS PROCESS", ["Feed", "Status", "p50 / p95 ms", "DNS · Conn · TLS · Wait · Xfer ms", "Bytes", "Parse ms", "Cache H / M", "Last OK", "Last Error"], diag_rows, CYAN), unsafe_allow_html=True)
+    cs = FEED_CACHE.stats()
+    cache_rows = [[(html.escape(e["name"]), "color:#ddd;font-weight:bold;"), (e["tier"], f"color:{AMBER if e['tier'] == 'raw' else '#888'};"),
+                   (_f(e["bytes"]), "color:#ccc;"), (str(e["hits"]), "color:#ccc;"), (f'{e["age_s"]:,} s', "color:#888;")] for e in FEED_CACHE.entries()]
+    if not cache_rows: cache_rows = [[("–", "color:#555;"), ("Cache empty", "color:#888;")] + [("", "")] * 3]
+    st.markdown(_tbl(f'🧮 FEED CACHE — {_f(cs["bytes"])} / {_f(cs["max_bytes"])} B · {cs["policy"].upper()} · HITS {cs["hits"]:,} · MISSES {cs["misses"]:,} · EVICTIONS {cs["evictions"]:,} · EXPIRED {cs["expirations"]:,}',
+                     ["Entry", "Tier", "Bytes", "Hits", "Age"], cache_rows, CYAN), unsafe_allow_html=True)
+_sec("threat_maps")
 # ══════════════════════════════════════════════════════════════════════════════
 # LIVE THREAT MAPS
 # ══════════════════════════════════════════════════════════════════════════════
@@ -2085,6 +2051,7 @@ with m2:
     iframe("https://threatmap.fortiguard.com/", 1100)
 st.markdown("---")
 
+_sec("framework_analytics")
 # ══════════════════════════════════════════════════════════════════════════════
 # CYBERSECURITY FRAMEWORK COMPARISON & CONTROL LINEAGE (2026 GRC — ENHANCED)
 # Verified data • FedRAMP + SOC 2 fully covered • All frameworks in lineage • Gap Matrix (Beta) integrated below
@@ -2220,6 +2187,7 @@ with col5:
     )
     st.plotly_chart(fig_heatmap, use_container_width=True)
 
+_sec("gap_matrix")
 # ══════════════════════════════════════════════════════════════════════════════
 # NEW: ONE-CLICK FRAMEWORK CROSSWALK + GAP MATRIX (v73 — Enhanced)
 # Maps regulatory penalties & risks directly to control coverage/gaps across frameworks.
@@ -2234,36 +2202,6 @@ st.markdown(f"""
 </div>
 """, unsafe_allow_html=True)
 
-# ── PRESET BUTTONS for common GRC use cases (NEW in v73 Beta) ─────────────────────────────
-st.markdown('<div style="margin-bottom:6px;"><span style="color:#ffaa00; font-size:0.62rem; font-weight:bold; text-transform:uppercase; letter-spacing:0.5px;">QUICK PRESETS (click to auto-select common regulatory combos)</span></div>', unsafe_allow_html=True)
-p1, p2, p3, p4 = st.columns(4)
-with p1:
-    if st.button("🇪🇺 EU AI Act + NIS2 Readiness", use_container_width=True, key="preset_eu"):
-        st.session_state.fw_crosswalk = ["NIST CSF 2.0", "NIST AI RMF 1.0", "ISO 27001:2022", "SOC 2 Type II"]
-        st.rerun()
-with p2:
-    if st.button("☁️ SOC 2 + FedRAMP Cloud GRC", use_container_width=True, key="preset_cloud"):
-        st.session_state.fw_crosswalk = ["NIST CSF 2.0", "SOC 2 Type II", "FedRAMP", "NIST SP 800-53"]
-        st.rerun()
-with p3:
-    if st.button("🛡️ Ransomware & Supply Chain", use_container_width=True, key="preset_ransom"):
-        st.session_state.fw_crosswalk = ["NIST CSF 2.0", "CIS Controls v8", "MITRE ATT&CK", "CMMC 2.0"]
-        st.rerun()
-with p4:
-    if st.button("🤖 Full AI Governance Focus", use_container_width=True, key="preset_ai"):
-        st.session_state.fw_crosswalk = ["NIST CSF 2.0", "NIST AI RMF 1.0", "SOC 2 Type II", "HITRUST CSF"]
-        st.rerun()
-
-with st.expander("▶ Configure Crosswalk (select 2+ frameworks to analyze overlap, gaps & regulatory alignment)", expanded=True):
-    selected_frameworks = st.multiselect(
-        "Select frameworks to crosswalk:",
-        options=["NIST CSF 2.0", "ISO 27001:2022", "MITRE ATT&CK", "HITRUST CSF", "CIS Controls v8", 
-                 "SOC 2 Type II", "FedRAMP", "NIST SP 800-53", "CMMC 2.0", "NIST AI RMF 1.0"],
-        default=["NIST CSF 2.0", "SOC 2 Type II", "FedRAMP"],
-        key="fw_crosswalk",
-        help="Common regulatory combos: EU AI Act → NIST CSF + NIST AI RMF + ISO 27001 + SOC 2; NIS2/DORA → NIST CSF + ISO + FedRAMP + HITRUST. Presets above auto-populate for speed."
-    )
-
 # Core control categories + estimated strong coverage per framework (illustrative GRC estimates based on typical mappings — not exhaustive)
 # NOTE: These scores are DEMO/illustrative for the SecAI-Nexus dashboard experience. Real program mapping should use official crosswalks
 # (NIST CSF <-> ISO 27001 mappings, HITRUST CSF mappings, FedRAMP baselines, SOC 2 TSC to NIST, etc.) and your organization's scope.
@@ -2288,24 +2226,61 @@ coverage_matrix = {
     "NIST AI RMF 1.0":     [45, 55, 40, 70, 50, 60, 45, 55, 40, 95]
 }
 
+# Control-mapping catalog — SECAI_CROSSWALK_CATALOG names a CSV/JSON catalog (format in crosswalk_catalog.py,
+# example in data/crosswalk_catalog_sample.csv); its per-category averages replace the built-in estimates above
+CROSSWALK_CATALOG = os.environ.get("SECAI_CROSSWALK_CATALOG", "")
+@st.cache_resource(show_spinner=False)
+def _crosswalk_catalog(path):
+    try: return CrosswalkCatalog.load(path).category_coverage()
+    except (OSError, ValueError, KeyError): return None
+_catalog = _crosswalk_catalog(CROSSWALK_CATALOG) if CROSSWALK_CATALOG else None
+if _catalog: core_controls, coverage_matrix = _catalog
+elif CROSSWALK_CATALOG: st.caption(f"⚠ Crosswalk catalog {CROSSWALK_CATALOG} could not be loaded — showing the built-in estimates.")
+def _known(fws): return [f for f in fws if f in coverage_matrix]
+
+# ── PRESET BUTTONS for common GRC use cases (NEW in v73 Beta) ─────────────────────────────
+st.markdown('<div style="margin-bottom:6px;"><span style="color:#ffaa00; font-size:0.62rem; font-weight:bold; text-transform:uppercase; letter-spacing:0.5px;">QUICK PRESETS (click to auto-select common regulatory combos)</span></div>', unsafe_allow_html=True)
+p1, p2, p3, p4 = st.columns(4)
+with p1:
+    if st.button("🇪🇺 EU AI Act + NIS2 Readiness", use_container_width=True, key="preset_eu"):
+        st.session_state.fw_crosswalk = _known(["NIST CSF 2.0", "NIST AI RMF 1.0", "ISO 27001:2022", "SOC 2 Type II"])
+        st.rerun()
+with p2:
+    if st.button("☁️ SOC 2 + FedRAMP Cloud GRC", use_container_width=True, key="preset_cloud"):
+        st.session_state.fw_crosswalk = _known(["NIST CSF 2.0", "SOC 2 Type II", "FedRAMP", "NIST SP 800-53"])
+        st.rerun()
+with p3:
+    if st.button("🛡️ Ransomware & Supply Chain", use_container_width=True, key="preset_ransom"):
+        st.session_state.fw_crosswalk = _known(["NIST CSF 2.0", "CIS Controls v8", "MITRE ATT&CK", "CMMC 2.0"])
+        st.rerun()
+with p4:
+    if st.button("🤖 Full AI Governance Focus", use_container_width=True, key="preset_ai"):
+        st.session_state.fw_crosswalk = _known(["NIST CSF 2.0", "NIST AI RMF 1.0", "SOC 2 Type II", "HITRUST CSF"])
+        st.rerun()
+
+with st.expander("▶ Configure Crosswalk (select 2+ frameworks to analyze overlap, gaps & regulatory alignment)", expanded=True):
+    selected_frameworks = st.multiselect(
+        "Select frameworks to crosswalk:",
+        options=list(coverage_matrix),
+        default=_known(["NIST CSF 2.0", "SOC 2 Type II", "FedRAMP"]) or list(coverage_matrix)[:3],
+        key="fw_crosswalk",
+        help="Common regulatory combos: EU AI Act → NIST CSF + NIST AI RMF + ISO 27001 + SOC 2; NIS2/DORA → NIST CSF + ISO + FedRAMP + HITRUST. Presets above auto-populate for speed."
+    )
+
+# All 2^F framework selections are precomputed once per server process (built-in matrix and small catalogs)
+CROSSWALK_EXACT_MAX = 12   # larger catalogs: analyze on demand, greedy recommendations
+@st.cache_resource(show_spinner=False)
+def crosswalk_engine():
+    return CrosswalkEngine(coverage_matrix, core_controls, precompute=len(coverage_matrix) <= CROSSWALK_EXACT_MAX)
+
 if len(selected_frameworks) >= 2:
-    # Calculate average coverage per control across selected frameworks
-    avg_coverage = []
-    strong_frameworks = []
-    
-    for i, control in enumerate(core_controls):
-        scores = [coverage_matrix.get(fw, [50]*10)[i] for fw in selected_frameworks]
-        avg = sum(scores) / len(scores)
-        avg_coverage.append(round(avg))
-        
-        # Find frameworks that cover it strongly (>80)
-        strong = [fw.split()[0] for fw, s in zip(selected_frameworks, scores) if s >= 80]
-        strong_frameworks.append(", ".join(strong) if strong else "—")
-    
-    # Overall unified score
-    overall_score = round(sum(avg_coverage) / len(avg_coverage))
-    num_strong = sum(1 for v in avg_coverage if v >= 80)
-    num_gaps = len([v for v in avg_coverage if v < 65])
+    # Average coverage, strong frameworks and gap counts for this selection (memoized per bitmask)
+    cw = crosswalk_engine().analyze(selected_frameworks)
+    avg_coverage = cw["avg"]
+    strong_frameworks = cw["strong_by"]
+    overall_score = cw["overall"]
+    num_strong = cw["num_strong"]
+    num_gaps = cw["num_gaps"]
     
     # Top metrics row (new improvement)
     m1, m2, m3, m4 = st.columns(4)
@@ -2403,7 +2378,7 @@ if len(selected_frameworks) >= 2:
     st.plotly_chart(fig_cross, use_container_width=True)
     
     # Enhanced actionable insight with dynamic recommendations (tied to top AI risks: Shadow AI, Agentic threats, Deepfakes, EU AI Act 7% fines)
-    low_coverage = [core_controls[i] for i, v in enumerate(avg_coverage) if v < 65]
+    low_coverage = cw["gaps"]
     ai_gap = "AI / LLM Specific Controls" in low_coverage
     vendor_gap = "Vendor / Third-Party Risk" in low_coverage
     bc_gap = "Business Continuity" in low_coverage
@@ -2435,90 +2410,106 @@ if len(selected_frameworks) >= 2:
     </div>
     """, unsafe_allow_html=True)
     
+    # Optimal combinations within a framework budget (branch-and-bound over the coverage matrix, memoized)
+    def _apply_combo(fws): st.session_state.fw_crosswalk = list(fws)
+    o1, o2 = st.columns([1, 3])
+    with o1:
+        rec_k = st.selectbox("Framework budget", [2, 3, 4, 5], index=1, key="cw_rec_k")
+        rec_obj = st.radio("Optimize for", ["Fewest gaps", "Highest coverage"], horizontal=True, key="cw_rec_obj")
+        rec_focus = st.checkbox("Target current gap controls only", value=False, key="cw_rec_focus", disabled=not low_coverage)
+    best_combos = crosswalk_engine().recommend(rec_k, low_coverage if rec_focus and low_coverage else None,
+                                               "gaps" if rec_obj == "Fewest gaps" else "coverage",
+                                               method="exact" if len(coverage_matrix) <= CROSSWALK_EXACT_MAX else "greedy")
+    with o2:
+        rec_rows = [[(f"#{n+1}", "color:#00e5ff; font-weight:bold;"),
+                     (" + ".join(b["frameworks"]), "color:#ddd;"),
+                     (str(b["gaps"]), f"color:{'#00ff41' if b['gaps']==0 else '#ff4b4b'}; font-weight:bold;"),
+                     (f"{b['coverage']:.0f}%", "color:#ffaa00;")] for n, b in enumerate(best_combos)]
+        st.markdown(_tbl(f"🎯 OPTIMAL COMBINATIONS — UP TO {rec_k} FRAMEWORKS", ["Rank", "Frameworks", "Gaps", "Avg Coverage"], rec_rows, CYAN), unsafe_allow_html=True)
+        if best_combos:
+            st.button("Apply #1 combination", key="cw_rec_apply", on_click=_apply_combo, args=(best_combos[0]["frameworks"],))
+    
     st.caption("💡 Tip: Use this matrix + the top 'Why AI Security Matters' risks to build a defensible 2026-2027 control rationalization story for auditors, CISOs, and boards. Low-coverage areas (AI governance, vendor risk, BC) are now high-priority for enforcement actions (EU AI Act Q2 2026 fines already issued). Export the CSV above for your GRC tool or Excel workbook.")
 else:
     st.info("Select at least **2 frameworks** above to generate the crosswalk and gap analysis. Try presets like NIST CSF + SOC 2 + NIST AI RMF for modern AI/regulatory risk programs.")
 
+_sec("sankey")
 # ── FULL CONTROL LINEAGE (Sankey) + SECOND LINEAGE GRAPH (SOC 2 + AI RMF focus) ──
-st.markdown(f'<div class="rl-p" style="margin-top:35px;">🔗 FULL CONTROL LINEAGE — 12 Frameworks to 34 Critical Controls (Enhanced)</div>', unsafe_allow_html=True)
-
-labels = [
-    "NIST CSF 2.0", "ISO 27001", "MITRE ATT&amp;CK", "HITRUST CSF", "CIS Controls v8",
-    "COBIT 2019", "PCI DSS v4.0", "SOC 2 Type II", "CMMC 2.0", "NIST SP 800-53", "FedRAMP", "NIST AI RMF",
-    "Governance", "Risk Mgmt", "Asset Mgmt", "IAM & Access", "Cryptography",
-    "Vuln Mgmt", "Incident Response", "Monitoring", "Business Continuity",
-    "Supply Chain", "Configuration", "Data Protection",
-    "Policy & Governance", "Risk Assessment", "Least Privilege", "MFA Enforcement",
-    "Encryption at Rest", "Vuln Scanning", "Incident Playbooks", "SIEM / Logging",
-    "Backup & Recovery", "Vendor Risk Assessment", "Secure Baselines", "Zero Trust",
-    "Threat Hunting", "Data Classification", "Patch Management", "Network Segmentation",
-    "Security Awareness", "Continuous Monitoring", "Audit Logging", "Supply Chain Risk", "AI Risk Controls"
-]
-
-# Expanded & corrected connections (all frameworks included + SOC 2 & NIST AI RMF)
-source = (
-    [0]*13 + [1]*10 + [2]*8 + [3]*9 + [4]*9 + [5]*7 + [6]*6 + [7]*8 + [8]*6 + [9]*8 + [10]*7 + [11]*6
-)
-target = list(range(12,25)) * 2 + list(range(25,45))
-value = [95,90,92,96,87,84,95,91,80,87,93,89,85] * 2 + [88]*13
-
-fig_lineage = go.Figure(data=[go.Sankey(
-    node = dict(
-        pad = 22,
-        thickness = 24,
-        line = dict(color = "#111", width = 0.5),
-        label = labels,
-        color = [CYAN if i < 12 else GREEN if i < 25 else AMBER for i in range(len(labels))]
-    ),
-    link = dict(
-        source = source,
-        target = target,
-        value = value,
-        color = "rgba(0, 229, 255, 0.32)"
-    )
-)])
-
-fig_lineage.update_layout(
-    title_text="Control Lineage — 12 Frameworks → 34 Critical Controls (2026)",
+# Lineage tables: framework → control category → specific control. Node/link arrays are built from these
+# by lineage.build_lineage; the figure JSON is cached per table version.
+lineage_frameworks = {
+    "NIST CSF 2.0": ["Governance", "Risk Mgmt", "Asset Mgmt", "IAM & Access", "Cryptography", "Vuln Mgmt",
+                     "Incident Response", "Monitoring", "Business Continuity", "Supply Chain", "Configuration", "Data Protection"],
+    "ISO 27001": ["Governance", "Risk Mgmt", "Asset Mgmt", "IAM & Access", "Cryptography", "Incident Response",
+                  "Monitoring", "Business Continuity", "Supply Chain", "Data Protection"],
+    "MITRE ATT&amp;CK": ["IAM & Access", "Vuln Mgmt", "Incident Response", "Monitoring", "Configuration",
+                        "Asset Mgmt", "Data Protection", "Supply Chain"],
+    "HITRUST CSF": ["Governance", "Risk Mgmt", "IAM & Access", "Cryptography", "Incident Response", "Monitoring",
+                    "Supply Chain", "Data Protection", "Business Continuity"],
+    "CIS Controls v8": ["Asset Mgmt", "IAM & Access", "Vuln Mgmt", "Configuration", "Monitoring", "Incident Response",
+                        "Data Protection", "Supply Chain", "Business Continuity"],
+    "COBIT 2019": ["Governance", "Risk Mgmt", "Asset Mgmt", "Supply Chain", "Configuration", "Business Continuity", "Monitoring"],
+    "PCI DSS v4.0": ["IAM & Access", "Cryptography", "Vuln Mgmt", "Monitoring", "Configuration", "Data Protection"],
+    "SOC 2 Type II": ["Governance", "Risk Mgmt", "IAM & Access", "Incident Response", "Monitoring", "Supply Chain",
+                      "Business Continuity", "Data Protection"],
+    "CMMC 2.0": ["IAM & Access", "Incident Response", "Configuration", "Monitoring", "Vuln Mgmt", "Data Protection"],
+    "NIST SP 800-53": ["Governance", "Risk Mgmt", "IAM & Access", "Cryptography", "Vuln Mgmt", "Incident Response",
+                       "Monitoring", "Configuration"],
+    "FedRAMP": ["IAM & Access", "Cryptography", "Vuln Mgmt", "Incident Response", "Monitoring", "Configuration", "Supply Chain"],
+    "NIST AI RMF": ["Governance", "Risk Mgmt", "Data Protection", "Monitoring", "Supply Chain", "Incident Response"],
+}
+lineage_controls = {
+    "Governance": ["Policy & Governance", "Security Awareness"],
+    "Risk Mgmt": ["Risk Assessment", "AI Risk Controls"],
+    "Asset Mgmt": ["Data Classification", "Patch Management"],
+    "IAM & Access": ["Least Privilege", "MFA Enforcement", "Zero Trust"],
+    "Cryptography": ["Encryption at Rest"],
+    "Vuln Mgmt": ["Vuln Scanning", "Patch Management"],
+    "Incident Response": ["Incident Playbooks", "Threat Hunting"],
+    "Monitoring": ["SIEM / Logging", "Continuous Monitoring", "Audit Logging"],
+    "Business Continuity": ["Backup & Recovery"],
+    "Supply Chain": ["Vendor Risk Assessment", "Supply Chain Risk"],
+    "Configuration": ["Secure Baselines", "Network Segmentation"],
+    "Data Protection": ["Encryption at Rest", "Data Classification"],
+}
+# The tables carry no per-mapping strength: every framework → category mapping counts 1, and each category
+# splits what flows in evenly over its controls, so widths show how many frameworks reach a node
+lineage_inflow = {cat: sum(cat in cats for cats in lineage_frameworks.values()) for cat in lineage_controls}
+lineage_edges = ([(fw, cat, 1) for fw, cats in lineage_frameworks.items() for cat in cats] +
+                 [(cat, ctrl, lineage_inflow[cat] / len(ctrls)) for cat, ctrls in lineage_controls.items() for ctrl in ctrls])
+n_lineage_controls = len({c for ctrls in lineage_controls.values() for c in ctrls})
+
+st.markdown(f'<div class="rl-p" style="margin-top:35px;">🔗 FULL CONTROL LINEAGE — {len(lineage_frameworks)} Frameworks to {n_lineage_controls} Critical Controls (Enhanced)</div>', unsafe_allow_html=True)
+
+fig_lineage = lineage.figure_json(
+    lineage_edges, [CYAN, GREEN, AMBER],
+    title_text=f"Control Lineage — {len(lineage_frameworks)} Frameworks → {n_lineage_controls} Critical Controls (2026)",
     font=dict(family=MONO, size=12, color=GREEN),
     height=780,
     paper_bgcolor=BG,
     plot_bgcolor=CARD,
     margin=dict(l=20, r=20, t=70, b=30)
 )
-
-st.plotly_chart(fig_lineage, use_container_width=True)
+st.plotly_chart(json.loads(fig_lineage), use_container_width=True)
 
 # ── SECOND LINEAGE GRAPH: SOC 2 + AI RMF Focused Lineage ─────────────────────
 st.markdown(f'<div class="rl-p" style="margin-top:25px;">🔗 SECOND LINEAGE: SOC 2 + NIST AI RMF → AI GOVERNANCE CONTROLS</div>', unsafe_allow_html=True)
 
-soc_labels = [
-    "SOC 2 Type II", "NIST AI RMF", "Access Controls", "Incident Response", "Monitoring",
-    "Vendor Risk", "Data Protection", "AI Risk Assessment", "Model Governance", "Prompt Injection Controls",
-    "Training Data Validation", "Output Sanitization", "Excessive Agency Mitigation"
+soc_edges = [
+    ("SOC 2 Type II", "Access Controls", 95), ("SOC 2 Type II", "Incident Response", 90),
+    ("SOC 2 Type II", "Monitoring", 88), ("SOC 2 Type II", "Vendor Risk", 92),
+    ("SOC 2 Type II", "Data Protection", 93),
+    ("NIST AI RMF", "AI Risk Assessment", 85), ("NIST AI RMF", "Model Governance", 89),
+    ("NIST AI RMF", "Prompt Injection Controls", 94), ("NIST AI RMF", "Training Data Validation", 87),
+    ("NIST AI RMF", "Output Sanitization", 91), ("NIST AI RMF", "Excessive Agency Mitigation", 86),
+    ("NIST AI RMF", "Data Protection", 88),
 ]
+soc_colors = {"NIST AI RMF": BLUE, "Incident Response": AMBER, "Monitoring": RED,
+              "AI Risk Assessment": CYAN, "Model Governance": CYAN, "Prompt Injection Controls": RED,
+              "Training Data Validation": RED, "Output Sanitization": RED, "Excessive Agency Mitigation": AMBER}
 
-soc_source = [0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1]
-soc_target = [2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 6]
-soc_value = [95, 90, 88, 92, 93, 85, 89, 94, 87, 91, 86, 88]
-
-fig_soc_lineage = go.Figure(data=[go.Sankey(
-    node = dict(
-        pad = 20,
-        thickness = 22,
-        line = dict(color = "#111", width = 0.5),
-        label = soc_labels,
-        color = [CYAN, BLUE, GREEN, AMBER, RED, GREEN, GREEN, CYAN, CYAN, RED, RED, RED, AMBER]
-    ),
-    link = dict(
-        source = soc_source,
-        target = soc_target,
-        value = soc_value,
-        color = "rgba(0, 138, 255, 0.35)"
-    )
-)])
-
-fig_soc_lineage.update_layout(
+fig_soc_lineage = lineage.figure_json(
+    soc_edges, [CYAN, GREEN], node_colors=soc_colors, link_color="rgba(0, 138, 255, 0.35)", pad=20, thickness=22,
     title_text="SOC 2 + NIST AI RMF → AI Governance Controls (2026)",
     font=dict(family=MONO, size=12, color=GREEN),
     height=520,
@@ -2526,20 +2517,21 @@ fig_soc_lineage.update_layout(
     plot_bgcolor=CARD,
     margin=dict(l=20, r=20, t=60, b=30)
 )
-st.plotly_chart(fig_soc_lineage, use_container_width=True)
+st.plotly_chart(json.loads(fig_soc_lineage), use_container_width=True)
 
 st.markdown(f"""
 <div style="background:#080810;border:1px solid #1a1a2e;padding:18px;border-radius:4px;margin-top:12px;">
   <b>📍 How to read the lineage graphs (v33 Enhanced):</b><br>
-  • <span style="color:{CYAN}">Left</span> = 12 Frameworks (FedRAMP, SOC 2 Type II &amp; NIST AI RMF 1.0 fully included)<br>
+  • <span style="color:{CYAN}">Left</span> = {len(lineage_frameworks)} Frameworks (FedRAMP, SOC 2 Type II &amp; NIST AI RMF 1.0 fully included)<br>
   • <span style="color:{GREEN}">Middle</span> = Aggregated Control Categories (Governance, IAM, vuln mgmt, IR, etc.)<br>
-  • <span style="color:{AMBER}">Right</span> = 34 high-impact specific controls + new AI governance controls<br>
-  • <b>Line thickness</b> = relative coverage strength / emphasis across frameworks (illustrative mapping based on common GRC crosswalks — not exhaustive 1:1)<br>
+  • <span style="color:{AMBER}">Right</span> = {n_lineage_controls} high-impact specific controls + new AI governance controls<br>
+  • <b>Line thickness</b> = number of framework mappings: each framework → category link counts once and a category's total is split evenly over its controls (illustrative mapping based on common GRC crosswalks — not exhaustive 1:1)<br>
   • <b>Second Sankey</b> focuses on SOC 2 + NIST AI RMF → AI-specific risks (Prompt Injection, Model Governance, etc.)<br>
   Hover nodes/links for details. These visuals help GRC teams quickly see overlap, gaps, and consolidation opportunities when mapping multiple frameworks.
 </div>
 """, unsafe_allow_html=True)
 
+_sec("resources")
 # Continue with original GRC Resources section (unchanged)
 st.markdown(
 f"""
@@ -2607,3 +2599,11 @@ st.markdown(f'''
     SecAI-Nexus GRC [v73] | Live Data Engine | 12 hr Cache |
     118 Metrics | 10 Intel Tables | 2 Maps | 80 Resources | {now_utc.strftime("%Y")}</div></div>
 ''', unsafe_allow_html=True)
+PROFILER.end_run()
+if PROFILER.enabled:
+    prof_rows = [[(name, "color:#ddd;font-weight:bold;"), (d["runs"], "color:#888;"),
+                  (f'{d["last_ms"]:,.1f}', "color:#ccc;"), (f'{d["p50_ms"]:,.1f} / {d["p95_ms"]:,.1f}', f"color:{AMBER if d['share'] >= 0.2 else '#ccc'};"),
+                  (f'{d["share"] * 100:.0f}%', f"color:{AMBER if d['share'] >= 0.2 else '#888'};"),
+                  (_f(d["last_bytes"]), "color:#ccc;"), (_f(d["avg_bytes"]), "color:#888;")]
+                 for name, d in sorted(PROFILER.summary().items(), key=lambda kv: -kv[1]["p50_ms"])]
+    st.markdown(_tbl(f"⏱ SECTION RENDER PROFILE — LAST {PROFILER.runs} RERUN(S)", ["Section", "Runs", "Last ms", "p50 / p95 ms", "Share", "Last Bytes", "Avg Bytes"], prof_rows, AMBER), unsafe_allow_html=True)
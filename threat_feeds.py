@@ -0,0 +1,199 @@
+"""
+threat_feeds.py — Fetch and aggregate the dashboard's live threat intel feeds.
+Plain functions shared by streamlit_app.py (which memoizes each one in
+bounded_cache.FEED_CACHE with the TTL below), collector.py and the headless
+api_server.py. Each returns a small dict of numbers, or None when the feed
+is unreachable or unparseable.
+"""
+
+import threading
+from datetime import datetime, timezone, timedelta
+
+import async_fetch
+import http_client
+from kev_index import KEV_INDEX
+from state_store import load_json, save_json, state_path
+
+# Cache lifetime (seconds) per feed; keys match the http_client `feed=` names.
+TTL = {
+    "kev": 3600,
+    "bazaar": 43200,
+    "urlhaus": 43200,
+    "feodo": 43200,
+    "sans": 43200,
+    "tor": 43200,
+    "topports": 43200,
+    "topips": 43200,
+    "honeypot": 43200,
+}
+
+# Date-window feeds: days tried (today first) and the last day each returned data.
+HONEYPOT_DAYS = 3
+SCHEMA = 1
+WINDOW_STATE = state_path("feed_windows.json")
+_window_lock = threading.Lock()
+_last_ok_mem = {}
+
+
+def _g(url, feed=None, **k): return http_client.get(url, feed=feed, **k)
+
+
+def fetch_kev():
+    r = _g("https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json", "kev")
+    if not r: return None
+    try:
+        j = r.json()
+        return KEV_INDEX.update(j.get("vulnerabilities",[]), j.get("catalogVersion"))
+    except Exception: return None
+
+
+def fetch_bazaar():
+    r = _g("https://bazaar.abuse.ch/export/csv/recent/", "bazaar")
+    if not r: return None
+    try:
+        lines=[l for l in r.text.splitlines() if l and not l.startswith("#")]
+        now=datetime.now(timezone.utc); d1=d7=0; sm={}; ftypes={}
+        for line in lines:
+            p=line.split('","'); ts=p[0].strip('"')
+            try:
+                dt=datetime.strptime(ts,"%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+                age=(now-dt).days
+                if age<=1: d1+=1
+                if age<=7: d7+=1
+            except Exception: pass
+            if len(p)>9:
+                s=p[9].strip('"').strip()
+                if s: sm[s]=sm.get(s,0)+1
+            if len(p)>8:
+                ft=p[8].strip('"').strip()
+                if ft: ftypes[ft]=ftypes.get(ft,0)+1
+        tf=max(sm,key=sm.get) if sm else "N/A"
+        top_ft=max(ftypes,key=ftypes.get) if ftypes else "N/A"
+        top3=sorted(sm,key=sm.get,reverse=True)[:3]
+        return {"d1":d1,"d7":d7,"total":len(lines),"tf":tf,"families":len(sm),
+                "top3":top3,"top_ft":top_ft}
+    except Exception: return None
+
+
+def fetch_urlhaus():
+    r = _g("https://urlhaus.abuse.ch/downloads/text_online/", "urlhaus")
+    if not r: return None
+    return {"online":len([l for l in r.text.splitlines() if l.strip() and not l.startswith("#")])}
+
+
+def fetch_feodo():
+    r = _g("https://feodotracker.abuse.ch/downloads/ipblocklist.csv", "feodo")
+    if not r: return None
+    try:
+        lines=[l for l in r.text.splitlines() if l and not l.startswith("#")]
+        on=sum(1 for l in lines if '"online"' in l.lower())
+        off=sum(1 for l in lines if '"offline"' in l.lower())
+        mw={}
+        for l in lines:
+            parts=l.split(",")
+            if len(parts)>=5:
+                fam=parts[4].strip().strip('"')
+                if fam and fam not in ("malware",""): mw[fam]=mw.get(fam,0)+1
+        top_mw=max(mw,key=mw.get) if mw else "N/A"
+        return {"on":on,"off":off,"total":len(lines),"top_mw":top_mw,"mw_count":mw.get(top_mw,0),"mw_fams":len(mw)}
+    except Exception: return None
+
+
+def fetch_sans():
+    r = _g("https://isc.sans.edu/api/infocon?json", "sans")
+    if not r: return None
+    try: return {"infocon":r.json().get("status","?")}
+    except Exception: return None
+
+
+def fetch_tor():
+    r = _g("https://check.torproject.org/torbulkexitlist", "tor")
+    if not r: return None
+    try: return {"c":len([l for l in r.text.splitlines() if l.strip() and not l.startswith("#")])}
+    except Exception: return None
+
+
+def fetch_topports():
+    r = _g("https://isc.sans.edu/api/topports/records/10?json", "topports")
+    if not r: return None
+    try:
+        data = r.json()
+        if isinstance(data, list) and len(data)>0:
+            ports = [{"port":p.get("targetport","?"),"records":int(p.get("records",0)),
+                      "sources":int(p.get("sources",0)),"targets":int(p.get("targets",0))} for p in data[:10]]
+            return {"ports":ports, "total":sum(p["records"] for p in ports)}
+    except Exception: pass
+    return None
+
+
+def fetch_topips():
+    r = _g("https://isc.sans.edu/api/topips/records/5?json", "topips")
+    if not r: return None
+    try:
+        data = r.json()
+        if isinstance(data, list) and len(data)>0:
+            return {"top_ip":data[0].get("ip","?"),"top_count":int(data[0].get("count",0)),
+                    "total":sum(int(i.get("count",0)) for i in data[:5]),"n":len(data)}
+    except Exception: pass
+    return None
+
+
+async def _honeypot_day(dt):
+    r = await async_fetch.aget(f"https://isc.sans.edu/api/webhoneypotsummary/{dt}?json", "honeypot")
+    if not r: return None
+    try:
+        data = r.json()
+        d = data[0] if isinstance(data,list) and len(data)>0 else data
+        reps = int(d.get("reports",0))
+        if reps > 0:
+            return {"reports":reps,"targets":int(d.get("targets",0)),
+                    "sources":int(d.get("sources",0)),"date":dt}
+    except Exception: pass
+    return None
+
+
+def _last_ok(feed):
+    # The later of the persisted and in-memory dates: a failed save leaves the file behind memory.
+    doc = load_json(WINDOW_STATE, SCHEMA)
+    days = []
+    for dt in ((doc or {}).get("last_ok", {}).get(feed), _last_ok_mem.get(feed)):
+        try: days.append(datetime.strptime(dt, "%Y-%m-%d").date())
+        except (TypeError, ValueError): pass
+    return max(days, default=None)
+
+
+def _remember_ok(feed, dt):
+    with _window_lock:
+        _last_ok_mem[feed] = dt
+        doc = load_json(WINDOW_STATE, SCHEMA) or {"schema": SCHEMA, "last_ok": {}}
+        if doc["last_ok"].get(feed) != dt:
+            doc["last_ok"][feed] = dt
+            save_json(WINDOW_STATE, doc)  # read-only filesystem: remembered in memory only
+
+
+def fetch_honeypot():
+    # The day's summary is often unpublished early in UTC mornings. Ask for every candidate
+    # day at once, newest first, back to the last day that had data and at least one day before
+    # it (that day may since have been republished), HONEYPOT_DAYS at most.
+    today = datetime.now(timezone.utc).date()
+    last = _last_ok("honeypot")
+    back = (today - last).days if last else -1
+    n = min(max(back + 1, 2), HONEYPOT_DAYS) if back >= 0 else HONEYPOT_DAYS
+    dates = [(today - timedelta(days=dd)).strftime("%Y-%m-%d") for dd in range(n)]
+    dt, out = async_fetch.first_available(dates, _honeypot_day)
+    if out: _remember_ok("honeypot", dt)
+    return out
+
+
+# feed name -> fetcher, in dashboard order
+FETCHERS = {
+    "kev": fetch_kev,
+    "bazaar": fetch_bazaar,
+    "urlhaus": fetch_urlhaus,
+    "feodo": fetch_feodo,
+    "sans": fetch_sans,
+    "tor": fetch_tor,
+    "topports": fetch_topports,
+    "topips": fetch_topips,
+    "honeypot": fetch_honeypot,
+}